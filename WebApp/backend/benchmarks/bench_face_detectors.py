@@ -0,0 +1,101 @@
+"""
+Vitesse et rappel des détecteurs de visages (services.face_detectors)
+
+Construit un jeu d'images 960×720 à partir d'une photo: son visage, agrandi ou
+réduit à plusieurs tailles, est placé à plusieurs positions (position connue),
+plus des images sans visage (bruit lissé). Pour chaque détecteur disponible
+et chaque facteur de réduction, mesure la durée moyenne d'une détection, le
+rappel (visages retrouvés avec un recouvrement IoU >= 0.3) et le nombre de
+fausses détections.
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_face_detectors --photo visage.jpg [--scales 0.25 0.5] [--detectors hog haar]
+"""
+import argparse
+import time
+
+import cv2
+import face_recognition
+import numpy as np
+
+from services.face_detectors import available_detectors, create_detector
+from services.identity_tracker import box_iou
+
+FRAME_SIZE = (720, 960)
+FACE_WIDTHS = (60, 100, 160, 240)
+POSITIONS = ((0.2, 0.3), (0.5, 0.5), (0.75, 0.6))
+
+
+def make_samples(photo_path, negatives=6, seed=0):
+    """
+    Images de test et boîtes attendues
+
+    Returns:
+        list: (image BGR, boîte (top, right, bottom, left) ou None)
+    """
+    image = face_recognition.load_image_file(photo_path)
+    locations = face_recognition.face_locations(image)
+    if not locations:
+        raise SystemExit(f"Aucun visage dans '{photo_path}'")
+    top, right, bottom, left = locations[0]
+    margin = (right - left) // 2
+    crop_top, crop_left = max(0, top - margin), max(0, left - margin)
+    crop = cv2.cvtColor(image[crop_top:bottom + margin, crop_left:right + margin], cv2.COLOR_RGB2BGR)
+
+    rng = np.random.default_rng(seed)
+    samples = []
+    for face_width in FACE_WIDTHS:
+        factor = face_width / (right - left)
+        resized = cv2.resize(crop, (0, 0), fx=factor, fy=factor)
+        height, width = resized.shape[:2]
+        for fx, fy in POSITIONS:
+            frame = np.full(FRAME_SIZE + (3,), 90, dtype=np.uint8)
+            x = min(int(fx * FRAME_SIZE[1]), FRAME_SIZE[1] - width)
+            y = min(int(fy * FRAME_SIZE[0]), FRAME_SIZE[0] - height)
+            frame[y:y + height, x:x + width] = resized
+            face_top, face_left = y + int((top - crop_top) * factor), x + int((left - crop_left) * factor)
+            samples.append((frame, (face_top, face_left + face_width,
+                                    face_top + int((bottom - top) * factor), face_left)))
+    for _ in range(negatives):
+        noise = rng.integers(0, 255, FRAME_SIZE + (3,), dtype=np.uint8)
+        samples.append((cv2.GaussianBlur(noise, (0, 0), 8), None))
+    return samples
+
+
+def evaluate(detector, samples, scale):
+    """Durée moyenne (ms), visages retrouvés et fausses détections"""
+    found = false_positives = 0
+    elapsed = 0.0
+    for frame, expected in samples:
+        small = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
+        start = time.perf_counter()
+        boxes = detector.detect(small)
+        elapsed += time.perf_counter() - start
+        boxes = [tuple(int(v / scale) for v in box) for box in boxes]
+        matched = expected is not None and any(box_iou(box, expected) >= 0.3 for box in boxes)
+        found += matched
+        false_positives += len(boxes) - matched
+    return elapsed * 1000 / len(samples), found, false_positives
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--photo', required=True, help='Photo contenant un visage')
+    parser.add_argument('--scales', type=float, nargs='+', default=[0.25, 0.5])
+    parser.add_argument('--detectors', nargs='+', help='Détecteurs à comparer (tous les disponibles par défaut)')
+    args = parser.parse_args()
+
+    samples = make_samples(args.photo)
+    faces = sum(expected is not None for _, expected in samples)
+    print(f"{faces} visages ({', '.join(map(str, FACE_WIDTHS))} px), "
+          f"{len(samples) - faces} images sans visage")
+    print(f"{'détecteur':>10}{'échelle':>9}{'ms/image':>10}{'rappel':>8}{'fausses':>9}")
+    for name in args.detectors or available_detectors():
+        detector = create_detector(name)
+        for scale in args.scales:
+            ms, found, false_positives = evaluate(detector, samples, scale)
+            print(f"{name:>10}{scale:>9}{ms:>10.1f}{found / faces:>8.2f}{false_positives:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Précision et coût de l'encodage des visages lointains (services.face_encoder)
+
+Reprend les images 960×720 de bench_face_detectors (visage d'une photo à
+plusieurs tailles et positions). Les visages sont détectés sur l'image réduite
+(HOG), puis encodés selon chaque configuration: sur l'image réduite ou
+recadrés en pleine résolution, repères 5 ou 68 points, avec ou sans tirages
+aléatoires. Mesure, par taille de visage, la distance moyenne à l'encodage de
+la photo d'origine (comme celui de la galerie) et la part des visages
+reconnus, ainsi que la durée moyenne de l'encodage. La durée d'une détection
+en pleine résolution est donnée pour comparaison.
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_face_encoding --photo visage.jpg [--scale 0.25] [--jitters 5]
+"""
+import argparse
+import time
+
+import cv2
+import face_recognition
+import numpy as np
+
+from benchmarks.bench_face_detectors import FACE_WIDTHS, POSITIONS, make_samples
+from services.face_detectors import create_detector
+from services.face_encoder import FaceEncoder
+from services.face_gallery import FACE_MATCH_TOLERANCE
+
+
+def evaluate(encoder, detections, reference):
+    """Distance moyenne et part reconnue par taille de visage, durée moyenne (ms)"""
+    distances = {width: [] for width in FACE_WIDTHS}
+    elapsed = 0.0
+    for width, frame, small, locations, scale in detections:
+        start = time.perf_counter()
+        encodings = encoder.encode(frame, small, locations, scale)
+        elapsed += time.perf_counter() - start
+        distances[width].append(min(np.linalg.norm(encoding - reference) for encoding in encodings))
+    results = {width: (np.mean(values), np.mean(np.array(values) <= FACE_MATCH_TOLERANCE))
+               for width, values in distances.items() if values}
+    return results, elapsed * 1000 / len(detections)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--photo', required=True, help='Photo contenant un visage')
+    parser.add_argument('--scale', type=float, default=0.25, help='Facteur de réduction de la détection')
+    parser.add_argument('--jitters', type=int, default=5, help='Tirages aléatoires de la configuration la plus lente')
+    args = parser.parse_args()
+
+    reference = face_recognition.face_encodings(face_recognition.load_image_file(args.photo))[0]
+    detector = create_detector('hog')
+    detections = []
+    full_detection = 0.0
+    samples = [(frame, expected) for frame, expected in make_samples(args.photo) if expected is not None]
+    for index, (frame, expected) in enumerate(samples):
+        small = cv2.resize(frame, (0, 0), fx=args.scale, fy=args.scale)
+        locations = detector.detect(small)
+        start = time.perf_counter()
+        detector.detect(frame)
+        full_detection += time.perf_counter() - start
+        if locations:
+            detections.append((FACE_WIDTHS[index // len(POSITIONS)], frame, small,
+                               locations, args.scale))
+
+    found = {width for width, *_ in detections}
+    print(f"Détection HOG à l'échelle {args.scale}: {len(detections)}/{len(samples)} visages; "
+          f"en pleine résolution: {full_detection * 1000 / len(samples):.1f} ms/image")
+    print(f"{'encodage':>22}{'ms':>7}" + ''.join(f"{f'{width} px':>15}" for width in FACE_WIDTHS if width in found))
+    configs = [
+        ('réduite/5 points', FaceEncoder()),
+        ('réduite/68 points', FaceEncoder(landmark_model='large')),
+        ('pleine/5 points', FaceEncoder(full_resolution=True)),
+        ('pleine/68 points', FaceEncoder(landmark_model='large', full_resolution=True)),
+        (f'pleine/5 points/x{args.jitters}', FaceEncoder(args.jitters, full_resolution=True)),
+    ]
+    for label, encoder in configs:
+        results, ms = evaluate(encoder, detections, reference)
+        print(f"{label:>22}{ms:>7.1f}" + ''.join(
+            f"{f'{distance:.3f} ({rate:.0%})':>15}" for distance, rate in results.values()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Rappel et latence de l'index approché (IVF) des centroïdes de la galerie
+
+Pour plusieurs nombres de personnes (une photo chacune, encodages aléatoires),
+compare FaceGallery.match avec et sans index: durée d'une requête de FACES
+visages, rappel (même personne trouvée que par la recherche exacte) pour
+plusieurs nombres de listes parcourues, durée de construction de l'index et
+d'un ajout de personne (listes réutilisées, sans réentraînement).
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_face_index [--faces 3] [--queries 300] [--repeat 100]
+"""
+import argparse
+import time
+from unittest.mock import patch
+
+import numpy as np
+
+import services.face_gallery as face_gallery
+from services.face_gallery import FaceGallery
+
+
+def time_call(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--faces', type=int, default=3, help='Visages détectés par image')
+    parser.add_argument('--queries', type=int, default=300, help='Visages utilisés pour mesurer le rappel')
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'personnes':>10}{'sondes':>8}{'exact ms':>10}{'index ms':>10}{'rappel':>8}"
+          f"{'construction ms':>17}{'ajout ms':>10}")
+    for people in (1000, 10000, 50000):
+        centers = rng.normal(0, 0.1, (people, 128)).astype(np.float32)
+        names = [f"person{i}" for i in range(people)]
+        queries = centers[rng.choice(people, args.queries)] + rng.normal(0, 0.03, (args.queries, 128))
+        faces = queries[:args.faces]
+
+        with patch.object(face_gallery, 'ANN_MIN_IDENTITIES', people + 2):
+            exact = FaceGallery(centers, names)
+        exact_names = [name for name, _ in exact.match(queries)]
+        exact_ms = time_call(lambda: exact.match(faces), args.repeat)
+
+        start = time.perf_counter()
+        with patch.object(face_gallery, 'ANN_MIN_IDENTITIES', 1):
+            indexed = FaceGallery(centers, names)
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        indexed.with_face(rng.normal(0, 0.1, 128), 'newcomer', 'newcomer_1.jpg')
+        add_ms = (time.perf_counter() - start) * 1000
+
+        for probes in (4, 8, 16):
+            indexed.index.probes = probes
+            index_ms = time_call(lambda: indexed.match(faces), args.repeat)
+            found = [name for name, _ in indexed.match(queries)]
+            recall = np.mean([a == b for a, b in zip(found, exact_names)])
+            print(f"{people:>10}{probes:>8}{exact_ms:>10.3f}{index_ms:>10.3f}{recall:>8.3f}"
+                  f"{build_ms:>17.1f}{add_ms:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Coût de l'association des visages détectés aux visages connus
+
+Compare l'ancienne boucle (compare_faces puis face_distance pour chaque visage,
+sur une liste d'encodages) à FaceGallery.match (une seule matrice M×N de
+distances), pour plusieurs tailles de galerie, avec des encodages aléatoires.
+
+Compare ensuite, pour des galeries de plusieurs photos par personne, la
+comparaison à toutes les photos (photo la plus proche) au modèle par identité
+(centroïdes puis photos des personnes candidates): durée, et écart type de la
+distance retenue pour des visages bruités d'une même personne (stabilité de
+la confiance).
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_face_matching [--faces 3] [--repeat 200] [--photos-per-person 20]
+"""
+import argparse
+import time
+
+import face_recognition
+import numpy as np
+
+from services.face_gallery import FaceGallery
+
+
+def legacy_match(known_encodings, known_names, face_encodings):
+    """Ancienne comparaison de FaceRecognitionService._process_frame"""
+    results = []
+    for encoding in face_encodings:
+        matches = face_recognition.compare_faces(known_encodings, encoding)
+        face_distances = face_recognition.face_distance(known_encodings, encoding)
+        best_match_index = np.argmin(face_distances)
+        name = known_names[best_match_index] if matches[best_match_index] else None
+        results.append((name, face_distances[best_match_index]))
+    return results
+
+
+def nearest_photo_match(gallery, face_encodings):
+    """Identité décidée par la photo connue la plus proche, toutes photos comparées"""
+    distances = gallery.distances(face_encodings)
+    best = distances.argmin(axis=1)
+    return [(gallery.names[index], float(distances[row, index])) for row, index in enumerate(best)]
+
+
+def time_call(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--faces', type=int, default=3, help='Visages détectés par image')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--photos-per-person', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{args.faces} visages par image")
+    print(f"{'galerie':>8}{'avant ms':>10}{'après ms':>10}{'gain':>8}")
+    for size in (10, 100, 300, 1000, 5000):
+        known = list(rng.normal(0, 0.1, (size, 128)))
+        names = [f"person{i}" for i in range(size)]
+        faces = [known[i] + rng.normal(0, 0.01, 128) for i in range(args.faces)]
+        gallery = FaceGallery(known, names)
+
+        before = time_call(lambda: legacy_match(known, names, faces), args.repeat)
+        after = time_call(lambda: gallery.match(faces), args.repeat)
+        print(f"{size:>8}{before:>10.3f}{after:>10.3f}{before / after:>7.1f}x")
+
+    per_person = args.photos_per_person
+    print(f"\n{per_person} photos par personne")
+    print(f"{'personnes':>10}{'photos ms':>11}{'identité ms':>13}{'écart photos':>14}{'écart identité':>16}")
+    for people in (10, 50, 200, 1000):
+        centers = rng.normal(0, 0.1, (people, 128))
+        known = np.repeat(centers, per_person, axis=0) + rng.normal(0, 0.03, (people * per_person, 128))
+        gallery = FaceGallery(known, [f"person{i // per_person}" for i in range(people * per_person)])
+        faces = centers[:args.faces] + rng.normal(0, 0.03, (args.faces, 128))
+
+        nearest = time_call(lambda: nearest_photo_match(gallery, faces), args.repeat)
+        identity = time_call(lambda: gallery.match(faces), args.repeat)
+
+        # Même personne vue 200 fois: dispersion de la distance retenue
+        queries = centers[0] + rng.normal(0, 0.03, (200, 128))
+        nearest_spread = np.std([distance for _, distance in nearest_photo_match(gallery, queries)])
+        identity_spread = np.std([distance for _, distance in gallery.match(queries)])
+        print(f"{people:>10}{nearest:>11.3f}{identity:>13.3f}{nearest_spread:>14.4f}{identity_spread:>16.4f}")
+
+
+if __name__ == '__main__':
+    main()
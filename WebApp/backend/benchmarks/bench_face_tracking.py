@@ -0,0 +1,163 @@
+"""
+Durée de détection du suivi de visage (services.face_roi_search, services.face_scale_band)
+
+Construit une séquence d'images 640×480 où le visage d'une photo se déplace
+(trajectoire de Lissajous, quelques pixels par image) et change lentement de
+taille devant un fond texturé (bruit lissé: un fond uni serait rejeté dès le
+premier étage de la cascade de Haar), puis quelques images sans visage
+(cible perdue). Pour chaque
+détecteur, compare la détection sur toute l'image (comportement précédent de
+FaceTrackingService) à la recherche dans une fenêtre autour du dernier visage:
+durée moyenne et p95 d'une détection, cadence de suivi atteignable sur un
+cœur, images où le visage est retrouvé et parcours complets de l'image.
+Les modes '+bande' cherchent d'abord le visage aux largeurs récemment
+observées (réglage adaptive_scale), avec un parcours complet périodique;
+--size-variation règle l'amplitude des changements de taille. La détection
+est celle de FaceTrackingService._detect_faces.
+
+Avec --clip, les images sont celles d'une vidéo enregistrée (flux du drone
+par exemple); le visage attendu est alors celui trouvé par la cascade de
+Haar sur toute l'image et toutes les tailles.
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_face_tracking --photo visage.jpg [--frames 300] [--detectors haar hog]
+        [--face-width 90] [--size-variation 10]
+    python -m benchmarks.bench_face_tracking --clip vol.mp4 [--frames 300]
+"""
+import argparse
+import time
+
+import cv2
+import face_recognition
+import numpy as np
+
+from services.face_detectors import HaarDetector, available_detectors
+from services.face_roi_search import FaceRoiSearch
+from services.face_scale_band import FaceScaleBand
+from services.face_tracking_service import FaceTrackingService
+
+FRAME_SIZE = (480, 640)
+FACE_SIZE_MIN = 50  # Valeur par défaut de FaceTrackingService
+LOST_FRAMES = 20
+
+
+def make_frames(photo_path, frames, face_width=90, size_variation=40):
+    """Images BGR et centre attendu du visage (None pendant la perte de la cible)"""
+    image = face_recognition.load_image_file(photo_path)
+    locations = face_recognition.face_locations(image)
+    if not locations:
+        raise SystemExit(f"Aucun visage dans '{photo_path}'")
+    top, right, bottom, left = locations[0]
+    margin = (right - left) // 2
+    crop = cv2.cvtColor(image[max(0, top - margin):bottom + margin, max(0, left - margin):right + margin],
+                        cv2.COLOR_RGB2BGR)
+
+    noise = np.random.default_rng(0).integers(0, 255, FRAME_SIZE + (3,), dtype=np.uint8)
+    background = cv2.GaussianBlur(noise, (0, 0), 3)
+    sequence = []
+    for index in range(frames):
+        frame = background.copy()
+        if index >= frames - LOST_FRAMES:
+            sequence.append((frame, None))
+            continue
+        phase = 2 * np.pi * index / frames
+        factor = (face_width + size_variation * np.sin(phase)) / (right - left)
+        resized = cv2.resize(crop, (0, 0), fx=factor, fy=factor)
+        height, width = resized.shape[:2]
+        x = int((FRAME_SIZE[1] - width) * (0.5 + 0.45 * np.sin(3 * phase)))
+        y = int((FRAME_SIZE[0] - height) * (0.5 + 0.45 * np.sin(2 * phase)))
+        frame[y:y + height, x:x + width] = resized
+        sequence.append((frame, (x + width // 2, y + height // 2, width)))
+    return sequence
+
+
+def read_clip(clip_path, frames):
+    """Images BGR d'une vidéo et centre du visage trouvé sur toute l'image (None sans visage)"""
+    capture = cv2.VideoCapture(clip_path)
+    if not capture.isOpened():
+        raise SystemExit(f"Impossible de lire '{clip_path}'")
+    reference = HaarDetector()
+    sequence = []
+    while len(sequence) < frames:
+        ok, frame = capture.read()
+        if not ok:
+            break
+        boxes = reference.detect(frame, min_size=FACE_SIZE_MIN)
+        expected = None
+        if boxes:
+            top, right, bottom, left = max(boxes, key=lambda box: (box[2] - box[0]) * (box[1] - box[3]))
+            expected = ((left + right) // 2, (top + bottom) // 2, right - left)
+        sequence.append((frame, expected))
+    capture.release()
+    if not sequence:
+        raise SystemExit(f"Aucune image dans '{clip_path}'")
+    return sequence
+
+
+def run(service, sequence, roi, adaptive):
+    """Durées de détection (ms), images où le visage est retrouvé, parcours complets et périodiques"""
+    service.update_settings({'face_size_min': FACE_SIZE_MIN, 'roi_search': roi, 'adaptive_scale': adaptive})
+    service.roi_search = FaceRoiSearch()
+    service.scale_band = FaceScaleBand()
+    search_faces = service._search_faces
+    full_scans = 0
+
+    def counted(*args, **kwargs):
+        nonlocal full_scans
+        boxes = search_faces(*args, **kwargs)
+        full_scans += not roi or service.roi_search.mode == 'full'
+        return boxes
+
+    service._search_faces = counted
+    durations, found = [], 0
+    try:
+        for frame, expected in sequence:
+            start = time.perf_counter()
+            boxes = service._detect_faces(frame)
+            durations.append((time.perf_counter() - start) * 1000)
+            if expected is not None and boxes:
+                top, right, bottom, left = max(boxes, key=lambda box: (box[2] - box[0]) * (box[1] - box[3]))
+                center_x, center_y, width = expected
+                found += abs((left + right) / 2 - center_x) < width / 2 and abs((top + bottom) / 2 - center_y) < width / 2
+    finally:
+        del service._search_faces
+    return np.array(durations), found, full_scans, service.scale_band.periodic_scans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--photo', help='Photo contenant un visage')
+    source.add_argument('--clip', help='Vidéo enregistrée')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--detectors', nargs='+', help='Détecteurs à comparer (tous les disponibles sauf cnn par défaut)')
+    parser.add_argument('--face-width', type=int, default=90, help='Largeur moyenne du visage (pixels)')
+    parser.add_argument('--size-variation', type=int, default=40,
+                        help='Amplitude de la variation de largeur du visage (pixels, ~10 avec le maintien de la distance)')
+    args = parser.parse_args()
+
+    if args.clip:
+        sequence = read_clip(args.clip, args.frames)
+    else:
+        sequence = make_frames(args.photo, args.frames, args.face_width, args.size_variation)
+    faces = sum(expected is not None for _, expected in sequence)
+    height, width = sequence[0][0].shape[:2]
+    print(f"{len(sequence)} images {width}×{height}, visage présent sur {faces}")
+    print(f"{'détecteur':>10}{'recherche':>15}{'moy. ms':>9}{'p95':>8}{'images/s':>10}"
+          f"{'retrouvés':>11}{'complets':>10}{'périodiques':>13}")
+    service = FaceTrackingService()
+    for name in args.detectors or [name for name in available_detectors() if name != 'cnn']:
+        success, message = service.update_settings({'detector': name})
+        if not success:
+            print(f"{name:>10}  {message}")
+            continue
+        for roi, adaptive in ((False, False), (True, False), (False, True), (True, True)):
+            durations, found, full_scans, periodic_scans = run(service, sequence, roi, adaptive)
+            label = ('fenêtre' if roi else 'image') + ('+bande' if adaptive else '')
+            print(f"{name:>10}{label:>15}{durations.mean():>9.2f}"
+                  f"{np.percentile(durations, 95):>8.2f}{1000 / durations.mean():>10.0f}"
+                  f"{found:>11}{full_scans:>10}{periodic_scans:>13}")
+
+
+if __name__ == '__main__':
+    main()
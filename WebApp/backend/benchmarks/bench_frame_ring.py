@@ -0,0 +1,118 @@
+"""
+Transmission des images vidéo à un autre processus (services.shared_frame_ring)
+
+Un écrivain écrit des images 640×480 à la cadence de la vidéo, comme la
+capture de VideoService (copie dans un tampon, puis publication); un lecteur,
+dans un autre processus, les reçoit et lit un pixel de chacune. Compare:
+  - queue: multiprocessing.Queue (image sérialisée par le thread d'envoi de la
+    file, puis désérialisée par le lecteur),
+  - ring:  SharedFrameRing, écriture directe dans un emplacement (reserve/commit),
+    le lecteur obtient une vue sur la mémoire partagée,
+  - ring+copy: idem, avec une copie cohérente côté lecteur (copy()).
+Mesure le temps CPU du processus écrivain par image (threads d'envoi compris:
+c'est du temps pris au processus Flask), la latence entre publication et
+réception, et les images reçues.
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_frame_ring [--frames 300] [--fps 30] [--slots 4]
+"""
+import argparse
+import multiprocessing
+import queue
+import time
+
+import numpy as np
+
+from services.shared_frame_ring import SharedFrameRing
+
+SHAPE = (480, 640, 3)
+
+
+def queue_reader(frames, stop, results):
+    latencies, received = [], 0
+    while not stop.is_set() or not frames.empty():
+        try:
+            timestamp, frame = frames.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        latencies.append(time.time() - timestamp)
+        received += int(frame[0, 0, 0] >= 0)
+    results.put((received, latencies))
+
+
+def ring_reader(name, copy, stop, results):
+    ring = SharedFrameRing.attach(name)
+    latencies, received, seq = [], 0, 0
+    while not stop.is_set():
+        packet = ring.wait_for_frame(seq, timeout=0.1)
+        if packet is None:
+            continue
+        if copy:
+            packet = ring.copy(packet.seq) or packet
+        latencies.append(time.time() - packet.timestamp)
+        received += int(packet.frame[0, 0, 0] >= 0)
+        seq = packet.seq
+        del packet
+    ring.close()
+    results.put((received, latencies))
+
+
+def run(mode, frames, fps, slots):
+    """Retourne (ms écrivain/image, latences en ms, images reçues)"""
+    context = multiprocessing.get_context('spawn')
+    stop, results = context.Event(), context.Queue()
+    images = [np.full(SHAPE, value, dtype=np.uint8) for value in range(8)]
+    if mode == 'queue':
+        channel = context.Queue(maxsize=slots)
+        reader = context.Process(target=queue_reader, args=(channel, stop, results))
+    else:
+        ring = SharedFrameRing.create(slots, SHAPE)
+        reader = context.Process(target=ring_reader, args=(ring.name, mode == 'ring+copy', stop, results))
+    reader.start()
+    time.sleep(1.0)
+
+    buffers = [np.empty(SHAPE, dtype=np.uint8) for _ in range(slots)]
+    cpu_start = time.process_time()
+    for index in range(frames):
+        start = time.perf_counter()
+        image = images[index % len(images)]
+        if mode == 'queue':
+            buffer = buffers[index % slots]
+            np.copyto(buffer, image)
+            try:
+                channel.put_nowait((time.time(), buffer))
+            except queue.Full:
+                pass  # Lecteur en retard: image perdue, comme dans l'anneau
+        else:
+            seq, buffer = ring.reserve()
+            np.copyto(buffer, image)
+            ring.commit(seq, time.time())
+        time.sleep(max(0.0, 1 / fps - (time.perf_counter() - start)))
+
+    time.sleep(0.5)
+    writer_time = time.process_time() - cpu_start
+    stop.set()
+    received, latencies = results.get(timeout=10)
+    reader.join(timeout=5)
+    if mode != 'queue':
+        ring.close()
+    return writer_time * 1000 / frames, np.array(latencies) * 1000, received
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--slots', type=int, default=4, help="Emplacements de l'anneau (et taille de la file)")
+    args = parser.parse_args()
+
+    print(f"{args.frames} images {SHAPE[1]}×{SHAPE[0]} à {args.fps:g} images/s")
+    print(f"{'mode':>10}{'CPU écrivain ms':>17}{'latence p50':>13}{'p95':>8}{'reçues':>8}")
+    for mode in ('queue', 'ring', 'ring+copy'):
+        writer_ms, latencies, received = run(mode, args.frames, args.fps, args.slots)
+        print(f"{mode:>10}{writer_ms:>17.3f}{np.percentile(latencies, 50):>13.2f}"
+              f"{np.percentile(latencies, 95):>8.2f}{received:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Durée de load_known_faces avec et sans le cache d'encodages
+
+Crée un dossier de COUNT photos (variantes recadrées et bruitées d'une photo
+contenant un visage, nommées personN_1.jpg), puis mesure:
+  - le premier chargement (toutes les photos encodées),
+  - un chargement sans changement (tout vient du cache),
+  - un chargement après l'ajout d'une photo, la suppression d'une autre et la
+    modification de la date d'une troisième.
+
+Avec --workers, le premier chargement est mesuré pour chaque nombre de
+processus d'encodage (cache supprimé entre deux mesures).
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_gallery_loading --photo visage.jpg [--count 1000] [--workers 1 2 4 8]
+"""
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from services.face_encoding_cache import CACHE_FILENAME
+from services.face_recognition_service import FaceRecognitionService
+
+
+def make_gallery(photo_path, folder, count, seed=0):
+    """Écrit count variantes distinctes de la photo dans le dossier"""
+    rng = np.random.default_rng(seed)
+    image = cv2.imread(photo_path)
+    if image is None:
+        raise SystemExit(f"Impossible de lire '{photo_path}'")
+    height, width = image.shape[:2]
+    for i in range(count):
+        dx, dy = rng.integers(0, max(1, width // 20)), rng.integers(0, max(1, height // 20))
+        variant = image[dy:height - width // 20 + dy, dx:width - width // 20 + dx]
+        noise = rng.integers(-3, 4, variant.shape, dtype=np.int16)
+        variant = np.clip(variant.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+        cv2.imwrite(os.path.join(folder, f"person{i}_1.jpg"), variant)
+
+
+def timed_load(service):
+    start = time.perf_counter()
+    success, message = service.load_known_faces()
+    return time.perf_counter() - start, message
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--photo', required=True, help='Photo contenant un visage')
+    parser.add_argument('--count', type=int, default=1000, help='Nombre de photos de la galerie')
+    parser.add_argument('--workers', type=int, nargs='+', help="Nombres de processus d'encodage à comparer")
+    args = parser.parse_args()
+
+    logging.getLogger('face_recognition_service').setLevel(logging.WARNING)
+    folder = tempfile.mkdtemp(prefix='gallery_')
+    try:
+        make_gallery(args.photo, folder, args.count)
+        service = FaceRecognitionService()
+        # Attendre la fin du chargement lancé au démarrage du service
+        with service.loading_lock:
+            service.settings['photos_folder'] = folder
+
+        for workers in args.workers or [service.encoding_workers]:
+            cache_path = os.path.join(folder, CACHE_FILENAME)
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            service.encoding_workers = workers
+            cold, message = timed_load(service)
+            print(f"Premier chargement ({args.count} photos, {workers} processus): {cold:.2f} s - {message}")
+
+        warm, _ = timed_load(service)
+        print(f"Chargement sans changement: {warm * 1000:.1f} ms")
+
+        make_gallery(args.photo, folder, 1, seed=1)
+        shutil.move(os.path.join(folder, 'person0_1.jpg'), os.path.join(folder, 'newcomer_1.jpg'))
+        os.utime(os.path.join(folder, 'person1_1.jpg'))
+        changed, _ = timed_load(service)
+        print(f"Chargement après un ajout, une suppression et une date modifiée: {changed * 1000:.1f} ms")
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Coût de la reconnaissance avec et sans suivi des identités entre les images
+
+Génère une séquence où le visage d'une photo se déplace lentement dans une
+image 960×720, enregistre ce visage dans la galerie, puis mesure:
+  - une image traitée sans suivi (détection HOG + encodage de chaque visage),
+  - une image de détection avec suivi (identité reprise de la piste),
+  - une image suivie entre deux détections (corrélation, sans détection).
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_identity_tracking --photo visage.jpg [--frames 60] [--fps 30]
+"""
+import argparse
+import logging
+import time
+
+import cv2
+import face_recognition
+import numpy as np
+
+from services.face_gallery import FaceGallery
+from services.face_recognition_service import FaceRecognitionService
+
+
+def make_frames(photo_path, count, size=(720, 960), face_width=200):
+    """Séquence où le visage de la photo (agrandi à face_width pixels) traverse l'image"""
+    image = face_recognition.load_image_file(photo_path)
+    locations = face_recognition.face_locations(image)
+    if not locations:
+        raise SystemExit(f"Aucun visage dans '{photo_path}'")
+    top, right, bottom, left = locations[0]
+    margin = (right - left) // 2
+    crop = image[max(0, top - margin):bottom + margin, max(0, left - margin):right + margin]
+    factor = face_width / (right - left)
+    crop = cv2.cvtColor(cv2.resize(crop, (0, 0), fx=factor, fy=factor), cv2.COLOR_RGB2BGR)
+    height, width = crop.shape[:2]
+    frames = []
+    for i in range(count):
+        frame = np.full(size + (3,), 90, dtype=np.uint8)
+        x = min(50 + i * 4, size[1] - width)
+        frame[100:100 + height, x:x + width] = crop
+        frames.append(frame)
+    return frames, crop
+
+
+def mean_ms(function, frames):
+    start = time.perf_counter()
+    detections = [function(frame) for frame in frames]
+    return (time.perf_counter() - start) * 1000 / len(frames), detections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--photo', required=True, help='Photo contenant un visage')
+    parser.add_argument('--frames', type=int, default=60)
+    parser.add_argument('--fps', type=float, default=30, help='Cadence de la vidéo')
+    args = parser.parse_args()
+
+    logging.getLogger('face_recognition_service').setLevel(logging.WARNING)
+    service = FaceRecognitionService()
+    frames, face = make_frames(args.photo, args.frames)
+    with service.loading_lock:
+        encoding = face_recognition.face_encodings(cv2.cvtColor(face, cv2.COLOR_BGR2RGB))[0]
+        service.gallery = FaceGallery([encoding], ['reference'])
+    interval = service.settings['detection_interval']
+
+    service.settings['track_identities'] = False
+    full_ms, detections = mean_ms(service._process_frame, frames)
+    recognized = sum(d['name'] == 'reference' for frame in detections for d in frame)
+
+    service.settings['track_identities'] = True
+    service.identity_tracker.reset()
+    detect_ms, _ = mean_ms(service._process_frame, frames)
+    stats = service.identity_tracker.get_stats()
+    # Une détection sur la première image, puis suivi sur les suivantes
+    service.identity_tracker.reset()
+    service._process_frame(frames[0])
+    follow_ms, followed = mean_ms(service._follow_frame, frames[1:])
+
+    print(f"Visage reconnu sans suivi: {recognized}/{len(frames)} images")
+    print(f"Sans suivi, détection + encodage: {full_ms:.1f} ms/image")
+    print(f"Avec suivi, détection seule:      {detect_ms:.1f} ms/image "
+          f"({stats['recognitions']} encodages pour {len(frames)} images)")
+    print(f"Avec suivi, entre deux détections: {follow_ms:.2f} ms/image "
+          f"({sum(len(f) for f in followed)}/{len(followed)} visages suivis)")
+
+    detections_per_s = 1 / interval
+    before = detections_per_s * full_ms
+    after = detections_per_s * detect_ms + (args.fps - detections_per_s) * follow_ms
+    print(f"\nÀ {args.fps:.0f} images/s, détection toutes les {interval} s:")
+    print(f"  avant: identité mise à jour {detections_per_s:.0f} fois/s, {before / 10:.1f}% d'un cœur")
+    print(f"  après: identité mise à jour {args.fps:.0f} fois/s, {after / 10:.1f}% d'un cœur")
+    print(f"  identité à chaque image sans suivi: {args.fps * full_ms / 10:.0f}% d'un cœur")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+"""
+Latence des commandes /drone/move/* pendant la reconnaissance faciale
+
+Pour chaque mode, lance le backend Flask dans un processus séparé (serveur
+multi-thread de werkzeug, comme app.run) connecté au simulateur Tello, avec
+une vidéo rejouée depuis des images construites à partir d'une photo (visage
+en mouvement, personne connue):
+  - off:     reconnaissance arrêtée,
+  - thread:  reconnaissance dans un thread du processus Flask,
+  - process: reconnaissance dans un processus séparé (paramètre 'worker_process').
+Mesure ensuite, depuis ce processus, la durée des requêtes GET /drone/move/*
+(envoi de la commande RC au simulateur) et la cadence de détection atteinte.
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_move_latency --photo visage.jpg [--requests 300] [--modes off thread process]
+"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import cv2
+import face_recognition
+import numpy as np
+
+# Le serveur hérite de l'adresse du simulateur (lue dans config.py à l'import)
+os.environ.setdefault('TELLO_HOST', '127.0.0.1')
+os.environ.setdefault('TELLO_COMMAND_PORT', '9889')
+
+MOVES = ('up', 'down', 'left', 'right', 'forward', 'backward')
+
+
+def make_video(photo_path, folder, frames=60, face_width=160):
+    """Images 640×480 où le visage de la photo se déplace horizontalement"""
+    image = face_recognition.load_image_file(photo_path)
+    locations = face_recognition.face_locations(image)
+    if not locations:
+        raise SystemExit(f"Aucun visage dans '{photo_path}'")
+    top, right, bottom, left = locations[0]
+    margin = (right - left) // 2
+    crop = cv2.cvtColor(image[max(0, top - margin):bottom + margin, max(0, left - margin):right + margin],
+                        cv2.COLOR_RGB2BGR)
+    factor = face_width / (right - left)
+    crop = cv2.resize(crop, (0, 0), fx=factor, fy=factor)
+    height, width = crop.shape[:2]
+    travel = 640 - width
+    for index in range(frames):
+        frame = np.full((480, 640, 3), 90, dtype=np.uint8)
+        x = int(travel * (0.5 + 0.5 * np.sin(2 * np.pi * index / frames)))
+        y = (480 - height) // 2
+        frame[y:y + height, x:x + width] = crop
+        cv2.imwrite(os.path.join(folder, f"{index:04d}.jpg"), frame)
+
+
+def serve(args):
+    """Processus serveur: backend complet, reconnaissance selon le mode"""
+    from werkzeug.serving import make_server
+
+    from app import create_app
+    from controllers.face_recognition_controller import (face_recognition_service, video_service,
+                                                         drone_service)
+    from services.frame_sources import FileFrameSource
+
+    app = create_app()
+    success, message = drone_service.connect()
+    if not success:
+        raise SystemExit(message)
+    video_service.set_frame_source(FileFrameSource(args.video_folder))
+    success, message = video_service.start_video_stream()
+    if not success:
+        raise SystemExit(message)
+
+    if args.mode != 'off':
+        with face_recognition_service.loading_lock:
+            face_recognition_service.settings['photos_folder'] = args.photos_folder
+        face_recognition_service.load_known_faces()
+        face_recognition_service.update_settings({'worker_process': args.mode == 'process'})
+        success, message = face_recognition_service.start_face_recognition()
+        if not success:
+            raise SystemExit(message)
+
+    def terminate(signum, frame):
+        raise SystemExit(0)
+
+    # Arrêt propre (processus de reconnaissance, mémoire partagée) sur terminate()
+    signal.signal(signal.SIGTERM, terminate)
+    server = make_server('127.0.0.1', args.port, app, threaded=True)
+    print('ready', flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        face_recognition_service.stop_face_recognition()
+        video_service.stop_video_stream()
+        drone_service.disconnect()
+
+
+def get(port, path):
+    """Requête GET: (durée en ms, réponse JSON)"""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    start = time.perf_counter()
+    connection.request('GET', path)
+    body = connection.getresponse().read()
+    elapsed = (time.perf_counter() - start) * 1000
+    connection.close()
+    return elapsed, json.loads(body)
+
+
+def measure(mode, args, video_folder, photos_folder):
+    """Durées des requêtes /drone/move/* et cadence de détection pour un mode"""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.bench_move_latency', '--serve', '--mode', mode,
+         '--port', str(args.port), '--video-folder', video_folder, '--photos-folder', photos_folder],
+        stdout=subprocess.PIPE, text=True
+    )
+    try:
+        if server.stdout.readline().strip() != 'ready':
+            raise SystemExit(f"Le serveur ({mode}) n'a pas démarré")
+        time.sleep(args.warmup)
+
+        rng = np.random.default_rng(0)
+        durations = []
+        for index in range(args.requests):
+            elapsed, response = get(args.port, f"/drone/move/{MOVES[index % len(MOVES)]}")
+            if not response.get('success'):
+                raise SystemExit(f"Commande refusée: {response.get('message')}")
+            durations.append(elapsed)
+            # Intervalle aléatoire: les requêtes tombent à tous les instants d'une détection
+            time.sleep(rng.uniform(0.005, 0.03))
+        _, status = get(args.port, '/face_recognition/status')
+        rate = status['scheduler']['measured_rate'] if status['is_active'] else 0.0
+        names = sorted({d['name'] for d in status['current_detections']})
+        return np.array(durations), rate, names
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--photo', help='Photo contenant un visage')
+    parser.add_argument('--requests', type=int, default=300, help='Requêtes chronométrées par mode')
+    parser.add_argument('--modes', nargs='+', default=['off', 'thread', 'process'],
+                        choices=['off', 'thread', 'process'])
+    parser.add_argument('--warmup', type=float, default=3.0, help='Attente avant les mesures (s)')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--mode', help=argparse.SUPPRESS)
+    parser.add_argument('--video-folder', help=argparse.SUPPRESS)
+    parser.add_argument('--photos-folder', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+    if not args.photo:
+        parser.error("--photo est obligatoire")
+
+    from simulator.tello_simulator import TelloSimulator
+
+    workdir = tempfile.mkdtemp(prefix='bench_move_')
+    video_folder = os.path.join(workdir, 'video')
+    photos_folder = os.path.join(workdir, 'photos')
+    os.makedirs(video_folder)
+    os.makedirs(photos_folder)
+    make_video(args.photo, video_folder)
+    shutil.copy(args.photo, os.path.join(photos_folder, 'visage_1.jpg'))
+
+    simulator = TelloSimulator('127.0.0.1', int(os.environ['TELLO_COMMAND_PORT']))
+    simulator.start()
+    try:
+        print(f"{args.requests} requêtes /drone/move/* par mode")
+        print(f"{'mode':>8}{'moy. ms':>9}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}{'détections/s':>14}  visages")
+        for mode in args.modes:
+            durations, rate, names = measure(mode, args, video_folder, photos_folder)
+            print(f"{mode:>8}{durations.mean():>9.2f}{np.percentile(durations, 50):>8.2f}"
+                  f"{np.percentile(durations, 95):>8.2f}{np.percentile(durations, 99):>8.2f}"
+                  f"{durations.max():>8.2f}{rate:>14.1f}  {', '.join(names) or '-'}")
+    finally:
+        simulator.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Coût des requêtes de l'historique de télémétrie selon la durée enregistrée
+
+Remplit TelemetryHistory avec des paquets d'état simulés à 10 Hz (1 min à 24 h
+de vol), puis mesure le temps d'une requête sur tout l'historique et sur la
+dernière minute, et la mémoire occupée par les tampons.
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_telemetry_history [--max-points 500]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from models.telemetry_history import TelemetryHistory, HISTORY_FIELDS
+
+STATE_RATE = 10  # Paquets d'état par seconde
+
+
+def fill(history, seconds):
+    """Ajoute seconds secondes de télémétrie simulée"""
+    snapshot = {name: 0 for name in HISTORY_FIELDS}
+    for i in range(int(seconds * STATE_RATE)):
+        snapshot["height"] = 100 + 50 * np.sin(i / 200)
+        snapshot["battery"] = 100 - i / 3000
+        history.append(i / STATE_RATE, snapshot)
+    return seconds
+
+
+def time_query(history, repeat=50, **kwargs):
+    """Durée moyenne d'une requête, en millisecondes"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = history.query('height', **kwargs)
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def memory_bytes(history):
+    return sum(ring.times.nbytes + ring.min.nbytes + ring.max.nbytes + ring.mean.nbytes
+               for ring in history._levels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-points', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'vol':>8}{'requête complète ms':>22}{'points':>8}{'résolution':>12}"
+          f"{'dernière minute ms':>20}{'mémoire Mo':>12}")
+    for seconds in (60, 600, 3600, 6 * 3600, 24 * 3600):
+        history = TelemetryHistory()
+        fill(history, seconds)
+        full_ms, full = time_query(history, max_points=args.max_points)
+        last_ms, _ = time_query(history, start=seconds - 60, max_points=args.max_points)
+        print(f"{seconds / 60:>6.0f}mn{full_ms:>22.3f}{len(full['timestamps']):>8}{full['resolution']:>12}"
+              f"{last_ms:>20.3f}{memory_bytes(history) / 1e6:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
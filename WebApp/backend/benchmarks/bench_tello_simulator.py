@@ -0,0 +1,132 @@
+"""
+Mesures de bout en bout du backend contre le simulateur Tello
+
+Démarre simulator.tello_simulator dans le processus, y connecte DroneService
+(via djitellopy, comme avec un vrai drone) puis mesure:
+  - la latence aller-retour des commandes de lecture ("battery?"), via
+    djitellopy (qui scrute ses réponses toutes les 100 ms) et en UDP brut,
+  - la fréquence des paquets d'état reçus et des mises à jour de DroneData,
+  - la cadence des images publiées par VideoService sur le bus d'images.
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_tello_simulator [--commands 50] [--duration 5] [--video synthetic]
+"""
+import argparse
+import logging
+import os
+import socket
+import time
+
+import numpy as np
+from djitellopy import Tello
+
+# DroneService lit l'adresse du drone dans config.py à l'import
+os.environ.setdefault('TELLO_HOST', '127.0.0.1')
+os.environ.setdefault('TELLO_COMMAND_PORT', '9889')
+
+from config import TELLO_HOST, TELLO_COMMAND_PORT  # noqa: E402
+from services.drone_service import DroneService  # noqa: E402
+from services.video_service import VideoService  # noqa: E402
+from simulator.tello_simulator import TelloSimulator  # noqa: E402
+
+
+def measure_command_rtt(drone, count):
+    """Latence aller-retour de commandes de lecture, en millisecondes"""
+    rtts = []
+    for _ in range(count):
+        # djitellopy impose 0.1 s entre deux commandes: attendre hors mesure
+        time.sleep(0.1)
+        start = time.perf_counter()
+        drone.send_read_command('battery?')
+        rtts.append((time.perf_counter() - start) * 1000)
+    return np.array(rtts)
+
+
+def measure_raw_rtt(address, count):
+    """Latence aller-retour UDP brute du simulateur, sans djitellopy, en millisecondes"""
+    rtts = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.settimeout(1.0)
+        for _ in range(count):
+            start = time.perf_counter()
+            sock.sendto(b'battery?', address)
+            sock.recvfrom(1024)
+            rtts.append((time.perf_counter() - start) * 1000)
+    return np.array(rtts)
+
+
+def format_rtt(rtts):
+    return (f"moy. {rtts.mean():.2f} ms, p50 {np.percentile(rtts, 50):.2f} ms, "
+            f"p95 {np.percentile(rtts, 95):.2f} ms")
+
+
+def measure_state_rate(drone_service, duration):
+    """Paquets d'état reçus et mises à jour de DroneData par seconde"""
+    drone = drone_service.drone
+    received = 0
+    start_updates = drone_service.drone_data.updates
+    last_state = drone.get_current_state()
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        state = drone.get_current_state()
+        if state is not last_state:
+            received += 1
+            last_state = state
+        time.sleep(0.001)
+    updates = drone_service.drone_data.updates - start_updates
+    return received / duration, updates / duration
+
+
+def measure_video_fps(video_service, duration):
+    """Images publiées par seconde sur le bus de VideoService"""
+    # Laisser le décodeur se synchroniser sur la première image clé
+    video_service.frame_bus.wait_for_frame(0, timeout=10.0)
+    start_seq = video_service.frame_bus.seq
+    time.sleep(duration)
+    return (video_service.frame_bus.seq - start_seq) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--commands', type=int, default=50, help='Nombre de commandes chronométrées')
+    parser.add_argument('--duration', type=float, default=5.0, help='Durée des mesures d\'état et de vidéo (s)')
+    parser.add_argument('--video', default='synthetic', help='Source vidéo du simulateur ("none" pour ignorer)')
+    parser.add_argument('--state-rate', type=float, default=10.0)
+    args = parser.parse_args()
+
+    Tello.LOGGER.setLevel(logging.WARNING)
+    video = None if args.video == 'none' else args.video
+    simulator = TelloSimulator(TELLO_HOST, TELLO_COMMAND_PORT, state_rate=args.state_rate, video=video)
+    simulator.start()
+
+    drone_service = DroneService()
+    video_service = VideoService()
+    try:
+        success, message = drone_service.connect()
+        if not success:
+            raise SystemExit(message)
+
+        rtts = measure_command_rtt(drone_service.drone, args.commands)
+        print(f"RTT commandes djitellopy ({args.commands}): {format_rtt(rtts)}")
+        rtts = measure_raw_rtt((TELLO_HOST, TELLO_COMMAND_PORT), args.commands)
+        print(f"RTT commandes UDP brut ({args.commands}): {format_rtt(rtts)}")
+
+        state_rate, update_rate = measure_state_rate(drone_service, args.duration)
+        print(f"Télémétrie: {state_rate:.1f} paquets d'état/s (simulateur: {args.state_rate:g}/s), "
+              f"{update_rate:.1f} mises à jour de DroneData/s")
+
+        if video:
+            success, message = video_service.start_video_stream()
+            if not success:
+                raise SystemExit(message)
+            fps = measure_video_fps(video_service, args.duration)
+            print(f"Vidéo: {fps:.1f} images/s publiées sur le bus (simulateur: {simulator.video_fps:g}/s)")
+    finally:
+        video_service.stop_video_stream()
+        drone_service.disconnect()
+        simulator.stop()
+        print(f"Simulateur: {simulator.stats}")
+
+
+if __name__ == '__main__':
+    main()
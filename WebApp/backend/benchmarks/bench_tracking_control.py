@@ -0,0 +1,209 @@
+"""
+Simulation en boucle fermée du suivi de visage (services.tracking_controller)
+
+Un drone simulé (rotation, montée et avance proportionnelles à la commande RC,
+comme simulator.tello_simulator, avec un retard du premier ordre) filme une
+personne dont la trajectoire est rejouée: direction (degrés), hauteur
+relative (m) et distance (m) au cours du temps. Le visage est projeté dans une
+image 640×480 (caméra sténopé), détecté toutes les --period secondes avec
+--latency secondes de retard et un bruit de quelques pixels, et chaque
+détection met à jour la commande. Compare la loi de commande précédente de
+FaceTrackingService (vitesse fixe réduite près du centre), le TrackingController
+PID appliqué à chaque détection et le même PID appliqué à cadence fixe
+(--control-rate) sur la cible prédite par le filtre de Kalman de TrackingLoop:
+dépassement et temps d'établissement après un échelon, erreur RMS sur les
+trajectoires en mouvement, nombre d'inversions de la commande de rotation
+(oscillations) et écart RMS à la distance initiale (m), que les lois PID
+maintiennent en avançant ou en reculant.
+
+Trajectoires: 'step', 'walk', 'sine' et 'away' (la personne s'éloigne) intégrées, ou fichier CSV enregistré
+(colonnes t,bearing,height,distance) passé avec --trajectory.
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_tracking_control [--periods 0.2 0.05] [--latency 0.05] [--trajectory trajet.csv]
+"""
+import argparse
+import csv
+import math
+
+import numpy as np
+
+from services.tracking_controller import TrackingController, face_width_for_distance
+from services.tracking_loop import TrackingLoop
+
+FRAME_SIZE = (480, 640)
+HORIZONTAL_FOV = 70.0     # degrés
+FACE_WIDTH = 0.16         # m
+RESPONSE_TIME = 0.3       # Retard du premier ordre du drone (secondes)
+SIMULATION_STEP = 0.01    # secondes
+SETTLING_BAND = 0.1       # Erreur normalisée considérée comme centrée
+NOISE = 3.0               # Bruit des boîtes détectées (pixels)
+# Zones mortes par défaut de FaceTrackingService (pixels)
+DEADZONE_X, DEADZONE_Y = 50, 40
+DISTANCE_HYSTERESIS = 0.15
+
+
+def builtin_trajectories(duration):
+    """Trajectoires (t, direction, hauteur, distance) intégrées"""
+    t = np.arange(0, duration, SIMULATION_STEP)
+    lateral = np.minimum(t, 4.0) * 0.7  # Marche latérale à 0.7 m/s pendant 4 s, à 3 m
+    return {
+        'step': (t, np.full_like(t, 25.0), np.full_like(t, 0.3), np.full_like(t, 2.0)),
+        'walk': (t, np.degrees(np.arctan2(lateral - 1.4, 3.0)), np.zeros_like(t), np.full_like(t, 3.0)),
+        'sine': (t, 10 * np.sin(2 * np.pi * 0.25 * t), 0.2 * np.sin(2 * np.pi * 0.15 * t), np.full_like(t, 2.5)),
+        'away': (t, np.zeros_like(t), np.zeros_like(t), 2.0 + 0.5 * np.minimum(t, 4.0)),  # S'éloigne à 0.5 m/s
+    }
+
+
+def load_trajectory(path):
+    """Trajectoire enregistrée: colonnes t, bearing (degrés), height (m), distance (m)"""
+    with open(path, newline='') as f:
+        rows = [(float(r['t']), float(r['bearing']), float(r['height']), float(r['distance']))
+                for r in csv.DictReader(f)]
+    t, bearing, height, distance = (np.array(column) for column in zip(*rows))
+    grid = np.arange(t[0], t[-1], SIMULATION_STEP)
+    return grid - grid[0], *(np.interp(grid, t, column) for column in (bearing, height, distance))
+
+
+def legacy_command(box, frame_shape, max_speed):
+    """Loi de commande précédente de FaceTrackingService._tracking_loop"""
+    top, right, bottom, left = box
+    delta_x = (left + right) / 2 - frame_shape[1] // 2
+    delta_y = (top + bottom) / 2 - frame_shape[0] // 2
+    yaw = up_down = 0
+    if abs(delta_x) > DEADZONE_X:
+        yaw = int(math.copysign(max_speed, delta_x) * min(abs(delta_x) / 100, 1.0))
+    if abs(delta_y) > DEADZONE_Y:
+        up_down = int(-math.copysign(max_speed, delta_y) * min(abs(delta_y) / 100, 1.0))
+    return 0, 0, up_down, yaw
+
+
+def simulate(trajectory, law, period, latency, max_speed, control_rate=30.0, seed=0):
+    """
+    Rejoue une trajectoire en boucle fermée
+
+    Lois: 'legacy' et 'pid' calculent une commande à chaque détection,
+    'kalman' envoie control_rate fois par seconde la commande du PID sur la
+    cible prédite par le filtre de Kalman (TrackingLoop). Les lois PID
+    gardent aussi le visage à sa distance initiale (la loi précédente
+    n'avançait jamais).
+
+    Returns:
+        tuple: (instants, erreurs horizontales et verticales normalisées,
+            écarts à la distance initiale (m), commandes de rotation)
+    """
+    t, bearing, target_height, distance = trajectory
+    height, width = FRAME_SIZE
+    focal = (width / 2) / math.tan(math.radians(HORIZONTAL_FOV / 2))
+    rng = np.random.default_rng(seed)
+    controller = TrackingController(max_speeds={'yaw': max_speed, 'vertical': max_speed, 'distance': max_speed},
+                                    deadbands={'yaw': DEADZONE_X / (width / 2),
+                                               'vertical': DEADZONE_Y / (height / 2),
+                                               'distance': DISTANCE_HYSTERESIS})
+    target_width = face_width_for_distance(distance[0] * 100, HORIZONTAL_FOV)
+    loop = TrackingLoop(controller, control_rate)
+    next_control = 0.0
+
+    yaw = drone_height = drone_forward = 0.0
+    yaw_rate = vertical_rate = forward_rate = 0.0
+    command = (0, 0, 0, 0)
+    pending = []  # (instant de disponibilité, instant de capture, boîte)
+    next_capture = 0.0
+    errors_x, errors_y, errors_distance, commands = [], [], [], []
+    for index, now in enumerate(t):
+        # Image vue par le drone
+        current_distance = distance[index] - drone_forward
+        x = width / 2 + focal * math.tan(math.radians(bearing[index] - yaw))
+        y = height / 2 - focal * (target_height[index] - drone_height) / current_distance
+        face = focal * FACE_WIDTH / current_distance
+        errors_x.append((x - width / 2) / (width / 2))
+        errors_y.append((y - height / 2) / (height / 2))
+        errors_distance.append(current_distance - distance[0])
+
+        if now >= next_capture:
+            cx, cy = x + rng.normal(0, NOISE), y + rng.normal(0, NOISE)
+            size = face + rng.normal(0, NOISE)
+            box = (cy - size / 2, cx + size / 2, cy + size / 2, cx - size / 2)
+            pending.append((now + latency, now, box))
+            next_capture = now + period
+        while pending and pending[0][0] <= now:
+            _, captured, box = pending.pop(0)
+            if -face < box[1] and box[3] < width + face:
+                if law == 'kalman':
+                    loop.observe(controller.measure(box, FRAME_SIZE, target_width), captured)
+                elif law == 'pid':
+                    command = controller.update(controller.measure(box, FRAME_SIZE, target_width), captured)
+                else:
+                    command = legacy_command(box, FRAME_SIZE, max_speed)
+            else:
+                loop.lose()
+                controller.reset()
+                command = (0, 0, 0, 0)
+        if law == 'kalman' and now >= next_control:
+            command = loop.command(now)
+            next_control = now + 1.0 / control_rate
+        commands.append(command[3])
+
+        # Drone: vitesses proportionnelles à la commande, atteintes avec un retard
+        alpha = SIMULATION_STEP / (RESPONSE_TIME + SIMULATION_STEP)
+        yaw_rate += alpha * (command[3] - yaw_rate)               # degrés/s
+        vertical_rate += alpha * (command[2] / 100 - vertical_rate)  # m/s
+        forward_rate += alpha * (command[1] / 100 - forward_rate)    # m/s
+        yaw += yaw_rate * SIMULATION_STEP
+        drone_height += vertical_rate * SIMULATION_STEP
+        drone_forward += forward_rate * SIMULATION_STEP
+    return t, np.array(errors_x), np.array(errors_y), np.array(errors_distance), np.array(commands)
+
+
+def metrics(t, errors, commands):
+    """Dépassement (%), temps d'établissement (s), erreur RMS et inversions de la commande"""
+    initial = errors[0]
+    overshoot = 0.0
+    if abs(initial) > SETTLING_BAND:
+        overshoot = max(0.0, float(np.max(-np.sign(initial) * errors))) / abs(initial) * 100
+    outside = np.nonzero(np.abs(errors) > SETTLING_BAND)[0]
+    settling = t[outside[-1] + 1] if len(outside) and outside[-1] + 1 < len(t) else (
+        0.0 if not len(outside) else math.inf)
+    rms = float(np.sqrt(np.mean(errors[t >= 1.0] ** 2)))
+    signs = np.sign(commands[commands != 0])
+    reversals = int(np.sum(signs[1:] != signs[:-1]))
+    return overshoot, settling, rms, reversals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--periods', type=float, nargs='+', default=[0.2, 0.05],
+                        help='Intervalles entre deux détections (secondes)')
+    parser.add_argument('--latency', type=float, default=0.05, help='Durée d\'une détection (secondes)')
+    parser.add_argument('--max-speeds', type=int, nargs='+', default=[20, 60],
+                        help='Vitesses maximales de rotation et verticale (RC, 20 par défaut dans le service)')
+    parser.add_argument('--control-rate', type=float, default=30.0,
+                        help='Cadence des commandes de la loi \'kalman\' (Hz)')
+    parser.add_argument('--duration', type=float, default=10.0, help='Durée des trajectoires intégrées (s)')
+    parser.add_argument('--trajectory', help='Trajectoire enregistrée (CSV t,bearing,height,distance)')
+    args = parser.parse_args()
+
+    trajectories = builtin_trajectories(args.duration)
+    if args.trajectory:
+        trajectories = {args.trajectory: load_trajectory(args.trajectory)}
+
+    print(f"Détection: latence {args.latency * 1000:.0f} ms, bruit {NOISE:g} px; "
+          f"axe horizontal (vertical entre parenthèses)")
+    print(f"{'trajectoire':>12}{'vitesse':>9}{'période':>9}{'loi':>8}{'dépass. %':>16}{'établ. s':>16}"
+          f"{'RMS':>16}{'inversions':>12}{'distance m':>12}")
+    for name, trajectory in trajectories.items():
+        for max_speed in args.max_speeds:
+            for period in args.periods:
+                for law in ('legacy', 'pid', 'kalman'):
+                    t, errors_x, errors_y, errors_distance, commands = simulate(
+                        trajectory, law, period, args.latency, max_speed, args.control_rate)
+                    over_x, settle_x, rms_x, reversals = metrics(t, errors_x, commands)
+                    over_y, settle_y, rms_y, _ = metrics(t, errors_y, commands)
+                    rms_distance = metrics(t, errors_distance, commands)[2]
+                    print(f"{name:>12}{max_speed:>9}{period:>9g}{law:>8}{f'{over_x:.0f} ({over_y:.0f})':>16}"
+                          f"{f'{settle_x:.2f} ({settle_y:.2f})':>16}{f'{rms_x:.3f} ({rms_y:.3f})':>16}"
+                          f"{reversals:>12}{rms_distance:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Micro-benchmark de l'étage de capture de VideoService
+
+Compare l'ancienne boucle (copie + cv2.resize vers un nouveau tableau à chaque
+tour, sans attente) à la boucle actuelle (détection des nouvelles images et
+redimensionnement dans des tampons préalloués), sur un faux flux Tello
+960x720 à 30 FPS.
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_video_capture [--duration 3] [--fps 30]
+"""
+import argparse
+import threading
+import time
+import tracemalloc
+from unittest.mock import MagicMock
+
+import cv2
+import numpy as np
+
+from config import VIDEO_WIDTH, VIDEO_HEIGHT
+from services.video_service import VideoService
+
+SOURCE_SHAPE = (720, 960, 3)
+
+
+class FakeFrameRead:
+    """Imite djitellopy.BackgroundFrameRead: remplace .frame à chaque image décodée"""
+
+    def __init__(self, fps):
+        # Images sources préallouées pour que le producteur n'alloue rien
+        self._sources = [np.random.randint(0, 255, SOURCE_SHAPE, dtype=np.uint8) for _ in range(4)]
+        self.frame = self._sources[0]
+        self.decoded = 1
+        self._fps = fps
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(1.0 / self._fps):
+            self.frame = self._sources[self.decoded % len(self._sources)]
+            self.decoded += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def legacy_capture_step(service, current_frame):
+    """Un tour de l'ancienne boucle _capture_video"""
+    with service.legacy_lock:
+        frame = current_frame.copy()
+        frame = cv2.resize(frame, (VIDEO_WIDTH, VIDEO_HEIGHT))
+    service.frame_bus.publish(frame)
+
+
+def legacy_capture(service):
+    """Ancienne boucle _capture_video: aucune attente, un redimensionnement par tour"""
+    while service._streaming and service.drone_service.connected:
+        current_frame = service.drone_service.drone.get_frame_read().frame
+        if current_frame is not None:
+            legacy_capture_step(service, current_frame)
+
+
+def make_service(frame_read):
+    """Crée un VideoService branché sur un faux drone"""
+    VideoService._instance = None
+    service = VideoService()
+    service.drone_service = MagicMock()
+    service.drone_service.connected = True
+    service.drone_service.drone.get_frame_read.return_value = frame_read
+    service.legacy_lock = threading.Lock()
+    return service
+
+
+def run_capture(capture, duration, fps):
+    """Exécute une boucle de capture et mesure son temps CPU par image publiée"""
+    frame_read = FakeFrameRead(fps)
+    service = make_service(frame_read)
+    cpu = {}
+
+    def target():
+        start = time.thread_time()
+        capture(service)
+        cpu['seconds'] = time.thread_time() - start
+
+    service._streaming = True
+    thread = threading.Thread(target=target, daemon=True)
+    frame_read.start()
+    thread.start()
+    time.sleep(duration)
+    service._streaming = False
+    thread.join()
+    frame_read.stop()
+
+    published = service.frame_bus.seq
+    return {
+        "decoded": frame_read.decoded,
+        "published": published,
+        "resizes_per_decoded": published / frame_read.decoded,
+        "cpu_ms_per_decoded": 1000 * cpu['seconds'] / frame_read.decoded,
+        "cpu_percent": 100 * cpu['seconds'] / duration,
+    }
+
+
+def measure_allocations(step, iterations=50):
+    """Mesure le pic d'allocation (octets) d'un tour de capture en régime établi"""
+    peaks = []
+    tracemalloc.start()
+    for _ in range(iterations):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        step()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    tracemalloc.stop()
+    # Ignorer les premiers tours (préallocation des tampons)
+    return int(np.median(peaks[5:]))
+
+
+def current_step_factory():
+    """Prépare un tour de la boucle actuelle: redimensionnement dans un tampon recyclé"""
+    frame_read = FakeFrameRead(30)
+    service = make_service(frame_read)
+    buffers = [np.empty((VIDEO_HEIGHT, VIDEO_WIDTH, 3), dtype=np.uint8) for _ in range(3)]
+    state = {"index": 0}
+
+    def step():
+        buffer = buffers[state["index"]]
+        state["index"] = (state["index"] + 1) % len(buffers)
+        cv2.resize(frame_read.frame, (VIDEO_WIDTH, VIDEO_HEIGHT), dst=buffer)
+        service.frame_bus.publish(buffer)
+
+    return step
+
+
+def legacy_step_factory():
+    """Prépare un tour de l'ancienne boucle"""
+    frame_read = FakeFrameRead(30)
+    service = make_service(frame_read)
+    return lambda: legacy_capture_step(service, frame_read.frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--duration', type=float, default=3.0, help='Durée de chaque mesure (secondes)')
+    parser.add_argument('--fps', type=float, default=30.0, help='Cadence du faux flux Tello')
+    args = parser.parse_args()
+
+    cv2.setNumThreads(1)
+    results = {
+        "avant": run_capture(legacy_capture, args.duration, args.fps),
+        "après": run_capture(VideoService._capture_video, args.duration, args.fps),
+    }
+    results["avant"]["bytes_per_frame"] = measure_allocations(legacy_step_factory())
+    results["après"]["bytes_per_frame"] = measure_allocations(current_step_factory())
+
+    print(f"Source {SOURCE_SHAPE[1]}x{SOURCE_SHAPE[0]} @ {args.fps:g} FPS -> {VIDEO_WIDTH}x{VIDEO_HEIGHT}, {args.duration:g} s")
+    print(f"{'':8}{'redim./image':>14}{'CPU ms/image':>14}{'CPU %':>8}{'octets alloués/image':>22}")
+    for label, r in results.items():
+        print(f"{label:8}{r['resizes_per_decoded']:>14.1f}{r['cpu_ms_per_decoded']:>14.2f}"
+              f"{r['cpu_percent']:>8.1f}{r['bytes_per_frame']:>22,}")
+
+
+if __name__ == '__main__':
+    main()
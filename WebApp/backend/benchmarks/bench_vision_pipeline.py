@@ -0,0 +1,116 @@
+"""
+Débit des traitements de vision sur une source vidéo rejouée, sans drone
+
+Alimente VideoService avec une source 'file' (vidéo ou dossier d'images) ou
+'synthetic', puis mesure pour chaque traitement (suivi Haar, reconnaissance
+faciale, gestes) le nombre d'images traitées par seconde, le temps de
+traitement et les images perdues rapportés par le bus d'images.
+
+Usage (depuis WebApp/backend):
+    python -m benchmarks.bench_vision_pipeline --source synthetic --fps 30
+    python -m benchmarks.bench_vision_pipeline --source file --path clip.mp4 --stages tracking recognition
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from services.frame_sources import create_frame_source
+from services.video_service import VideoService
+
+
+def tracking_stage():
+    """Détection Haar plein cadre, comme FaceTrackingService"""
+    cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+    def process(frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(50, 50))
+
+    return process
+
+
+def recognition_stage():
+    """Détection + encodage + comparaison, comme FaceRecognitionService"""
+    from services.face_recognition_service import FaceRecognitionService
+    service = FaceRecognitionService()
+    return service._process_frame
+
+
+def gesture_stage():
+    """Détection de la main MediaPipe, comme GestureService"""
+    import mediapipe as mp
+    hands = mp.solutions.hands.Hands(max_num_hands=1, model_complexity=0,
+                                     min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+    def process(frame):
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame_rgb.flags.writeable = False
+        return hands.process(frame_rgb)
+
+    return process
+
+
+STAGES = {
+    'tracking': tracking_stage,
+    'recognition': recognition_stage,
+    'gesture': gesture_stage,
+}
+
+
+def run_stage(video_service, name, process, duration):
+    """Consomme le bus d'images pendant duration secondes avec un traitement"""
+    subscriber = video_service.frame_bus.subscribe(name)
+    durations = []
+    deadline = time.monotonic() + duration
+    try:
+        while time.monotonic() < deadline:
+            packet = subscriber.next_frame(timeout=1.0)
+            if packet is None:
+                continue
+            start = time.perf_counter()
+            process(packet.frame)
+            durations.append(time.perf_counter() - start)
+    finally:
+        subscriber.close()
+
+    stats = subscriber.get_stats()
+    durations = np.array(durations) * 1000 if durations else np.zeros(1)
+    return {
+        "processed_fps": stats["received"] / duration,
+        "mean_ms": float(durations.mean()),
+        "p95_ms": float(np.percentile(durations, 95)),
+        "dropped": stats["dropped"],
+        "received": stats["received"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--source', choices=['file', 'synthetic'], default='synthetic')
+    parser.add_argument('--path', default='', help='Vidéo ou dossier d\'images pour --source file')
+    parser.add_argument('--fps', type=float, default=30.0, help='Cadence de rejeu de la source')
+    parser.add_argument('--duration', type=float, default=10.0, help='Durée de mesure par traitement (secondes)')
+    parser.add_argument('--stages', nargs='+', choices=sorted(STAGES), default=['tracking'])
+    args = parser.parse_args()
+
+    video_service = VideoService()
+    video_service.set_frame_source(create_frame_source(video_service.drone_service, args.source, args.path, args.fps))
+    success, message = video_service.start_video_stream()
+    if not success:
+        raise SystemExit(message)
+
+    try:
+        print(f"Source '{args.source}' @ {args.fps:g} FPS, {args.duration:g} s par traitement")
+        print(f"{'traitement':12}{'img/s':>8}{'moy. ms':>10}{'p95 ms':>10}{'reçues':>8}{'perdues':>9}")
+        for name in args.stages:
+            result = run_stage(video_service, name, STAGES[name](), args.duration)
+            print(f"{name:12}{result['processed_fps']:>8.1f}{result['mean_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                  f"{result['received']:>8}{result['dropped']:>9}")
+    finally:
+        video_service.stop_video_stream()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,53 @@
 # Configuration de l'application
+import os
 
 # Ports
 TELLO_PORT = 8889
 API_PORT = 5000
 
+# Adresse et port de commande du drone. Pour tester sans drone, lancer
+# simulator/tello_simulator.py et exporter TELLO_HOST=127.0.0.1 TELLO_COMMAND_PORT=9889
+TELLO_HOST = os.environ.get('TELLO_HOST', '192.168.10.1')
+TELLO_COMMAND_PORT = int(os.environ.get('TELLO_COMMAND_PORT', TELLO_PORT))
+
 # Paramètres vidéo
 VIDEO_WIDTH = 640
 VIDEO_HEIGHT = 480
+# Nombre de tampons réutilisés pour les images redimensionnées: une image publiée
+# reste valide pendant (VIDEO_FRAME_BUFFERS - 1) images suivantes
+VIDEO_FRAME_BUFFERS = 3
+# Anneau d'images en mémoire partagée, lisible par d'autres processus sans copie
+# (services/shared_frame_ring.py): nombre d'emplacements, 0 pour le désactiver.
+# Ses emplacements remplacent alors les tampons ci-dessus
+VIDEO_SHARED_RING_SLOTS = int(os.environ.get('VIDEO_SHARED_RING_SLOTS', 0))
+VIDEO_SHARED_RING_NAME = os.environ.get('VIDEO_SHARED_RING_NAME', 'tello_frames')
+
+# Source vidéo: 'tello' (flux du drone), 'file' (vidéo ou dossier d'images rejoué)
+# ou 'synthetic' (images générées), pour tester le pipeline sans drone
+VIDEO_SOURCE = 'tello'
+VIDEO_SOURCE_PATH = ''
+VIDEO_SOURCE_FPS = 30
+VIDEO_SOURCE_LOOP = True
+
+# Intervalle de lecture des paquets d'état du drone (en secondes). Le Tello en
+# envoie ~10 par seconde: chaque paquet est pris en compte au plus 20 ms après
+# son arrivée
+TELEMETRY_POLL_INTERVAL = 0.02
+
+# Historique de télémétrie: HISTORY_CAPACITY échantillons par niveau, chaque
+# niveau agrégeant HISTORY_LEVEL_FACTOR échantillons du précédent. À ~10 paquets
+# d'état par seconde: 10 min au niveau 0, 100 min au niveau 1, ~17 h au niveau 2
+HISTORY_CAPACITY = 6000
+HISTORY_LEVELS = 3
+HISTORY_LEVEL_FACTOR = 10
+
+# Intervalle des commentaires keepalive du flux /status/stream (en secondes)
+SSE_KEEPALIVE_INTERVAL = 15
+
+# Processus utilisés pour encoder les photos lors d'un chargement complet des
+# visages connus (0: un par cœur disponible)
+FACE_ENCODING_WORKERS = int(os.environ.get('FACE_ENCODING_WORKERS', 0))
 
-# Intervalle de mise à jour des données du drone (en secondes)
-DATA_UPDATE_INTERVAL = 1
\ No newline at end of file
+# Modèle ONNX du détecteur de visages YuNet (setting 'detector': 'yunet'), à
+# télécharger depuis opencv_zoo (models/face_detection_yunet)
+FACE_DETECTOR_YUNET_MODEL = os.environ.get('FACE_DETECTOR_YUNET_MODEL', 'model_data/face_detection_yunet_2023mar.onnx')
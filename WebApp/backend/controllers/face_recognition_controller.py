@@ -4,7 +4,7 @@ from services.face_recognition_service import FaceRecognitionService
 from services.video_service import VideoService
 from services.drone_service import DroneService
 from flask import jsonify
-from datetime import datetime, timedelta
+from datetime import datetime
 
 # Création du namespace
 face_recognition_ns = Namespace('face_recognition', description='Opérations de reconnaissance faciale')
@@ -20,7 +20,17 @@ settings_model = face_recognition_ns.model('FaceRecognitionSettings', {
     'confidence_threshold': fields.Float(description='Seuil de confiance pour la reconnaissance (0-1)'),
     'detection_interval': fields.Float(description='Intervalle entre les détections (secondes)'),
     'enable_tracking': fields.Boolean(description='Activer le suivi automatique'),
-    'recognition_scale': fields.Float(description='Facteur de mise à l\'échelle pour la reconnaissance')
+    'recognition_scale': fields.Float(description='Facteur de mise à l\'échelle pour la reconnaissance'),
+    'person_thresholds': fields.Raw(description='Distance maximale propre à certaines personnes (nom -> distance, 0-1)'),
+    'track_identities': fields.Boolean(description='Suivre les visages entre les images et réutiliser leur identité'),
+    'adaptive_scheduling': fields.Boolean(description='Ajuster l\'intervalle et l\'échelle de détection à la charge'),
+    'latency_budget': fields.Float(description='Durée maximale souhaitée d\'une détection (secondes)'),
+    'cpu_budget': fields.Float(description='Part maximale d\'un cœur utilisée par les détections (0-1)'),
+    'detector': fields.String(description='Détecteur de visages', enum=['hog', 'cnn', 'haar', 'yunet']),
+    'num_jitters': fields.Integer(description='Tirages aléatoires moyennés par encodage (1 ou plus, plus lent)'),
+    'landmark_model': fields.String(description='Repères d\'alignement des visages (5 ou 68 points)', enum=['small', 'large']),
+    'full_resolution_encoding': fields.Boolean(description='Encoder les visages recadrés dans l\'image d\'origine'),
+    'worker_process': fields.Boolean(description='Reconnaître dans un processus séparé (pris en compte au démarrage)')
 })
 
 # Modèle pour les informations d'une personne
@@ -34,6 +44,13 @@ status_model = face_recognition_ns.model('FaceRecognitionStatus', {
     'known_faces_count': fields.Integer(description='Nombre de visages connus'),
     'known_faces': fields.List(fields.String, description='Liste des personnes connues'),
     'current_detections': fields.List(fields.Raw, description='Détections actuelles'),
+    'scheduler': fields.Raw(description='Intervalle, échelle, cadence effective et budgets de la détection'),
+    'tracking': fields.Raw(description='Boucle de commande du suivi automatique: cadence, latence, '
+                                       'dernière commande et innovations du filtre de Kalman'),
+    'identity_tracking': fields.Raw(description='Pistes de visages suivies, visages encodés et identités reprises'),
+    'worker': fields.Raw(description='Processus de reconnaissance (pid, état, images traitées), null dans le thread'),
+    'loading': fields.Raw(description='Progression du chargement des visages connus (photos en cache, à encoder, encodées)'),
+    'available_detectors': fields.List(fields.String, description='Détecteurs de visages utilisables'),
     'settings': fields.Raw(description='Paramètres actuels')
 })
 
@@ -42,6 +59,7 @@ detected_person_model = face_recognition_ns.model('DetectedPerson', {
     'name': fields.String(description='Nom de la personne'),
     'confidence': fields.Float(description='Niveau de confiance (0-1)'),
     'position': fields.Raw(description='Position du visage dans l\'image'),
+    'track_id': fields.Integer(description='Identifiant de la piste du visage (suivi entre les images)'),
     'timestamp': fields.String(description='Horodatage de la détection')
 })
 
@@ -122,11 +140,11 @@ class FaceRecognitionSettings(Resource):
 
 @face_recognition_ns.route('/reload')
 class ReloadFaces(Resource):
-    @face_recognition_ns.doc(description='Recharger les visages connus depuis le dossier')
+    @face_recognition_ns.doc(description='Recharger les visages connus depuis le dossier (en arrière-plan, progression dans /status)')
     @face_recognition_ns.response(200, 'Succès', response_model)
     def get(self):
         """Recharger les visages connus depuis le dossier"""
-        success, message = face_recognition_service.load_known_faces()
+        success, message = face_recognition_service.reload_known_faces()
         return {"success": success, "message": message}
 
 @face_recognition_ns.route('/people')
@@ -183,15 +201,9 @@ class DroneDetection(Resource):
             # Récupérer les détections actuelles
             current_detections = face_recognition_service.current_detections
             
-            # Calculer les détections récentes (dernière minute)
-            recent_detections = []
+            # Personnes reconnues pendant la dernière minute
             now = datetime.now()
-            one_minute_ago = now - timedelta(minutes=1)
-            
-            # Filtrer les dernières détections par personne dans la dernière minute
-            for name, detection_time in face_recognition_service.last_detection.items():
-                if isinstance(detection_time, datetime) and detection_time > one_minute_ago:
-                    recent_detections.append(name)
+            recent_detections = face_recognition_service.get_recent_detections()
             
             # Calculer les statistiques
             total_faces = len(current_detections)
@@ -204,10 +216,7 @@ class DroneDetection(Resource):
             
             if drone_service and hasattr(drone_service, 'connected') and drone_service.connected:
                 is_drone_connected = True
-                try:
-                    battery_level = drone_service.drone.get_battery()
-                except:
-                    battery_level = 0
+                battery_level = drone_service.drone_data.get("battery", 0)
             
             # Construire la réponse
             response = {
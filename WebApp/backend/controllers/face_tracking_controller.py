@@ -1,6 +1,7 @@
 from flask_restx import Namespace, Resource, fields
 from services.face_tracking_service import FaceTrackingService
 from services.drone_service import DroneService
+from services.video_service import VideoService
 
 # Création du namespace
 face_tracking_ns = Namespace('face_tracking', description='Opérations de suivi de visage')
@@ -15,7 +16,14 @@ response_model = face_tracking_ns.model('Response', {
 status_model = face_tracking_ns.model('FaceTrackingStatus', {
     'is_tracking': fields.Boolean(description='État de fonctionnement du suivi'),
     'settings': fields.Raw(description='Paramètres de suivi'),
-    'face_detected': fields.Boolean(description='Indique si un visage est actuellement détecté')
+    'face_detected': fields.Boolean(description='Indique si un visage est actuellement détecté'),
+    'face_width': fields.Integer(description='Largeur du dernier visage suivi (pixels)'),
+    'detection': fields.Raw(description='Dernière recherche (fenêtre ou image entière), nombre de recherches, '
+                                        'durées de la détection et de l\'itération (ms) et tailles de visage '
+                                        'cherchées pendant le maintien de la distance'),
+    'controller': fields.Raw(description='Dernière commande et intégrale du régulateur PID de chaque axe'),
+    'control_loop': fields.Raw(description='Cadence des commandes, latence de la détection, âge de la dernière '
+                                           'mesure (ms) et innovations du filtre de Kalman')
 })
 
 # Modèle pour la mise à jour des paramètres
@@ -23,15 +31,27 @@ settings_model = face_tracking_ns.model('Settings', {
     'detection_frequency': fields.Float(description='Fréquence de détection en secondes'),
     'rotation_speed': fields.Integer(description='Vitesse de rotation (0-100)'),
     'deadzone_x': fields.Integer(description='Zone morte de détection horizontale (pixels)'),
-    'face_size_min': fields.Integer(description='Taille minimale du visage à détecter')
+    'face_size_min': fields.Integer(description='Taille minimale du visage à détecter'),
+    'roi_search': fields.Boolean(description='Chercher le visage autour de sa dernière position avant toute l\'image'),
+    'adaptive_scale': fields.Boolean(description='Chercher le visage aux tailles récemment observées, avec un parcours complet périodique'),
+    'follow_distance': fields.Boolean(description='Avancer ou reculer pour garder le visage à la distance souhaitée'),
+    'target_distance': fields.Integer(description='Distance souhaitée du visage (cm), estimée d\'après sa largeur'),
+    'distance_hysteresis': fields.Float(description='Écart relatif de largeur du visage toléré avant de corriger '
+                                                    'la distance (0.15: 15%)'),
+    'forward_speed': fields.Integer(description='Vitesse avant/arrière maximale (0-100)'),
+    'control_rate': fields.Float(description='Commandes RC envoyées par seconde entre deux détections'),
+    'pid_gains': fields.Raw(description='Gains kp, ki, kd, kf par axe (\'yaw\', \'vertical\', \'distance\'), '
+                                        'par exemple {"yaw": {"kp": 90}}')
 })
 
 # Initialisation du service
 face_tracking_service = FaceTrackingService()
 drone_service = DroneService()
+video_service = VideoService()
 
-# Initialiser le service de suivi avec le service drone
+# Initialiser le service de suivi avec les services drone et vidéo
 face_tracking_service.init_drone_service(drone_service)
+face_tracking_service.init_video_service(video_service)
 
 @face_tracking_ns.route('/start')
 class FaceTrackingStart(Resource):
@@ -119,13 +119,18 @@ def generate_face_frames():
     """Générateur qui produit les images pour le streaming MJPEG avec reconnaissance faciale"""
     global processed_frame
     
+    last_seq = 0
+    
     while True:
-        # Si pas de connexion ou pas d'image, générer une image "Pas de signal"
-        if not video_service.frame is None:
+        # Attendre une nouvelle image sur le bus vidéo (~30 FPS max côté drone)
+        packet = video_service.frame_bus.wait_for_frame(last_seq, timeout=0.5)
+        
+        if packet is not None:
+            last_seq = packet.seq
+            
             # Traiter la frame avec la reconnaissance faciale
             with frame_lock:
-                frame = video_service.frame.copy()
-                processed = process_frame_with_face_recognition(frame)
+                processed = process_frame_with_face_recognition(packet.frame)
             
             if processed is not None:
                 # Convertir l'image en JPEG pour le streaming
@@ -134,16 +139,13 @@ def generate_face_frames():
                     yield (b'--frame\r\n'
                           b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
             
-        else:
+        elif video_service.frame is None:
             # Créer une image "Pas de signal"
             no_signal_img = create_no_signal_frame()
             ret, buffer = cv2.imencode('.jpg', no_signal_img)
             if ret:
                 yield (b'--frame\r\n'
                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-        
-        # Petite pause pour éviter de surcharger le CPU
-        time.sleep(0.03)  # ~30 FPS
 
 def create_no_signal_frame():
     """Crée une image 'Pas de signal'"""
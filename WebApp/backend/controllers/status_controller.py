@@ -1,5 +1,8 @@
+from flask import Response, stream_with_context
 from flask_restx import Namespace, Resource, fields
 from services.drone_service import DroneService
+from services.event_hub import EventHub
+from models.telemetry_history import HISTORY_FIELDS
 
 # Création du namespace
 status_ns = Namespace('status', description='Statut du drone')
@@ -7,11 +10,23 @@ status_ns = Namespace('status', description='Statut du drone')
 # Modèles pour la documentation Swagger
 drone_data_model = status_ns.model('DroneData', {
     'battery': fields.Integer(description='Pourcentage de batterie'),
-    'temperature': fields.Integer(description='Température en Celsius'),
+    'temperature': fields.Float(description='Température en Celsius'),
     'flight_time': fields.Integer(description='Temps de vol en secondes'),
     'height': fields.Integer(description='Hauteur en cm'),
     'speed': fields.Integer(description='Vitesse en cm/s'),
-    'signal': fields.Integer(description='Force du signal')
+    'signal': fields.Integer(description='Force du signal'),
+    'pitch': fields.Integer(description='Tangage en degrés'),
+    'roll': fields.Integer(description='Roulis en degrés'),
+    'yaw': fields.Integer(description='Lacet en degrés'),
+    'speed_x': fields.Integer(description='Vitesse sur l\'axe X'),
+    'speed_y': fields.Integer(description='Vitesse sur l\'axe Y'),
+    'speed_z': fields.Integer(description='Vitesse sur l\'axe Z'),
+    'acceleration_x': fields.Float(description='Accélération sur l\'axe X'),
+    'acceleration_y': fields.Float(description='Accélération sur l\'axe Y'),
+    'acceleration_z': fields.Float(description='Accélération sur l\'axe Z'),
+    'barometer': fields.Float(description='Altitude barométrique en cm'),
+    'tof': fields.Integer(description='Distance au sol (capteur ToF) en cm'),
+    'timestamp': fields.Float(description='Heure de réception du dernier paquet d\'état (epoch)')
 })
 
 status_model = status_ns.model('Status', {
@@ -19,8 +34,28 @@ status_model = status_ns.model('Status', {
     'drone_data': fields.Nested(drone_data_model)
 })
 
-# Initialisation du service
+history_model = status_ns.model('TelemetryHistory', {
+    'field': fields.String(description='Champ de télémétrie'),
+    'resolution': fields.Integer(description='Nombre de paquets d\'état agrégés par échantillon source'),
+    'timestamps': fields.List(fields.Float, description='Début de chaque intervalle (epoch)'),
+    'min': fields.List(fields.Float, description='Minimum sur chaque intervalle'),
+    'max': fields.List(fields.Float, description='Maximum sur chaque intervalle'),
+    'mean': fields.List(fields.Float, description='Moyenne sur chaque intervalle')
+})
+
+history_parser = status_ns.parser()
+history_parser.add_argument('field', type=str, required=True, location='args', choices=HISTORY_FIELDS,
+                            help='Champ de télémétrie')
+history_parser.add_argument('from', type=float, dest='start', location='args',
+                            help='Début de la période (secondes epoch)')
+history_parser.add_argument('to', type=float, dest='end', location='args',
+                            help='Fin de la période (secondes epoch)')
+history_parser.add_argument('max_points', type=int, default=500, location='args',
+                            help='Nombre maximal de points retournés')
+
+# Initialisation des services
 drone_service = DroneService()
+event_hub = EventHub()
 
 @status_ns.route('')
 class StatusResource(Resource):
@@ -39,4 +74,40 @@ class DroneDataResource(Resource):
     @status_ns.response(200, 'Succès', drone_data_model)
     def get(self):
         """Obtenir les données télémétriques du drone"""
-        return drone_service.get_drone_data()
\ No newline at end of file
+        return drone_service.get_drone_data()
+
+@status_ns.route('/history')
+class TelemetryHistoryResource(Resource):
+    @status_ns.doc(description='Obtenir l\'historique d\'un champ de télémétrie, réduit à max_points '
+                               'intervalles (minimum, maximum et moyenne de chaque intervalle)')
+    @status_ns.expect(history_parser)
+    @status_ns.response(200, 'Succès', history_model)
+    @status_ns.response(400, 'Paramètres invalides')
+    def get(self):
+        """Obtenir l'historique d'un champ de télémétrie"""
+        args = history_parser.parse_args()
+        try:
+            return drone_service.get_telemetry_history(args['field'], args['start'], args['end'],
+                                                       args['max_points'])
+        except ValueError as e:
+            return {"success": False, "message": str(e)}, 400
+
+@status_ns.route('/stream')
+class StatusStreamResource(Resource):
+    @status_ns.doc(description='Flux Server-Sent Events des changements d\'état: événements "connection" '
+                               '(connexion du drone), "telemetry" (champs de télémétrie modifiés) et '
+                               '"detections" (reconnaissance faciale). L\'état courant est envoyé à '
+                               'l\'ouverture, puis seuls les changements; un client lent ne reçoit que '
+                               'le dernier état de chaque événement.')
+    def get(self):
+        """Recevoir les changements d'état du drone en continu"""
+        return Response(stream_with_context(event_hub.stream()),
+                        mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@status_ns.route('/stream/stats')
+class StatusStreamStatsResource(Resource):
+    @status_ns.doc(description='Obtenir les statistiques du flux d\'événements')
+    def get(self):
+        """Obtenir le nombre de clients et d'événements envoyés et fusionnés"""
+        return event_hub.get_stats()
@@ -39,4 +39,11 @@ class StopVideo(Resource):
     def get(self):
         """Arrêter le streaming vidéo"""
         success, message = video_service.stop_video_stream()
-        return {"success": success, "message": message}
\ No newline at end of file
+        return {"success": success, "message": message}
+
+@video_ns.route('/stats')
+class VideoStats(Resource):
+    @video_ns.doc(description='Obtenir les statistiques du bus d\'images')
+    def get(self):
+        """Obtenir la séquence courante et les images perdues par abonné"""
+        return video_service.get_stream_stats()
\ No newline at end of file
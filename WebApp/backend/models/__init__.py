@@ -1,2 +1,3 @@
 # Ce fichier permet d'importer les modèles depuis le package
-from models.drone_data import DroneData
\ No newline at end of file
+from models.drone_data import DroneData
+from models.telemetry_history import TelemetryHistory
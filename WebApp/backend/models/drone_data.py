@@ -1,35 +1,72 @@
+import time
+
+
 class DroneData:
-    """Classe représentant les données télémétriques du drone"""
-    
+    """
+    Classe représentant les données télémétriques du drone
+
+    Les données sont tirées des paquets d'état envoyés par le Tello (~10 Hz).
+    Chaque paquet produit un nouveau dictionnaire, jamais modifié ensuite, qui
+    remplace l'instantané précédent en une seule affectation: les lecteurs n'ont
+    besoin d'aucun verrou et voient toujours un paquet complet.
+    """
+
     def __init__(self):
-        self.battery = 0
-        self.temperature = 0
-        self.flight_time = 0
-        self.height = 0
-        self.speed = 0
-        self.signal = 0
-        
-    def to_dict(self):
-        """Convertit les données en dictionnaire"""
+        self.updates = 0  # Nombre de paquets d'état pris en compte
+        self._snapshot = self._build_snapshot({}, None)
+
+    @staticmethod
+    def _build_snapshot(state, timestamp):
+        """Construit l'instantané à partir d'un paquet d'état parsé par djitellopy"""
+        get = state.get
+        speed_x = get('vgx', 0)
         return {
-            "battery": self.battery,
-            "temperature": self.temperature,
-            "flight_time": self.flight_time,
-            "height": self.height,
-            "speed": self.speed,
-            "signal": self.signal
+            "battery": get('bat', 0),
+            "temperature": (get('templ', 0) + get('temph', 0)) / 2,
+            "flight_time": get('time', 0),
+            "height": get('h', 0),
+            "speed": speed_x,
+            "signal": 100,  # À remplacer par la vraie valeur si disponible
+            "pitch": get('pitch', 0),
+            "roll": get('roll', 0),
+            "yaw": get('yaw', 0),
+            "speed_x": speed_x,
+            "speed_y": get('vgy', 0),
+            "speed_z": get('vgz', 0),
+            "acceleration_x": get('agx', 0.0),
+            "acceleration_y": get('agy', 0.0),
+            "acceleration_z": get('agz', 0.0),
+            "barometer": get('baro', 0.0) * 100,  # cm, comme djitellopy.get_barometer
+            "tof": get('tof', 0),
+            "timestamp": timestamp,
         }
-    
+
+    def to_dict(self):
+        """Convertit les données en dictionnaire"""
+        return dict(self._snapshot)
+
+    def get(self, key, default=None):
+        """Retourne un champ de l'instantané courant"""
+        return self._snapshot.get(key, default)
+
+    def update_from_state(self, state, timestamp=None):
+        """
+        Met à jour les données à partir d'un paquet d'état
+
+        Args:
+            state: Dictionnaire retourné par Tello.get_current_state()
+            timestamp: Heure de réception (time.time() par défaut)
+        """
+        if not state:
+            return False
+        self._snapshot = self._build_snapshot(state, timestamp or time.time())
+        self.updates += 1
+        return True
+
     def update_from_drone(self, drone):
-        """Met à jour les données à partir de l'objet drone"""
+        """Met à jour les données à partir du dernier paquet d'état reçu par le drone"""
         try:
-            self.battery = drone.get_battery()
-            self.temperature = drone.get_temperature()
-            self.flight_time = drone.get_flight_time()
-            self.height = drone.get_height()
-            self.speed = drone.get_speed_x()
-            self.signal = 100  # À remplacer par la vraie valeur si disponible
-            return True
+            return self.update_from_state(drone.get_current_state())
         except Exception as e:
             print(f"Erreur lors de la récupération des données: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,196 @@
+import threading
+import numpy as np
+from config import HISTORY_CAPACITY, HISTORY_LEVELS, HISTORY_LEVEL_FACTOR
+
+# Champs numériques de DroneData conservés dans l'historique
+HISTORY_FIELDS = (
+    'battery', 'temperature', 'flight_time', 'height', 'speed',
+    'pitch', 'roll', 'yaw', 'speed_x', 'speed_y', 'speed_z',
+    'acceleration_x', 'acceleration_y', 'acceleration_z', 'barometer', 'tof',
+)
+
+
+class _Ring:
+    """Tampon circulaire d'échantillons horodatés (min, max et moyenne de chaque champ)"""
+
+    def __init__(self, capacity, field_count):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.min = np.zeros((capacity, field_count), dtype=np.float32)
+        self.max = np.zeros((capacity, field_count), dtype=np.float32)
+        self.mean = np.zeros((capacity, field_count), dtype=np.float32)
+        self.count = 0
+        self.head = 0  # Prochain emplacement écrit
+
+    def append(self, timestamp, vmin, vmax, vmean):
+        i = self.head
+        self.times[i] = timestamp
+        self.min[i] = vmin
+        self.max[i] = vmax
+        self.mean[i] = vmean
+        self.head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    @property
+    def oldest_time(self):
+        if self.count == 0:
+            return None
+        return self.times[self.head if self.count == self.capacity else 0]
+
+    def search(self, timestamp, side='left'):
+        """Indice logique (0 = plus ancien) d'insertion de timestamp, en O(log n)"""
+        if self.count < self.capacity:
+            return int(np.searchsorted(self.times[:self.count], timestamp, side))
+        # Tampon plein: [head:] contient les plus anciens, [:head] les plus récents
+        older = self.times[self.head:]
+        index = int(np.searchsorted(older, timestamp, side))
+        if index < len(older):
+            return index
+        return len(older) + int(np.searchsorted(self.times[:self.head], timestamp, side))
+
+    def take(self, array, lo, hi):
+        """Extrait les échantillons d'indices logiques [lo, hi) dans l'ordre chronologique"""
+        start = self.head if self.count == self.capacity else 0
+        a, b = start + lo, start + hi
+        if b <= self.capacity:
+            return array[a:b]
+        if a >= self.capacity:
+            return array[a - self.capacity:b - self.capacity]
+        return np.concatenate((array[a:], array[:b - self.capacity]))
+
+
+class TelemetryHistory:
+    """
+    Historique borné de la télémétrie, à plusieurs résolutions
+
+    Le niveau 0 garde les derniers HISTORY_CAPACITY paquets d'état; chaque niveau
+    suivant agrège HISTORY_LEVEL_FACTOR échantillons du précédent (min, max,
+    moyenne) dans un tampon de même taille, et couvre donc une durée
+    HISTORY_LEVEL_FACTOR fois plus longue. La mémoire est fixe quelle que soit
+    la durée du vol.
+
+    Une requête choisit le niveau le plus fin qui couvre la période demandée
+    avec au plus max_points * HISTORY_LEVEL_FACTOR échantillons: son coût est
+    proportionnel au nombre de points retournés, pas à la durée de la période.
+    """
+
+    def __init__(self, capacity=HISTORY_CAPACITY, levels=HISTORY_LEVELS, factor=HISTORY_LEVEL_FACTOR,
+                 fields=HISTORY_FIELDS):
+        self.fields = tuple(fields)
+        self.factor = factor
+        self._field_index = {name: i for i, name in enumerate(self.fields)}
+        self._levels = [_Ring(capacity, len(self.fields)) for _ in range(levels)]
+        # Agrégats en cours de construction pour les niveaux 1 et suivants
+        self._pending = [self._empty_bucket() for _ in range(levels)]
+        self._last_time = None
+        self._lock = threading.Lock()
+
+    def _empty_bucket(self):
+        return {"count": 0, "time": 0.0, "min": None, "max": None, "sum": None}
+
+    def append(self, timestamp, values):
+        """
+        Ajoute un échantillon
+
+        Args:
+            timestamp: Heure de l'échantillon (secondes epoch)
+            values: Dictionnaire champ -> valeur (DroneData.to_dict())
+        """
+        sample = np.array([values.get(name) or 0 for name in self.fields], dtype=np.float32)
+        with self._lock:
+            # Les recherches supposent des horodatages croissants
+            if self._last_time is not None and timestamp < self._last_time:
+                timestamp = self._last_time
+            self._last_time = timestamp
+            self._levels[0].append(timestamp, sample, sample, sample)
+            self._propagate(1, timestamp, sample, sample, sample)
+
+    def _propagate(self, level, timestamp, vmin, vmax, vmean):
+        """Accumule un échantillon dans l'agrégat du niveau donné"""
+        if level >= len(self._levels):
+            return
+        bucket = self._pending[level]
+        if bucket["count"] == 0:
+            bucket["time"] = timestamp
+            bucket["min"] = vmin.copy()
+            bucket["max"] = vmax.copy()
+            bucket["sum"] = vmean.astype(np.float64)
+        else:
+            np.minimum(bucket["min"], vmin, out=bucket["min"])
+            np.maximum(bucket["max"], vmax, out=bucket["max"])
+            bucket["sum"] += vmean
+        bucket["count"] += 1
+
+        if bucket["count"] == self.factor:
+            mean = (bucket["sum"] / self.factor).astype(np.float32)
+            self._levels[level].append(bucket["time"], bucket["min"], bucket["max"], mean)
+            self._propagate(level + 1, bucket["time"], bucket["min"], bucket["max"], mean)
+            self._pending[level] = self._empty_bucket()
+
+    def __len__(self):
+        return self._levels[0].count
+
+    def query(self, field, start=None, end=None, max_points=500):
+        """
+        Retourne l'historique d'un champ, réduit à max_points intervalles au plus
+
+        Args:
+            field: Nom du champ (voir HISTORY_FIELDS)
+            start, end: Bornes de la période (secondes epoch, incluses), tout l'historique par défaut
+            max_points: Nombre maximal de points retournés
+
+        Returns:
+            dict: timestamps, min, max, mean (listes de même longueur) et
+            resolution (nombre de paquets d'état agrégés par échantillon du niveau utilisé)
+
+        Raises:
+            ValueError: Champ inconnu ou max_points invalide
+        """
+        if field not in self._field_index:
+            raise ValueError(f"Champ inconnu: '{field}'")
+        if max_points < 1:
+            raise ValueError("max_points doit être positif")
+        column = self._field_index[field]
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+
+        with self._lock:
+            level, lo, hi = self._select_level(start, end, max_points)
+            ring = self._levels[level]
+            times = ring.take(ring.times, lo, hi)
+            mins = ring.take(ring.min[:, column], lo, hi)
+            maxs = ring.take(ring.max[:, column], lo, hi)
+            means = ring.take(ring.mean[:, column], lo, hi)
+
+            if len(times) > max_points:
+                times, mins, maxs, means = self._downsample(times, mins, maxs, means, max_points)
+
+            return {
+                "field": field,
+                "resolution": self.factor ** level,
+                "timestamps": times.tolist(),
+                "min": mins.tolist(),
+                "max": maxs.tolist(),
+                "mean": means.tolist(),
+            }
+
+    def _select_level(self, start, end, max_points):
+        """Choisit le niveau le plus fin qui couvre la période sans trop d'échantillons"""
+        budget = max_points * self.factor
+        for level, ring in enumerate(self._levels):
+            lo = ring.search(start, 'left')
+            hi = ring.search(end, 'right')
+            is_last = level == len(self._levels) - 1
+            covers_start = ring.count < ring.capacity or ring.oldest_time <= start
+            if is_last or (covers_start and hi - lo <= budget):
+                return level, lo, hi
+
+    @staticmethod
+    def _downsample(times, mins, maxs, means, max_points):
+        """Regroupe les échantillons en max_points intervalles de tailles égales"""
+        edges = np.linspace(0, len(times), max_points + 1).astype(np.intp)[:-1]
+        sizes = np.diff(np.append(edges, len(times)))
+        return (times[edges],
+                np.minimum.reduceat(mins, edges),
+                np.maximum.reduceat(maxs, edges),
+                np.add.reduceat(means.astype(np.float64), edges) / sizes)
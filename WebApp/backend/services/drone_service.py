@@ -1,7 +1,9 @@
 import threading
 import time
-from config import DATA_UPDATE_INTERVAL, TELLO_PORT
+from config import TELEMETRY_POLL_INTERVAL, TELLO_PORT, TELLO_HOST, TELLO_COMMAND_PORT
 from models.drone_data import DroneData
+from models.telemetry_history import TelemetryHistory
+from services.event_hub import EventHub
 from utils.system_utils import check_for_existing_processes, check_port_in_use
 
 class DroneService:
@@ -25,7 +27,13 @@ class DroneService:
         self.drone = None
         self.connected = False
         self.drone_data = DroneData()
+        self.telemetry_history = TelemetryHistory()
         self._data_thread = None
+        
+        # État initial envoyé aux clients du flux /status/stream
+        self.event_hub = EventHub()
+        self.event_hub.publish('connection', {"connected": False})
+        self.event_hub.publish('telemetry', self.drone_data.to_dict(), merge=True)
     
     def connect(self):
         """Connecte au drone Tello"""
@@ -42,12 +50,14 @@ class DroneService:
             # Import djitellopy ici pour éviter les erreurs si le module n'est pas installé
             from djitellopy import Tello
             
-            # Initialisation du drone
-            self.drone = Tello()
+            # Initialisation du drone (ou du simulateur configuré dans config.py)
+            self.drone = Tello(host=TELLO_HOST)
+            self.drone.address = (TELLO_HOST, TELLO_COMMAND_PORT)
             
             # Tentative de connexion
             self.drone.connect()
             self.connected = True
+            self.event_hub.publish('connection', {"connected": True})
             
             # Démarrer le thread de mise à jour des données
             self._data_thread = threading.Thread(target=self._update_drone_data, daemon=True)
@@ -75,24 +85,51 @@ class DroneService:
             
             self.connected = False
             self.drone = None
+            self.event_hub.publish('connection', {"connected": False})
             
             return True, "Drone déconnecté avec succès"
         except Exception as e:
             return False, f"Erreur lors de la déconnexion: {str(e)}"
     
     def _update_drone_data(self):
-        """Met à jour les données du drone en arrière-plan"""
+        """Met à jour les données du drone à chaque paquet d'état reçu"""
+        last_state = None
         while self.connected and self.drone:
             try:
-                self.drone_data.update_from_drone(self.drone)
+                # djitellopy remplace le dictionnaire d'état à chaque paquet reçu:
+                # un objet identique signifie qu'aucun nouveau paquet n'est arrivé
+                state = self.drone.get_current_state()
+                if state is not last_state:
+                    last_state = state
+                    self._publish_telemetry(state)
             except Exception as e:
                 print(f"Erreur lors de la mise à jour des données: {e}")
-            time.sleep(DATA_UPDATE_INTERVAL)
+            time.sleep(TELEMETRY_POLL_INTERVAL)
+    
+    def _publish_telemetry(self, state):
+        """Met à jour les données et publie les seuls champs modifiés"""
+        previous = self.drone_data.to_dict()
+        if not self.drone_data.update_from_state(state):
+            return
+        current = self.drone_data.to_dict()
+        self.telemetry_history.append(current["timestamp"], current)
+        delta = {key: value for key, value in current.items()
+                 if previous.get(key) != value}
+        self.event_hub.publish('telemetry', delta, merge=True)
     
     def get_drone_data(self):
-        """Retourne les données actuelles du drone"""
+        """Retourne les dernières données du drone, sans interroger le drone"""
         return self.drone_data.to_dict()
     
+    def get_telemetry_history(self, field, start=None, end=None, max_points=500):
+        """
+        Retourne l'historique d'un champ de télémétrie, agrégé en min/max/moyenne
+        
+        Raises:
+            ValueError: Champ inconnu ou max_points invalide
+        """
+        return self.telemetry_history.query(field, start, end, max_points)
+    
     def takeoff(self):
         """Faire décoller le drone"""
         if not self.connected or not self.drone:
@@ -0,0 +1,148 @@
+import json
+import threading
+import logging
+from config import SSE_KEEPALIVE_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+def sse_event(topic, data):
+    """Formate un événement Server-Sent Events"""
+    return f"event: {topic}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class EventClient:
+    """
+    File d'événements d'un client SSE
+
+    Seul le dernier état de chaque sujet est conservé: un client lent reçoit
+    l'état le plus récent au lieu d'un arriéré qui grandit sans limite. Les
+    sujets publiés en deltas (merge=True) sont fusionnés champ par champ.
+    """
+
+    def __init__(self, hub):
+        self._hub = hub
+        self._condition = threading.Condition()
+        self._pending = {}  # sujet -> données, dans l'ordre d'arrivée
+        self.closed = False
+        self.sent = 0
+        self.coalesced = 0
+
+    def push(self, topic, data, merge=False):
+        """Ajoute un événement, en remplaçant (ou complétant) celui du même sujet"""
+        with self._condition:
+            pending = self._pending.get(topic)
+            if pending is not None:
+                self.coalesced += 1
+                if merge:
+                    data = {**pending, **data}
+            self._pending[topic] = data
+            self._condition.notify()
+
+    def next_events(self, timeout=None):
+        """
+        Attend des événements et les retire de la file
+
+        Returns:
+            list: [(sujet, données)], vide si le délai expire ou si le client est fermé
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending or self.closed, timeout)
+            events = list(self._pending.items())
+            self._pending = {}
+        self.sent += len(events)
+        return events
+
+    def get_stats(self):
+        """Retourne les événements envoyés et fusionnés pour ce client"""
+        return {"sent": self.sent, "coalesced": self.coalesced}
+
+    def close(self):
+        """Désabonne le client et réveille le flux en attente"""
+        self._hub.unsubscribe(self)
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+
+
+class EventHub:
+    """Diffuse les changements d'état du backend (télémétrie, connexion, détections) aux clients SSE"""
+
+    _instance = None
+
+    def __new__(cls):
+        """Implémentation du pattern Singleton"""
+        if cls._instance is None:
+            cls._instance = super(EventHub, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """Initialisation du hub d'événements"""
+        if self._initialized:
+            return
+
+        self._initialized = True
+        self._lock = threading.Lock()
+        self._clients = set()
+        self._latest = {}  # Dernier état complet de chaque sujet, envoyé aux nouveaux clients
+        self.published = 0
+
+    def publish(self, topic, data, merge=False):
+        """
+        Publie un événement à tous les clients
+
+        Args:
+            topic: Nom de l'événement SSE ('telemetry', 'connection', 'detections')
+            data: Données sérialisables en JSON
+            merge: Si True, data est un delta fusionné dans l'état courant du sujet
+        """
+        with self._lock:
+            if merge:
+                self._latest[topic] = {**self._latest.get(topic, {}), **data}
+            else:
+                self._latest[topic] = data
+            self.published += 1
+            for client in self._clients:
+                client.push(topic, data, merge)
+
+    def latest(self, topic, default=None):
+        """Retourne le dernier état publié pour un sujet"""
+        return self._latest.get(topic, default)
+
+    def subscribe(self):
+        """Crée un client qui reçoit d'abord l'état courant de chaque sujet"""
+        client = EventClient(self)
+        with self._lock:
+            for topic, data in self._latest.items():
+                client.push(topic, data)
+            self._clients.add(client)
+        return client
+
+    def unsubscribe(self, client):
+        """Retire un client"""
+        with self._lock:
+            self._clients.discard(client)
+
+    def stream(self, keepalive=SSE_KEEPALIVE_INTERVAL):
+        """Générateur du flux text/event-stream d'un client"""
+        client = self.subscribe()
+        try:
+            # Délai de reconnexion automatique du navigateur (ms)
+            yield "retry: 2000\n\n"
+            while not client.closed:
+                events = client.next_events(timeout=keepalive)
+                if not events:
+                    # Commentaire SSE: détecte les clients partis et garde la connexion ouverte
+                    yield ": keepalive\n\n"
+                    continue
+                for topic, data in events:
+                    yield sse_event(topic, data)
+        finally:
+            client.close()
+
+    def get_stats(self):
+        """Retourne le nombre de clients et d'événements publiés"""
+        with self._lock:
+            clients = [client.get_stats() for client in self._clients]
+        return {"published": self.published, "clients": clients}
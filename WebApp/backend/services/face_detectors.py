@@ -0,0 +1,151 @@
+import logging
+from abc import ABC, abstractmethod
+from functools import lru_cache
+import cv2
+import face_recognition
+from config import FACE_DETECTOR_YUNET_MODEL
+
+logger = logging.getLogger(__name__)
+
+HAAR_SCALE_FACTOR = 1.1  # Rapport de taille entre deux niveaux de la pyramide de la cascade de Haar
+
+
+class FaceDetector(ABC):
+    """
+    Détecteur de visages
+
+    detect() reçoit une image BGR (convention OpenCV) et retourne les boîtes
+    (top, right, bottom, left) des visages, comme face_recognition.face_locations.
+    """
+
+    name = None
+
+    @abstractmethod
+    def detect(self, image, min_size=None, max_size=None):
+        """
+        Détecte les visages d'une image
+
+        Args:
+            image: Image BGR
+            min_size: Côté minimal d'un visage en pixels (None: minimum du détecteur)
+            max_size: Côté maximal d'un visage en pixels (None: pas de maximum)
+
+        Returns:
+            list: Boîtes (top, right, bottom, left)
+        """
+
+    @staticmethod
+    def _filter_size(boxes, min_size, max_size=None):
+        if min_size:
+            boxes = [box for box in boxes if min(box[2] - box[0], box[1] - box[3]) >= min_size]
+        if max_size:
+            boxes = [box for box in boxes if max(box[2] - box[0], box[1] - box[3]) <= max_size]
+        return boxes
+
+
+class HogDetector(FaceDetector):
+    """HOG de dlib (face_recognition): bon compromis, visages de face d'au moins ~40 pixels"""
+
+    name = 'hog'
+    model = 'hog'
+
+    def __init__(self, upsample=1):
+        self.upsample = upsample
+
+    def detect(self, image, min_size=None, max_size=None):
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        boxes = face_recognition.face_locations(rgb, self.upsample, model=self.model)
+        return self._filter_size(boxes, min_size, max_size)
+
+
+class CnnDetector(HogDetector):
+    """Réseau MMOD de dlib: le plus précis (profils, petits visages), très lent sans GPU"""
+
+    name = 'cnn'
+    model = 'cnn'
+
+
+class HaarDetector(FaceDetector):
+    """Cascade de Haar d'OpenCV: la plus rapide, plus de fausses détections"""
+
+    name = 'haar'
+
+    def __init__(self, cascade=None, scale_factor=HAAR_SCALE_FACTOR, min_neighbors=5):
+        if cascade is None:
+            cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+            if cascade.empty():
+                raise RuntimeError("Impossible de charger le classificateur de visages de Haar")
+        self.cascade = cascade
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+
+    def detect(self, image, min_size=None, max_size=None):
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        size = int(min_size) if min_size else 0
+        # Les niveaux de la pyramide hors de [min_size, max_size] ne sont pas parcourus
+        largest = int(max_size) if max_size else 0
+        faces = self.cascade.detectMultiScale(gray, scaleFactor=self.scale_factor,
+                                              minNeighbors=self.min_neighbors, minSize=(size, size),
+                                              maxSize=(largest, largest))
+        return [(int(y), int(x + w), int(y + h), int(x)) for x, y, w, h in faces]
+
+
+class YuNetDetector(FaceDetector):
+    """Réseau YuNet d'OpenCV (module DNN, CPU): précis et rapide, nécessite le modèle ONNX"""
+
+    name = 'yunet'
+
+    def __init__(self, model_path=FACE_DETECTOR_YUNET_MODEL, score_threshold=0.7):
+        if not hasattr(cv2, 'FaceDetectorYN'):
+            raise RuntimeError("YuNet nécessite OpenCV 4.5.4 ou plus récent")
+        try:
+            self.net = cv2.FaceDetectorYN.create(model_path, "", (320, 320), score_threshold)
+        except cv2.error as e:
+            raise RuntimeError(f"Impossible de charger le modèle YuNet '{model_path}': {e}")
+        self._input_size = (320, 320)
+
+    def detect(self, image, min_size=None, max_size=None):
+        height, width = image.shape[:2]
+        if (width, height) != self._input_size:
+            self.net.setInputSize((width, height))
+            self._input_size = (width, height)
+        _, faces = self.net.detect(image)
+        if faces is None:
+            return []
+        boxes = []
+        for x, y, w, h in faces[:, :4]:
+            # Les boîtes de YuNet peuvent déborder de l'image
+            top, left = max(0, int(y)), max(0, int(x))
+            boxes.append((top, min(width, int(x + w)), min(height, int(y + h)), left))
+        return self._filter_size(boxes, min_size, max_size)
+
+
+DETECTOR_BACKENDS = {
+    detector.name: detector for detector in (HogDetector, CnnDetector, HaarDetector, YuNetDetector)
+}
+
+
+def create_detector(name, **kwargs):
+    """
+    Crée un détecteur à partir de son nom
+
+    Raises:
+        ValueError: Nom inconnu
+        RuntimeError: Détecteur indisponible (modèle absent, version d'OpenCV)
+    """
+    if name not in DETECTOR_BACKENDS:
+        raise ValueError(f"Détecteur inconnu: '{name}' (disponibles: {', '.join(DETECTOR_BACKENDS)})")
+    return DETECTOR_BACKENDS[name](**kwargs)
+
+
+@lru_cache(maxsize=None)
+def available_detectors():
+    """Noms des détecteurs utilisables dans cet environnement"""
+    names = []
+    for name in DETECTOR_BACKENDS:
+        try:
+            create_detector(name)
+            names.append(name)
+        except RuntimeError as e:
+            logger.info(f"Détecteur '{name}' indisponible: {e}")
+    return tuple(names)
@@ -0,0 +1,105 @@
+import cv2
+import dlib
+import numpy as np
+import face_recognition
+from face_recognition import api as face_recognition_api
+
+LANDMARK_MODELS = ('small', 'large')
+CROP_MARGIN = 0.5  # Marge autour du visage recadré, en fraction de sa taille (la puce alignée en déborde)
+
+
+class FaceEncoder:
+    """
+    Encodage des visages détectés (descripteurs 128D de dlib)
+
+    Par défaut, les visages sont encodés sur l'image réduite où ils ont été
+    détectés, comme face_recognition.face_encodings. En pleine résolution, la
+    détection reste faite sur l'image réduite, mais chaque visage est recadré
+    dans l'image d'origine et les recadrages sont encodés en un seul appel à
+    dlib: les visages lointains (quelques dizaines de pixels à l'échelle 0.25)
+    sont encodés sur 4 fois plus de pixels, sans détection en pleine résolution.
+    """
+
+    def __init__(self, num_jitters=1, landmark_model='small', full_resolution=False):
+        """
+        Args:
+            num_jitters: Nombre de tirages aléatoires (décalage, zoom) moyennés par
+                encodage: plus stable, mais num_jitters fois plus lent
+            landmark_model: Repères du visage utilisés pour l'alignement:
+                'small' (5 points, rapide) ou 'large' (68 points)
+            full_resolution: Encoder les visages recadrés dans l'image d'origine
+
+        Raises:
+            ValueError: Paramètre invalide
+        """
+        if landmark_model not in LANDMARK_MODELS:
+            raise ValueError(f"Modèle de repères inconnu: '{landmark_model}' "
+                             f"(disponibles: {', '.join(LANDMARK_MODELS)})")
+        if int(num_jitters) < 1:
+            raise ValueError("num_jitters doit être au moins 1")
+        self.num_jitters = int(num_jitters)
+        self.landmark_model = landmark_model
+        self.full_resolution = full_resolution
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Crée l'encodeur décrit par les paramètres de la reconnaissance"""
+        return cls(settings['num_jitters'], settings['landmark_model'], settings['full_resolution_encoding'])
+
+    @property
+    def cache_key(self):
+        """Paramètres dont dépend l'encodage d'une photo (clé du cache d'encodages)"""
+        return f"{self.landmark_model}/{self.num_jitters}"
+
+    def encode_image(self, image):
+        """
+        Encode le premier visage d'une image RGB (photo de la galerie)
+
+        Les photos sont alignées et moyennées comme les visages du flux vidéo:
+        leurs distances ne sont comparables qu'avec les mêmes paramètres.
+
+        Returns:
+            np.ndarray, ou None si aucun visage n'est détecté
+        """
+        encodings = face_recognition.face_encodings(image, None, self.num_jitters, self.landmark_model)
+        return encodings[0] if len(encodings) > 0 else None
+
+    def encode(self, frame, small_frame, locations, scale):
+        """
+        Encode les visages détectés sur l'image réduite
+
+        Args:
+            frame: Image BGR d'origine
+            small_frame: Image BGR réduite, où les visages ont été détectés
+            locations: Boîtes (top, right, bottom, left) dans l'image réduite
+            scale: Facteur de réduction de small_frame
+
+        Returns:
+            list: Un encodage par boîte
+        """
+        if not locations:
+            return []
+        if not self.full_resolution or scale >= 1:
+            rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
+            return face_recognition.face_encodings(rgb_small_frame, locations, self.num_jitters,
+                                                   self.landmark_model)
+
+        predictor = (face_recognition_api.pose_predictor_5_point if self.landmark_model == 'small'
+                     else face_recognition_api.pose_predictor_68_point)
+        height, width = frame.shape[:2]
+        crops, shapes = [], []
+        for top, right, bottom, left in locations:
+            top, right, bottom, left = (int(top / scale), int(right / scale),
+                                        int(bottom / scale), int(left / scale))
+            margin = int(CROP_MARGIN * max(bottom - top, right - left))
+            crop_top, crop_left = max(0, top - margin), max(0, left - margin)
+            crop = cv2.cvtColor(frame[crop_top:min(height, bottom + margin), crop_left:min(width, right + margin)],
+                                cv2.COLOR_BGR2RGB)
+            box = dlib.rectangle(left - crop_left, top - crop_top, right - crop_left, bottom - crop_top)
+            detections = dlib.full_object_detections()
+            detections.append(predictor(crop, box))
+            crops.append(crop)
+            shapes.append(detections)
+
+        descriptors = face_recognition_api.face_encoder.compute_face_descriptor(crops, shapes, self.num_jitters)
+        return [np.array(descriptor[0]) for descriptor in descriptors]
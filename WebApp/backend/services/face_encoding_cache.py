@@ -0,0 +1,164 @@
+import os
+import hashlib
+import logging
+from collections import namedtuple
+import numpy as np
+from services.face_gallery import ENCODING_SIZE
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = '.face_encodings.npz'
+
+# Encodage d'une photo, valide tant que sa taille et sa date de modification
+# (ou à défaut son contenu) sont inchangées. encoding vaut None si la photo ne
+# contient aucun visage.
+CacheEntry = namedtuple('CacheEntry', ['size', 'mtime_ns', 'digest', 'encoding'])
+
+# Valeur retournée par lookup() pour une photo à encoder
+MISSING = object()
+
+# Paramètres d'encodage des caches enregistrés sans clé (face_recognition.face_encodings par défaut)
+DEFAULT_ENCODER_KEY = 'small/1'
+
+
+def file_digest(path):
+    """Empreinte SHA-1 du contenu d'un fichier"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FaceEncodingCache:
+    """
+    Cache disque (.npz) des encodages des photos du dossier de visages connus
+
+    Les entrées sont indexées par nom de fichier. Une photo dont la taille et la
+    date de modification n'ont pas changé est reprise sans être relue; sinon son
+    empreinte SHA-1 permet de reprendre l'encodage d'un contenu déjà connu
+    (fichier touché, renommé ou copié). Seules les photos nouvelles ou
+    modifiées sont encodées. Le cache est ignoré s'il a été construit avec
+    d'autres paramètres d'encodage (encoder_key, voir FaceEncoder.cache_key).
+    """
+
+    def __init__(self, folder, filename=CACHE_FILENAME, encoder_key=DEFAULT_ENCODER_KEY):
+        self.folder = folder
+        self.path = os.path.join(folder, filename)
+        self.encoder_key = encoder_key
+        self._entries = {}
+        self._by_digest = {}
+        self._seen = set()
+        self._digests = {}  # Empreintes calculées pendant ce passage, pour store()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self):
+        """Charge le cache depuis le disque et commence un nouveau passage sur le dossier"""
+        self._entries = {}
+        self._by_digest = {}
+        self._seen = set()
+        self._digests = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                encoder_key = str(data['encoder_key']) if 'encoder_key' in data.files else DEFAULT_ENCODER_KEY
+                if encoder_key != self.encoder_key:
+                    logger.info(f"Cache d'encodages construit avec d'autres paramètres ({encoder_key}), "
+                                f"il sera reconstruit")
+                    return
+                encodings = data['encodings'].astype(np.float32).reshape(-1, ENCODING_SIZE)
+                for name, size, mtime_ns, digest, has_face, encoding in zip(
+                        data['names'], data['sizes'], data['mtimes_ns'], data['digests'],
+                        data['has_face'], encodings):
+                    self._entries[str(name)] = CacheEntry(int(size), int(mtime_ns), str(digest),
+                                                          encoding if has_face else None)
+        except Exception as e:
+            logger.warning(f"Cache d'encodages illisible, il sera reconstruit: {e}")
+            self._entries = {}
+        self._by_digest = {entry.digest: entry for entry in self._entries.values()}
+
+    def lookup(self, filename):
+        """
+        Retourne l'encodage en cache d'une photo du dossier
+
+        Returns:
+            np.ndarray, None (aucun visage dans la photo) ou MISSING (photo à encoder)
+        """
+        self._seen.add(filename)
+        path = os.path.join(self.folder, filename)
+        stat = os.stat(path)
+        entry = self._entries.get(filename)
+
+        if entry is not None and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            self.hits += 1
+            return entry.encoding
+
+        # Date ou taille modifiée: reprendre l'encodage si le contenu est déjà connu
+        digest = file_digest(path)
+        known = self._by_digest.get(digest)
+        if known is not None:
+            self._set(filename, CacheEntry(stat.st_size, stat.st_mtime_ns, digest, known.encoding))
+            self.hits += 1
+            return known.encoding
+
+        self._digests[filename] = digest
+        self.misses += 1
+        return MISSING
+
+    def store(self, filename, encoding):
+        """Enregistre l'encodage d'une photo (None si elle ne contient aucun visage)"""
+        self._seen.add(filename)
+        path = os.path.join(self.folder, filename)
+        stat = os.stat(path)
+        digest = self._digests.pop(filename, None) or file_digest(path)
+        if encoding is not None:
+            encoding = np.asarray(encoding, dtype=np.float32)
+        self._set(filename, CacheEntry(stat.st_size, stat.st_mtime_ns, digest, encoding))
+
+    def remove(self, filename):
+        """Retire l'entrée d'une photo supprimée"""
+        if self._entries.pop(filename, None) is not None:
+            self._dirty = True
+
+    def _set(self, filename, entry):
+        self._entries[filename] = entry
+        self._by_digest[entry.digest] = entry
+        self._dirty = True
+
+    def save(self, prune=True):
+        """
+        Écrit le cache sur le disque
+
+        Args:
+            prune: Retirer les photos absentes de ce passage (False pour une
+                mise à jour ponctuelle qui ne parcourt pas tout le dossier)
+        """
+        removed = set(self._entries) - self._seen if prune else set()
+        for filename in removed:
+            del self._entries[filename]
+        if not (self._dirty or removed):
+            return
+
+        names = sorted(self._entries)
+        entries = [self._entries[name] for name in names]
+        zeros = np.zeros(ENCODING_SIZE, dtype=np.float32)
+        tmp_path = self.path + '.tmp.npz'
+        np.savez(tmp_path,
+                 encoder_key=np.array(self.encoder_key),
+                 names=np.array(names, dtype=str),
+                 sizes=np.array([e.size for e in entries], dtype=np.int64),
+                 mtimes_ns=np.array([e.mtime_ns for e in entries], dtype=np.int64),
+                 digests=np.array([e.digest for e in entries], dtype=str),
+                 has_face=np.array([e.encoding is not None for e in entries], dtype=bool),
+                 encodings=np.array([zeros if e.encoding is None else e.encoding for e in entries],
+                                    dtype=np.float32).reshape(-1, ENCODING_SIZE))
+        # Remplacement atomique: un arrêt pendant l'écriture ne corrompt pas le cache
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,158 @@
+import numpy as np
+from services.face_index import IVFIndex
+
+ENCODING_SIZE = 128  # Taille des encodages dlib de face_recognition
+FACE_MATCH_TOLERANCE = 0.6  # Distance maximale d'une correspondance (valeur par défaut de compare_faces)
+IDENTITY_CANDIDATES = 5  # Personnes retenues par les centroïdes avant la comparaison à toutes leurs photos
+IDENTITY_NEAREST = 3  # Photos les plus proches moyennées dans la distance à une personne
+ANN_MIN_IDENTITIES = 2000  # Personnes à partir desquelles les centroïdes sont cherchés dans un index approché
+
+
+def _pairwise_distances(faces, encodings, squared_norms):
+    """Distances euclidiennes M×N, en un seul produit matriciel"""
+    # |f - e|² = |f|² + |e|² - 2 f·e
+    squared = faces @ encodings.T
+    squared *= -2
+    squared += np.einsum('ij,ij->i', faces, faces)[:, None]
+    squared += squared_norms[None, :]
+    np.maximum(squared, 0, out=squared)
+    return np.sqrt(squared, out=squared)
+
+
+class FaceGallery:
+    """
+    Visages connus: matrice N×128 contiguë (float32) et noms associés
+
+    Une galerie n'est jamais modifiée après sa création: le service la remplace
+    en bloc, ce qui permet de comparer les visages sans copier les encodages.
+    Chaque ligne garde le fichier photo dont elle provient (sources), pour
+    ajouter ou retirer des photos sans tout réencoder.
+
+    Les photos d'une même personne forment une identité: toutes ses photos et
+    leur centroïde. Un visage est d'abord comparé aux centroïdes, puis aux
+    photos des IDENTITY_CANDIDATES personnes les plus proches seulement; sa
+    distance à une personne est la moyenne des IDENTITY_NEAREST photos les plus
+    proches, moins sensible à une seule photo atypique que la plus proche.
+
+    À partir de ANN_MIN_IDENTITIES personnes, les centroïdes les plus proches
+    sont cherchés dans un index IVF (voir services.face_index) au lieu d'être
+    tous comparés; une galerie dérivée par with_face() ou without() réutilise
+    ses listes sans réentraînement.
+    """
+
+    def __init__(self, encodings=(), names=(), sources=None, index=None):
+        encodings = np.asarray(encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+        sources = list(sources) if sources is not None else [None] * len(names)
+        if not len(encodings) == len(names) == len(sources):
+            raise ValueError("Autant de noms et de sources que d'encodages sont attendus")
+        self.encodings = np.ascontiguousarray(encodings)
+        self.names = list(names)
+        self.sources = sources
+        # |e|² précalculé pour la distance par produit matriciel
+        self._squared_norms = np.einsum('ij,ij->i', self.encodings, self.encodings)
+        self._build_identities()
+        self.index = None
+        if len(self.people) >= ANN_MIN_IDENTITIES:
+            self.index = index.derive(self.centroids) if index is not None else IVFIndex(self.centroids)
+
+    def _build_identities(self):
+        """Regroupe les lignes par personne et calcule les centroïdes"""
+        index = {}
+        person_of_row = np.array([index.setdefault(name, len(index)) for name in self.names], dtype=np.intp)
+        self.people = list(index)
+        order = np.argsort(person_of_row, kind='stable')
+        counts = np.bincount(person_of_row, minlength=len(self.people))
+        # Lignes de chaque personne, complétées par -1 jusqu'au nombre de photos le plus grand
+        self._members = np.full((len(self.people), counts.max(initial=0)), -1, dtype=np.intp)
+        if len(self.people):
+            offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            positions = np.arange(len(order)) - np.repeat(offsets, counts)
+            self._members[person_of_row[order], positions] = order
+            sums = np.add.reduceat(self.encodings[order].astype(np.float64), offsets)
+            self.centroids = (sums / counts[:, None]).astype(np.float32)
+        else:
+            self.centroids = np.zeros((0, ENCODING_SIZE), dtype=np.float32)
+        self._centroid_norms = np.einsum('ij,ij->i', self.centroids, self.centroids)
+
+    def __len__(self):
+        return len(self.names)
+
+    def with_face(self, encoding, name, source):
+        """Retourne une galerie avec un visage ajouté (ou remplacé s'il vient de la même photo)"""
+        keep = [i for i, existing in enumerate(self.sources) if existing != source]
+        return FaceGallery(np.vstack((self.encodings[keep], np.asarray(encoding, dtype=np.float32)[None, :])),
+                           [self.names[i] for i in keep] + [name],
+                           [self.sources[i] for i in keep] + [source], self.index)
+
+    def without(self, name=None, sources=()):
+        """Retourne une galerie sans les visages d'une personne et/ou des photos données"""
+        sources = set(sources)
+        keep = [i for i in range(len(self)) if self.names[i] != name and self.sources[i] not in sources]
+        if len(keep) == len(self):
+            return self
+        return FaceGallery(self.encodings[keep],
+                           [self.names[i] for i in keep],
+                           [self.sources[i] for i in keep], self.index)
+
+    def distances(self, face_encodings):
+        """
+        Distances euclidiennes entre M visages et les N visages connus
+
+        Returns:
+            np.ndarray: Matrice M×N (float32)
+        """
+        faces = np.asarray(face_encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+        return _pairwise_distances(faces, self.encodings, self._squared_norms)
+
+    def match(self, face_encodings, max_distance=FACE_MATCH_TOLERANCE, thresholds=None,
+              candidates=IDENTITY_CANDIDATES):
+        """
+        Associe chaque visage à la personne connue la plus proche
+
+        Args:
+            face_encodings: Encodages des M visages détectés
+            max_distance: Distance maximale d'une correspondance
+            thresholds: Distances maximales propres à certaines personnes (nom -> distance)
+            candidates: Personnes retenues par les centroïdes pour chaque visage
+
+        Returns:
+            list: (nom ou None si aucune personne n'est assez proche, distance)
+            pour chaque visage, dans l'ordre
+        """
+        if len(face_encodings) == 0:
+            return []
+        if len(self) == 0:
+            return [(None, None)] * len(face_encodings)
+
+        faces = np.asarray(face_encodings, dtype=np.float32).reshape(-1, ENCODING_SIZE)
+        if self.index is not None and len(self.people) > candidates:
+            shortlists = self.index.search(faces, candidates)
+        elif len(self.people) > candidates:
+            centroid_distances = _pairwise_distances(faces, self.centroids, self._centroid_norms)
+            shortlists = np.argpartition(centroid_distances, candidates - 1, axis=1)[:, :candidates]
+        else:
+            shortlists = np.broadcast_to(np.arange(len(self.people)), (len(faces), len(self.people)))
+
+        # Distances de chaque visage aux photos de ses personnes candidates (M×candidats×photos)
+        candidate_rows = self._members[shortlists]
+        valid = candidate_rows >= 0
+        rows, columns = np.unique(candidate_rows[valid], return_inverse=True)
+        distances = _pairwise_distances(faces, self.encodings[rows], self._squared_norms[rows])
+        face_index = np.broadcast_to(np.arange(len(faces))[:, None, None], candidate_rows.shape)[valid]
+        person_distances = np.full(candidate_rows.shape, np.inf, dtype=np.float32)
+        person_distances[valid] = distances[face_index, columns]
+
+        # Distance à une personne: moyenne de ses photos les plus proches
+        nearest = min(IDENTITY_NEAREST, candidate_rows.shape[2])
+        closest = np.partition(person_distances, nearest - 1, axis=2)[:, :, :nearest]
+        counts = np.minimum(valid.sum(axis=2), nearest)
+        scores = np.where(np.isinf(closest), 0, closest).sum(axis=2) / counts
+        best = scores.argmin(axis=1)
+
+        thresholds = thresholds or {}
+        results = []
+        for shortlist, candidate, score in zip(shortlists, best, scores[np.arange(len(best)), best]):
+            name = self.people[shortlist[candidate]]
+            limit = thresholds.get(name, max_distance)
+            results.append((name if score <= limit else None, float(score)))
+        return results
@@ -0,0 +1,95 @@
+import numpy as np
+
+ANN_PROBES = 8  # Listes parcourues par requête
+KMEANS_ITERATIONS = 10
+
+
+def _squared_distances(queries, vectors, squared_norms):
+    """Distances euclidiennes au carré M×N (|q|² omis: inutile pour classer)"""
+    squared = queries @ vectors.T
+    squared *= -2
+    squared += squared_norms[None, :]
+    return squared
+
+
+def kmeans(vectors, clusters, iterations=KMEANS_ITERATIONS, seed=0):
+    """
+    k-moyennes (Lloyd), en NumPy
+
+    Returns:
+        np.ndarray: Centres clusters×D (float32)
+    """
+    rng = np.random.default_rng(seed)
+    centers = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _squared_distances(vectors, centers, np.einsum('ij,ij->i', centers, centers)).argmin(axis=1)
+        counts = np.bincount(assignment, minlength=clusters)
+        sums = np.zeros(centers.shape, dtype=np.float64)
+        np.add.at(sums, assignment, vectors)
+        filled = counts > 0
+        centers[filled] = (sums[filled] / counts[filled, None]).astype(np.float32)
+        # Un centre sans vecteur repart d'un vecteur tiré au hasard
+        empty = np.flatnonzero(~filled)
+        centers[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+    return centers
+
+
+class IVFIndex:
+    """
+    Index approché (IVF, fichier inversé) de vecteurs de dimension fixe
+
+    Les vecteurs sont répartis entre ~√N listes par k-moyennes. Une requête ne
+    compare exactement que les vecteurs des ANN_PROBES listes dont le centre est
+    le plus proche: son coût croît en √N au lieu de N.
+
+    Les centres sont réutilisés par derive() tant que le nombre de vecteurs
+    reste entre la moitié et le double de celui de l'entraînement: un ajout ou
+    une suppression ne fait que réaffecter les vecteurs aux listes.
+    """
+
+    def __init__(self, vectors, centers=None, trained_size=None, probes=ANN_PROBES):
+        self.probes = probes
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        count = len(self.vectors)
+        if centers is None or not trained_size / 2 <= count <= trained_size * 2:
+            centers = kmeans(self.vectors, max(1, int(np.sqrt(count))))
+            trained_size = count
+        self.centers = centers
+        self.trained_size = trained_size
+        self._center_norms = np.einsum('ij,ij->i', centers, centers)
+        self._squared_norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+
+        assignment = _squared_distances(self.vectors, centers, self._center_norms).argmin(axis=1)
+        order = np.argsort(assignment, kind='stable')
+        self._lists = np.split(order, np.cumsum(np.bincount(assignment, minlength=len(centers)))[:-1])
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def derive(self, vectors):
+        """Retourne un index des nouveaux vecteurs, avec les mêmes centres si possible"""
+        return IVFIndex(vectors, self.centers, self.trained_size, self.probes)
+
+    def search(self, queries, k):
+        """
+        Retourne les k vecteurs les plus proches de chaque requête (approché)
+
+        Returns:
+            np.ndarray: Indices M×k, du plus proche au plus éloigné
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.vectors.shape[1])
+        probes = min(self.probes, len(self.centers))
+        center_distances = _squared_distances(queries, self.centers, self._center_norms)
+        nearest_lists = np.argpartition(center_distances, probes - 1, axis=1)[:, :probes]
+
+        results = np.empty((len(queries), k), dtype=np.intp)
+        for row, (query, lists) in enumerate(zip(queries, nearest_lists)):
+            candidates = np.concatenate([self._lists[i] for i in lists])
+            if len(candidates) < k:
+                # Trop peu de vecteurs dans les listes parcourues: recherche exacte
+                candidates = np.arange(len(self.vectors))
+            distances = _squared_distances(query[None, :], self.vectors[candidates],
+                                           self._squared_norms[candidates])[0]
+            best = np.argpartition(distances, k - 1)[:k]
+            results[row] = candidates[best[np.argsort(distances[best])]]
+        return results
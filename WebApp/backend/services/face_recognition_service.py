@@ -1,11 +1,24 @@
 import os
+import copy
 import cv2
 import face_recognition
 import numpy as np
 import threading
 import time
 import logging
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from config import FACE_ENCODING_WORKERS
+from services.event_hub import EventHub
+from services.face_gallery import FaceGallery, FACE_MATCH_TOLERANCE
+from services.face_encoding_cache import FaceEncodingCache, MISSING
+from services.identity_tracker import IdentityTracker
+from services.recognition_scheduler import RecognitionScheduler, cpu_cores
+from services.face_detectors import create_detector, available_detectors
+from services.face_encoder import FaceEncoder
+from services.tracking_controller import TrackingController
+from services.tracking_loop import TrackingLoop
+from services.recognition_worker import RecognitionWorker
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('face_recognition_service')
@@ -31,17 +44,34 @@ class FaceRecognitionService:
         self.video_service = None
         self.drone_service = None
         self.encodings_lock = threading.Lock()
+        # Un seul chargement complet à la fois; la galerie courante reste servie pendant ce temps
+        self.loading_lock = threading.Lock()
+        # Photos ajoutées ou supprimées pendant un chargement complet, réappliquées à la
+        # galerie et au cache qu'il construit (None hors chargement, modifiée sous encodings_lock)
+        self.pending_changes = None
+        self.cache_lock = threading.Lock()  # Lecture, modification et écriture du cache d'encodages
+        self.encoding_workers = FACE_ENCODING_WORKERS or cpu_cores()
+        self.loading_progress = {"in_progress": False, "total": 0, "cached": 0, "to_encode": 0,
+                                 "encoded": 0, "workers": 0}
         
         # État de la reconnaissance
         self.is_recognition_active = False
         self.recognition_thread = None
         self.stop_recognition = threading.Event()
+        self.worker = None  # Processus de reconnaissance (paramètre 'worker_process')
         
-        # Données des personnes reconnues
-        self.known_face_encodings = []
-        self.known_face_names = []
+        # Visages connus (remplacés en bloc sous encodings_lock)
+        self.gallery = FaceGallery()
         self.last_detection = {}  # Pour stocker la dernière détection de chaque personne
         self.current_detections = []  # Personnes actuellement détectées
+        self.identity_tracker = IdentityTracker()
+        self.scheduler = RecognitionScheduler()
+        self.event_hub = EventHub()
+        # Suivi automatique: vitesse maximale de 20, zones mortes de 10% de l'image
+        self.tracking_controller = TrackingController(deadbands={'yaw': 0.2, 'vertical': 0.2})
+        # Commandes envoyées à cadence fixe entre deux reconnaissances
+        self.tracking_loop = TrackingLoop(self.tracking_controller)
+        self.tracking_target = None  # Nom de la personne suivie par tracking_loop
         
         # Paramètres configurables
         self.settings = {
@@ -49,22 +79,77 @@ class FaceRecognitionService:
             'detection_interval': 0.5,    # Intervalle entre les détections (secondes)
             'enable_tracking': False,     # Activer le suivi automatique
             'photos_folder': 'pictures_faces',    # Dossier contenant les photos des personnes
-            'recognition_scale': 0.25     # Facteur de mise à l'échelle pour accélérer la reconnaissance
+            'recognition_scale': 0.25,    # Facteur de mise à l'échelle pour accélérer la reconnaissance
+            'person_thresholds': {},      # Distance maximale propre à certaines personnes (nom -> distance)
+            'track_identities': True,     # Suivre les visages d'une image à l'autre et réutiliser leur identité
+            'adaptive_scheduling': True,  # Ajuster intervalle et échelle à la charge (sinon valeurs ci-dessus)
+            'latency_budget': 0.15,       # Durée maximale souhaitée d'une détection (secondes)
+            'cpu_budget': 0.5,            # Part maximale d'un cœur utilisée par les détections
+            'detector': 'hog',            # Détecteur de visages: 'hog', 'cnn', 'haar' ou 'yunet'
+            'num_jitters': 1,             # Tirages aléatoires moyennés par encodage (plus stable, plus lent)
+            'landmark_model': 'small',    # Repères d'alignement des visages: 'small' (5 points) ou 'large' (68)
+            'full_resolution_encoding': False,  # Encoder les visages recadrés dans l'image d'origine (visages lointains)
+            'worker_process': False       # Reconnaître dans un processus séparé (pris en compte au démarrage)
         }
+        self.detector = create_detector(self.settings['detector'])
+        self.encoder = FaceEncoder.from_settings(self.settings)
         
         # Créer le dossier photos s'il n'existe pas
         os.makedirs(self.settings['photos_folder'], exist_ok=True)
         
-        # Tentative de chargement des visages connus
-        self.load_known_faces()
+        # Chargement des visages connus en arrière-plan: au premier démarrage,
+        # l'encodage de toutes les photos peut prendre plusieurs minutes
+        self.reload_known_faces()
+    
+    @classmethod
+    def create_pipeline(cls, settings, gallery):
+        """
+        Crée une instance hors singleton pour le processus de reconnaissance:
+        mêmes traitements d'image, sans dossier photos, chargement ni thread
+        """
+        pipeline = object.__new__(cls)
+        pipeline._initialized = True
+        pipeline.settings = copy.deepcopy(settings)
+        pipeline.encodings_lock = threading.Lock()
+        pipeline.gallery = gallery
+        pipeline.last_detection = {}
+        pipeline.identity_tracker = IdentityTracker()
+        pipeline.scheduler = RecognitionScheduler()
+        pipeline.detector = create_detector(settings['detector'])
+        pipeline.encoder = FaceEncoder.from_settings(settings)
+        return pipeline
+    
+    def warm_up(self):
+        """Premier passage sur une image vide: les premiers appels à dlib d'un processus sont bien plus lents"""
+        blank = np.zeros((100, 100, 3), dtype=np.uint8)
+        self.detector.detect(blank)
+        self.encoder.encode(blank, blank, [(10, 90, 90, 10)], 1.0)
     
     def init_services(self, video_service, drone_service):
         """Initialise les services associés"""
         self.video_service = video_service
         self.drone_service = drone_service
     
+    def reload_known_faces(self):
+        """Lance le chargement des visages connus dans un thread séparé"""
+        if self.loading_lock.locked():
+            return False, "Un chargement des visages est déjà en cours"
+        threading.Thread(target=self.load_known_faces, daemon=True).start()
+        return True, "Chargement des visages lancé"
+    
     def load_known_faces(self):
         """Charge les visages connus depuis le dossier photos"""
+        with self.loading_lock:
+            with self.encodings_lock:
+                self.pending_changes = []
+            try:
+                return self._load_known_faces()
+            finally:
+                with self.encodings_lock:
+                    self.pending_changes = None
+                self.loading_progress["in_progress"] = False
+    
+    def _load_known_faces(self):
         try:
             folder_path = self.settings['photos_folder']
             if not os.path.exists(folder_path):
@@ -72,56 +157,97 @@ class FaceRecognitionService:
                 os.makedirs(folder_path)
                 return False, f"Dossier '{folder_path}' créé. Veuillez y ajouter des photos."
             
-            # Create temporary lists to avoid race conditions
-            new_encodings = []
-            new_names = []
-            
             # Extensions d'image supportées
             extensions = ['.jpg', '.jpeg', '.png']
             
+            # Seules les photos nouvelles ou modifiées depuis le dernier chargement sont encodées
+            # Encodeur et clé du cache fixés pour tout le chargement
+            encoder = self.encoder
+            cache = FaceEncodingCache(folder_path, encoder_key=encoder.cache_key)
+            cache.load()
+            
             logger.info(f"Chargement des photos depuis '{folder_path}'...")
-            loaded_count = 0
+            filenames = [filename for filename in sorted(os.listdir(folder_path))
+                         if any(filename.lower().endswith(ext) for ext in extensions)]
+            encodings = {}
+            to_encode = []
+            for filename in filenames:
+                try:
+                    encoding = cache.lookup(filename)
+                    if encoding is MISSING:
+                        to_encode.append(filename)
+                    else:
+                        encodings[filename] = encoding
+                except Exception as e:
+                    logger.error(f"❌ Erreur lors du chargement de '{filename}': {str(e)}")
             
-            # Parcourir tous les fichiers du dossier
-            for filename in os.listdir(folder_path):
-                # Vérifier si le fichier est une image
-                if any(filename.lower().endswith(ext) for ext in extensions):
-                    # Le nom de la personne est extrait du nom du fichier
-                    # Si le format est nom_timestamp.jpg, on extrait juste le nom
-                    name = os.path.splitext(filename)[0]
-                    # Si le nom contient un underscore, on prend tout avant le premier underscore
-                    if '_' in name:
-                        name = name.split('_')[0]
-                    
-                    image_path = os.path.join(folder_path, filename)
-                    
+            workers = min(self.encoding_workers, len(to_encode))
+            self.loading_progress.update({"in_progress": True, "total": len(filenames),
+                                          "cached": len(encodings), "to_encode": len(to_encode),
+                                          "encoded": 0, "workers": max(workers, 1) if to_encode else 0})
+            if to_encode:
+                logger.info(f"Encodage de {len(to_encode)} photos ({max(workers, 1)} processus)...")
+            
+            for filename, encoding in self._encode_photos(folder_path, to_encode, workers, encoder):
+                self.loading_progress["encoded"] += 1
+                try:
+                    cache.store(filename, encoding)
+                except FileNotFoundError:
+                    continue  # Photo supprimée pendant le chargement
+                encodings[filename] = encoding
+                if encoding is not None:
+                    logger.info(f"✅ Photo de '{self._person_name(filename)}' chargée avec succès.")
+            
+            # Create temporary lists to avoid race conditions
+            new_encodings = []
+            new_names = []
+            new_sources = []
+            for filename in filenames:
+                if filename not in encodings:
+                    continue
+                name = self._person_name(filename)
+                # Si au moins un visage est détecté dans l'image
+                if encodings[filename] is not None:
+                    new_encodings.append(encodings[filename])
+                    new_names.append(name)
+                    new_sources.append(filename)
+                else:
+                    logger.warning(f"⚠️ Aucun visage détecté dans la photo de '{name}'.")
+
+            # Remplacer la galerie en une seule affectation, sous le verrou
+            # (l'index approché de la galerie courante est réutilisé si possible).
+            # Le dossier a été listé avant l'encodage: les photos ajoutées ou supprimées
+            # depuis sont réappliquées avant le remplacement et l'enregistrement du cache
+            gallery = FaceGallery(new_encodings, new_names, new_sources, self.gallery.index)
+            with self.cache_lock:
+                with self.encodings_lock:
+                    changes, self.pending_changes = self.pending_changes or [], None
+                    for change in changes:
+                        if change[0] == 'add':
+                            _, filename, encoding, name = change
+                            gallery = gallery.with_face(encoding, name, filename)
+                        else:
+                            _, filenames, name = change
+                            gallery = gallery.without(name, filenames)
+                    self.gallery = gallery
+                for change in changes:
                     try:
-                        # Charger l'image
-                        image = face_recognition.load_image_file(image_path)
-                        
-                        # Extraire les encodages de visage (caractéristiques faciales)
-                        face_encodings = face_recognition.face_encodings(image)
-                        
-                        # Si au moins un visage est détecté dans l'image
-                        if len(face_encodings) > 0:
-                            # Prendre le premier visage détecté
-                            encoding = face_encodings[0]
-                            new_encodings.append(encoding)
-                            new_names.append(name)
-                            loaded_count += 1
-                            logger.info(f"✅ Photo de '{name}' chargée avec succès.")
+                        if change[0] == 'add':
+                            cache.store(change[1], change[2])
                         else:
-                            logger.warning(f"⚠️ Aucun visage détecté dans la photo de '{name}'.")
-                    except Exception as e:
-                        logger.error(f"❌ Erreur lors du chargement de '{filename}': {str(e)}")
-            
-            # Now update the actual lists using the lock
-            with self.encodings_lock:
-                self.known_face_encodings = new_encodings
-                self.known_face_names = new_names
+                            for filename in change[1]:
+                                cache.remove(filename)
+                    except FileNotFoundError:
+                        pass  # Photo ajoutée puis supprimée pendant le chargement
+                try:
+                    cache.save()
+                except OSError as e:
+                    logger.warning(f"Impossible d'enregistrer le cache d'encodages: {e}")
+            logger.info(f"Encodages: {cache.hits} repris du cache, {cache.misses} calculés")
+            loaded_count = len(gallery)
             
             if loaded_count > 0:
-                logger.info(f"{loaded_count} personnes chargées: {', '.join(new_names)}")
+                logger.info(f"{loaded_count} personnes chargées: {', '.join(gallery.names)}")
                 return True, f"{loaded_count} personnes chargées avec succès"
             else:
                 logger.warning("Aucun visage n'a pu être chargé depuis le dossier de photos.")
@@ -130,6 +256,33 @@ class FaceRecognitionService:
         except Exception as e:
             logger.error(f"Erreur lors du chargement des visages connus: {e}")
             return False, f"Erreur lors du chargement des visages: {str(e)}"
+    
+    def _encode_photos(self, folder_path, filenames, workers, encoder):
+        """
+        Encode des photos, en parallèle sur plusieurs processus si possible
+        
+        Yields:
+            (nom de fichier, encodage ou None), dans l'ordre de fin d'encodage
+        """
+        if workers <= 1:
+            for filename in filenames:
+                try:
+                    yield filename, self._encode_photo(os.path.join(folder_path, filename), encoder)
+                except Exception as e:
+                    logger.error(f"❌ Erreur lors du chargement de '{filename}': {str(e)}")
+            return
+        
+        # Décodage + HOG + ResNet de dlib n'utilisent qu'un cœur: un processus par cœur
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(FaceRecognitionService._encode_photo,
+                                       os.path.join(folder_path, filename), encoder): filename
+                       for filename in filenames}
+            for future in as_completed(futures):
+                filename = futures[future]
+                try:
+                    yield filename, future.result()
+                except Exception as e:
+                    logger.error(f"❌ Erreur lors du chargement de '{filename}': {str(e)}")
 
     
     def start_face_recognition(self):
@@ -137,7 +290,7 @@ class FaceRecognitionService:
         if self.is_recognition_active:
             return True, "La reconnaissance faciale est déjà active"
         
-        if len(self.known_face_encodings) == 0:
+        if len(self.gallery) == 0:
             success, message = self.load_known_faces()
             if not success:
                 return False, f"Impossible de démarrer la reconnaissance: {message}"
@@ -149,6 +302,16 @@ class FaceRecognitionService:
             self.stop_recognition.clear()
             self.is_recognition_active = True
             self.current_detections = []
+            self.identity_tracker.reset()
+            self.scheduler = RecognitionScheduler(self.settings['recognition_scale'],
+                                                  self.settings['detection_interval'])
+            if self.settings['worker_process']:
+                with self.encodings_lock:
+                    gallery = self.gallery
+                # Le processus lit directement l'anneau d'images partagé de VideoService s'il existe
+                ring = getattr(self.video_service, 'shared_ring', None)
+                self.worker = RecognitionWorker(ring.name if ring is not None else None)
+                self.worker.start(self.create_pipeline, self.settings, gallery)
             
             # Démarrer le thread de reconnaissance
             self.recognition_thread = threading.Thread(
@@ -156,11 +319,13 @@ class FaceRecognitionService:
                 daemon=True
             )
             self.recognition_thread.start()
+            self._publish_detections()
             
             logger.info("Reconnaissance faciale démarrée")
             return True, "Reconnaissance faciale démarrée"
         except Exception as e:
             self.is_recognition_active = False
+            self._stop_worker()
             logger.error(f"Erreur lors du démarrage de la reconnaissance faciale: {e}")
             return False, f"Erreur lors du démarrage: {str(e)}"
     
@@ -174,9 +339,12 @@ class FaceRecognitionService:
             
             if self.recognition_thread and self.recognition_thread.is_alive():
                 self.recognition_thread.join(timeout=2.0)
+            self._stop_worker()
+            self.tracking_loop.stop()
             
             self.is_recognition_active = False
             self.current_detections = []
+            self._publish_detections()
             
             logger.info("Reconnaissance faciale arrêtée")
             return True, "Reconnaissance faciale arrêtée"
@@ -184,19 +352,62 @@ class FaceRecognitionService:
             logger.error(f"Erreur lors de l'arrêt de la reconnaissance faciale: {e}")
             return False, f"Erreur lors de l'arrêt: {str(e)}"
     
+    def _stop_worker(self):
+        """Arrête le processus de reconnaissance s'il existe"""
+        worker, self.worker = self.worker, None
+        if worker is not None:
+            worker.stop()
+    
     def get_recognition_status(self):
         """Retourne l'état actuel de la reconnaissance faciale"""
+        worker = self.worker
         return {
             "is_active": self.is_recognition_active,
-            "known_faces_count": len(self.known_face_names),
-            "known_faces": self.known_face_names,
+            "known_faces_count": len(self.gallery),
+            "known_faces": self.gallery.names,
             "current_detections": self.current_detections,
+            "loading": dict(self.loading_progress),
+            "identity_tracking": worker.tracker_stats if worker else self.identity_tracker.get_stats(),
+            "worker": worker.get_status() if worker else None,
+            "scheduler": {"adaptive": self.settings['adaptive_scheduling'], **self.scheduler.get_status()},
+            "tracking": self.tracking_loop.get_status(),
+            "available_detectors": list(available_detectors()),
             "settings": self.settings
         }
     
+    def get_recent_detections(self, window=timedelta(minutes=1)):
+        """Retourne les personnes reconnues pendant la fenêtre de temps donnée"""
+        since = datetime.now() - window
+        return [name for name, detection_time in list(self.last_detection.items())
+                if isinstance(detection_time, datetime) and detection_time > since]
+    
+    def _publish_detections(self):
+        """Publie les détections courantes et récentes sur le flux d'événements"""
+        self.event_hub.publish('detections', {
+            "is_recognition_active": self.is_recognition_active,
+            "current_detections": self.current_detections,
+            "recent_detections": self.get_recent_detections()
+        })
+    
     def update_settings(self, new_settings):
         """Met à jour les paramètres de la reconnaissance faciale"""
         try:
+            # Charger le nouveau détecteur avant de modifier les paramètres
+            detector = None
+            if 'detector' in new_settings and new_settings['detector'] != self.settings['detector']:
+                try:
+                    detector = create_detector(new_settings['detector'])
+                except (ValueError, RuntimeError) as e:
+                    return False, str(e)
+            encoder = None
+            encoder_keys = {'num_jitters', 'landmark_model', 'full_resolution_encoding'}
+            if encoder_keys & set(new_settings):
+                try:
+                    encoder = FaceEncoder.from_settings({**self.settings, **{
+                        key: new_settings[key] for key in encoder_keys & set(new_settings)}})
+                except (ValueError, TypeError) as e:
+                    return False, str(e)
+            
             for key, value in new_settings.items():
                 if key in self.settings:
                     # Convertir au type approprié
@@ -204,9 +415,28 @@ class FaceRecognitionService:
                         value = bool(value)
                     elif isinstance(self.settings[key], float) and not isinstance(value, float):
                         value = float(value)
+                    elif isinstance(self.settings[key], int) and not isinstance(value, int):
+                        value = int(value)
+                    elif isinstance(self.settings[key], dict):
+                        value = {str(name): float(distance) for name, distance in value.items()}
                     
                     self.settings[key] = value
             
+            if detector is not None:
+                self.detector = detector
+            if encoder is not None:
+                reencode = encoder.cache_key != self.encoder.cache_key
+                self.encoder = encoder
+                if reencode:
+                    # Photos de la galerie réencodées avec les mêmes paramètres que les visages du flux
+                    started, message = self.reload_known_faces()
+                    if not started:
+                        logger.warning(f"Galerie non réencodée: {message}")
+            
+            # Les positions des visages suivis dépendent de l'échelle de traitement (et du détecteur)
+            if {'recognition_scale', 'track_identities', 'adaptive_scheduling', 'detector'} & set(new_settings):
+                self.identity_tracker.reset()
+            
             return True, "Paramètres mis à jour avec succès"
         except Exception as e:
             logger.error(f"Erreur lors de la mise à jour des paramètres: {e}")
@@ -217,177 +447,316 @@ class FaceRecognitionService:
         logger.info("Démarrage de la boucle de reconnaissance faciale")
         
         last_recognition_time = 0
+        subscriber = None
         
         while not self.stop_recognition.is_set():
             try:
-                current_time = time.time()
-                
-                # Limiter la fréquence de reconnaissance
-                if current_time - last_recognition_time < self.settings['detection_interval']:
-                    time.sleep(0.1)  # Courte pause pour éviter de surcharger le CPU
+                # Limiter la fréquence de détection; entre deux détections, les
+                # visages suivis sont déplacés sur chaque nouvelle image
+                remaining = self._detection_interval() - (time.time() - last_recognition_time)
+                following = self.settings['track_identities'] and self._tracked_faces()
+                if remaining > 0 and not following:
+                    self.stop_recognition.wait(remaining)
                     continue
                 
-                # Obtenir l'image actuelle
-                if not self.video_service or not hasattr(self.video_service, 'frame'):
-                    time.sleep(0.5)
-                    continue
+                # S'abonner au bus d'images du service vidéo
+                if subscriber is None:
+                    if not self.video_service or not hasattr(self.video_service, 'frame_bus'):
+                        self.stop_recognition.wait(0.5)
+                        continue
+                    subscriber = self.video_service.frame_bus.subscribe('face_recognition')
                 
-                frame = self.video_service.frame
-                if frame is None:
-                    time.sleep(0.5)
+                # Attendre une image qui n'a pas encore été traitée
+                packet = subscriber.next_frame(timeout=0.5)
+                if packet is None:
                     continue
                 
-                # Mettre à jour le timestamp de la dernière reconnaissance
-                last_recognition_time = current_time
-                
-                # Effectuer la reconnaissance
-                detections = self._process_frame(frame)
+                if remaining > 0:
+                    detections = self._analyze_frame(packet.frame, follow=True)
+                else:
+                    # Mettre à jour le timestamp de la dernière reconnaissance
+                    last_recognition_time = time.time()
+                    
+                    # Effectuer la reconnaissance
+                    start = time.perf_counter()
+                    detections = self._analyze_frame(packet.frame)
+                    if self.settings['adaptive_scheduling']:
+                        rescaled = self.scheduler.record(time.perf_counter() - start, bool(detections),
+                                                         self.settings['latency_budget'],
+                                                         self.settings['cpu_budget'])
+                        if rescaled:
+                            # Les positions des visages suivis dépendent de l'échelle de traitement
+                            self.identity_tracker.reset()
                 
                 # Mettre à jour les détections courantes
+                had_detections = bool(self.current_detections)
                 self.current_detections = detections
+                if detections or had_detections:
+                    self._publish_detections()
                 
                 # Effectuer des actions basées sur les détections (si le suivi est activé)
                 if self.settings['enable_tracking'] and self.drone_service and self.drone_service.connected:
-                    self._handle_tracking(detections)
+                    self._handle_tracking(detections, packet.frame.shape, packet.timestamp)
+                elif self.tracking_loop.is_running():
+                    self.tracking_loop.stop()
                 
             except Exception as e:
                 logger.error(f"Erreur dans la boucle de reconnaissance faciale: {e}")
                 time.sleep(1)  # Pause plus longue en cas d'erreur
         
+        if subscriber is not None:
+            subscriber.close()
+        
         logger.info("Boucle de reconnaissance faciale terminée")
     
-    def _process_frame(self, frame):
+    def _detection_interval(self):
+        """Intervalle courant entre deux détections (secondes)"""
+        if self.settings['adaptive_scheduling']:
+            return self.scheduler.interval
+        return self.settings['detection_interval']
+    
+    def _recognition_scale(self):
+        """Facteur de réduction courant des images traitées"""
+        if self.settings['adaptive_scheduling']:
+            return self.scheduler.scale
+        return self.settings['recognition_scale']
+    
+    def _tracked_faces(self):
+        """Nombre de visages suivis, dans le processus de reconnaissance s'il est actif"""
+        worker = self.worker
+        if worker is not None:
+            return worker.tracker_stats["tracks"]
+        return len(self.identity_tracker.tracks)
+    
+    def _analyze_frame(self, frame, follow=False):
+        """
+        Détecte et identifie les visages d'une image (ou déplace les visages suivis),
+        dans le processus de reconnaissance s'il est actif
+        """
+        worker = self.worker
+        if worker is not None:
+            try:
+                with self.encodings_lock:
+                    gallery = self.gallery
+                worker.sync(self.settings, gallery)
+                detections = worker.process(frame, self._recognition_scale(), follow)
+            except RuntimeError as e:
+                # Une erreur de traitement est gérée comme dans le thread;
+                # un processus arrêté ou bloqué est abandonné au profit du thread
+                if worker.is_alive():
+                    raise
+                if self.stop_recognition.is_set():
+                    return []
+                logger.error(f"{e}: reconnaissance poursuivie dans le thread")
+                self._stop_worker()
+            else:
+                now = datetime.now()
+                for detection in detections:
+                    if detection["name"] != "Inconnu":
+                        self.last_detection[detection["name"]] = now
+                return detections
+        
+        if follow:
+            return self._follow_frame(frame)
+        if self.encoder.full_resolution and frame is not None:
+            # Les visages sont recadrés dans l'image d'origine après la détection:
+            # le tampon du bus d'images aurait été réutilisé entre-temps
+            frame = frame.copy()
+        return self._process_frame(frame)
+    
+    def _process_frame(self, frame, scale=None):
         """Traite une image pour la reconnaissance faciale"""
         if frame is None:
             return []
         
         # Redimensionner pour accélérer le traitement
-        scale = self.settings['recognition_scale']
+        scale = scale or self._recognition_scale()
         small_frame = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
         
-        # Convertir de BGR (OpenCV) à RGB (face_recognition)
-        rgb_small_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB)
-        
         # Trouver tous les visages dans l'image
-        face_locations = face_recognition.face_locations(rgb_small_frame)
-        face_encodings = face_recognition.face_encodings(rgb_small_frame, face_locations)
+        face_locations = self.detector.detect(small_frame)
+        
+        if not self.settings['track_identities']:
+            face_encodings = self.encoder.encode(frame, small_frame, face_locations, scale)
+            return self._build_detections(
+                [(location, name, confidence, None)
+                 for location, (name, confidence) in zip(face_locations, self._match_faces(face_encodings))],
+                scale)
+        
+        # Reprendre l'identité des visages déjà suivis: seuls les nouveaux visages,
+        # ou ceux dont la confiance a trop diminué, sont encodés
+        now = time.time()
+        gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
+        tracker = self.identity_tracker
+        tracks = tracker.update(face_locations, gray, now)
+        to_recognize = [track for track in tracks
+                        if tracker.needs_recognition(track, now, self.settings['confidence_threshold'])]
+        face_encodings = self.encoder.encode(frame, small_frame, [track.box for track in to_recognize], scale)
+        for track, (name, confidence) in zip(to_recognize, self._match_faces(face_encodings)):
+            track.identify(name, confidence, now)
+        tracker.recognitions += len(to_recognize)
+        tracker.reused += len(tracks) - len(to_recognize)
+        
+        return self._build_detections(
+            [(track.box, track.name, track.confidence, track.track_id) for track in tracks], scale)
+    
+    def _follow_frame(self, frame, scale=None):
+        """Déplace les visages suivis entre deux détections, sans détection ni encodage"""
+        if frame is None:
+            return []
+        
+        scale = scale or self._recognition_scale()
+        small_frame = cv2.resize(frame, (0, 0), fx=scale, fy=scale)
+        gray = cv2.cvtColor(small_frame, cv2.COLOR_BGR2GRAY)
+        tracks = self.identity_tracker.follow(gray)
+        self.identity_tracker.reused += len(tracks)
+        
+        return self._build_detections(
+            [(track.box, track.name, track.confidence, track.track_id) for track in tracks], scale)
+    
+    def _match_faces(self, face_encodings):
+        """
+        Identifie des visages encodés
+        
+        Returns:
+            list: (nom ou None, confiance) pour chaque visage
+        """
+        with self.encodings_lock:
+            gallery = self.gallery
+        
+        # Une correspondance doit respecter la tolérance de compare_faces et le seuil de confiance
+        max_distance = min(FACE_MATCH_TOLERANCE, 1 - self.settings['confidence_threshold'])
         
+        # Comparer les visages détectés aux centroïdes, puis aux photos des personnes les plus proches
+        matches = gallery.match(face_encodings, max_distance, self.settings['person_thresholds'])
+        return [(name, 1 - distance if name is not None else 0.0) for name, distance in matches]
+    
+    def _build_detections(self, faces, scale):
+        """
+        Construit les détections publiées
+        
+        Args:
+            faces: (position réduite, nom ou None, confiance, identifiant de piste ou None)
+            scale: Facteur de réduction de l'image traitée
+        """
         detections = []
         now = datetime.now()
         
-        # Use the lock to protect access to known_face_encodings and known_face_names
-        with self.encodings_lock:
-            # Vérifier chaque visage détecté
-            for encoding, location in zip(face_encodings, face_locations):
-                # Comparer avec les visages connus
-                if len(self.known_face_encodings) > 0:  # Check if there are any encodings
-                    matches = face_recognition.compare_faces(self.known_face_encodings, encoding)
-                    face_distances = face_recognition.face_distance(self.known_face_encodings, encoding)
-                    
-                    name = "Inconnu"
-                    confidence = 0
-                    
-                    # Si des correspondances sont trouvées
-                    if len(matches) > 0 and len(face_distances) > 0:
-                        best_match_index = np.argmin(face_distances)
-                        if matches[best_match_index]:
-                            name = self.known_face_names[best_match_index]
-                            confidence = 1 - face_distances[best_match_index]
-                            
-                            # Log pour déboguer
-                            logger.info(f"Détection: {name} avec confiance {confidence:.3f}, seuil: {self.settings['confidence_threshold']}")
-                            
-                            # Ignorer si la confiance est trop faible
-                            if confidence < self.settings['confidence_threshold']:
-                                logger.info(f"Détection ignorée: confiance trop faible ({confidence:.3f} < {self.settings['confidence_threshold']})")
-                                name = "Inconnu"
-                            else:
-                                # Enregistrer le moment de la détection
-                                self.last_detection[name] = now
-                else:
-                    name = "Inconnu"
-                    confidence = 0
-                
-                # Convertir la position pour correspondre à l'échelle originale
-                top, right, bottom, left = [int(coord / scale) for coord in location]
-                
-                # MODIFICATION: Inclure toutes les détections, même "Inconnu" pour le débogage
-                detections.append({
-                    "name": name,
-                    "confidence": float(confidence),
-                    "position": {
-                        "top": top,
-                        "right": right,
-                        "bottom": bottom,
-                        "left": left
-                    },
-                    "timestamp": now.isoformat()
-                })
+        for location, name, confidence, track_id in faces:
+            if name is not None:
+                # Enregistrer le moment de la détection
+                self.last_detection[name] = now
+                logger.debug(f"Détection: {name} avec confiance {confidence:.3f}")
+            else:
+                name = "Inconnu"
+                confidence = 0
+            
+            # Convertir la position pour correspondre à l'échelle originale
+            top, right, bottom, left = [int(coord / scale) for coord in location]
+            
+            # MODIFICATION: Inclure toutes les détections, même "Inconnu" pour le débogage
+            detection = {
+                "name": name,
+                "confidence": float(confidence),
+                "position": {
+                    "top": top,
+                    "right": right,
+                    "bottom": bottom,
+                    "left": left
+                },
+                "timestamp": now.isoformat()
+            }
+            if track_id is not None:
+                detection["track_id"] = track_id
+            detections.append(detection)
         
         return detections
     
-    def _handle_tracking(self, detections):
+    def _handle_tracking(self, detections, frame_shape, timestamp):
         """Gère le suivi automatique basé sur les détections"""
         if not detections or not self.drone_service or not self.drone_service.connected:
+            self.tracking_loop.lose()
             return
         
         # Pour l'instant, on suit simplement la première personne détectée
         # Dans une implémentation plus avancée, on pourrait ajouter des priorités
         target = detections[0]
+        position = target['position']
+        if target['name'] != self.tracking_target:
+            # Nouvelle cible: la position et l'intégrale de l'ancienne ne s'appliquent plus
+            self.tracking_loop.lose()
+            self.tracking_target = target['name']
+        
+        # Écarts normalisés du visage au centre, transmis à la boucle de commande
+        # qui envoie au drone les commandes du PID sur la position prédite
+        errors = self.tracking_controller.measure(
+            (position['top'], position['right'], position['bottom'], position['left']), frame_shape)
+        self.tracking_loop.start(self.drone_service)
+        self.tracking_loop.observe(errors, timestamp)
+        logger.debug(f"Tracking: écarts x={errors[0]:.2f}, y={errors[1]:.2f} pour {target['name']}")
+    
+    @staticmethod
+    def _person_name(filename):
+        """Extrait le nom de la personne d'un nom de fichier (format nom_timestamp.jpg)"""
+        name = os.path.splitext(filename)[0]
+        # Si le nom contient un underscore, on prend tout avant le premier underscore
+        if '_' in name:
+            name = name.split('_')[0]
+        return name
+    
+    @staticmethod
+    def _encode_photo(image_path, encoder):
+        """Retourne l'encodage du premier visage d'une photo, ou None si aucun visage n'est détecté"""
+        return encoder.encode_image(face_recognition.load_image_file(image_path))
+    
+    def _add_photo(self, image_path):
+        """
+        Encode une seule photo et l'ajoute à la galerie et au cache d'encodages
+        
+        Returns:
+            bool: False si aucun visage n'a été détecté dans la photo
+        """
+        # L'encodage, seule étape coûteuse, se fait hors du verrou
+        encoder = self.encoder
+        encoding = self._encode_photo(image_path, encoder)
+        if encoding is None:
+            return False
+        
+        filename = os.path.basename(image_path)
+        # Même nom qu'au prochain chargement complet du dossier
+        name = self._person_name(filename)
+        with self.encodings_lock:
+            self.gallery = self.gallery.with_face(encoding, name, filename)
+            if self.pending_changes is not None:
+                self.pending_changes.append(('add', filename, encoding, name))
         
-        # Obtenir les dimensions du frame
-        if not self.video_service or not hasattr(self.video_service, 'frame'):
-            return
-            
-        frame = self.video_service.frame
-        if frame is None:
-            return
-            
-        frame_height, frame_width = frame.shape[:2]
-        frame_center_x = frame_width // 2
-        frame_center_y = frame_height // 2
-        
-        # Calculer le centre du visage
-        face_left = target['position']['left']
-        face_top = target['position']['top']
-        face_right = target['position']['right']
-        face_bottom = target['position']['bottom']
-        
-        face_center_x = (face_left + face_right) // 2
-        face_center_y = (face_top + face_bottom) // 2
-        
-        # Calculer l'écart entre le visage et le centre
-        delta_x = face_center_x - frame_center_x
-        delta_y = face_center_y - frame_center_y
-        
-        # Zones mortes (deadzone) pour éviter des corrections constantes
-        deadzone_x = frame_width * 0.1  # 10% de la largeur
-        deadzone_y = frame_height * 0.1  # 10% de la hauteur
-        
-        # Initialiser les commandes
-        yaw_speed = 0    # Rotation horizontale
-        up_down_speed = 0  # Mouvement vertical
-        
-        # Ajuster la rotation horizontale (yaw)
-        if abs(delta_x) > deadzone_x:
-            yaw_direction = 1 if delta_x > 0 else -1
-            yaw_magnitude = min(abs(delta_x) / (frame_width * 0.3), 1.0)  # Normalisation
-            yaw_speed = int(20 * yaw_direction * yaw_magnitude)  # Vitesse maximale de 20
-        
-        # Ajuster le mouvement vertical
-        if abs(delta_y) > deadzone_y:
-            vertical_direction = -1 if delta_y > 0 else 1  # Inversé car y augmente vers le bas
-            vertical_magnitude = min(abs(delta_y) / (frame_height * 0.3), 1.0)  # Normalisation
-            up_down_speed = int(20 * vertical_direction * vertical_magnitude)  # Vitesse maximale de 20
-        
-        # Envoyer les commandes au drone si nécessaire
-        if yaw_speed != 0 or up_down_speed != 0:
-            try:
-                self.drone_service.drone.send_rc_control(0, 0, up_down_speed, yaw_speed)
-                logger.debug(f"Tracking: yaw={yaw_speed}, vertical={up_down_speed} pour {target['name']}")
-            except Exception as e:
-                logger.error(f"Erreur lors de l'envoi des commandes de suivi: {e}")
-        
+        self._update_encoding_cache(stored={filename: encoding}, encoder_key=encoder.cache_key)
+        logger.info(f"✅ Photo de '{name}' ajoutée à la galerie ({len(self.gallery)} visages)")
+        return True
+    
+    def _remove_photos(self, filenames, name=None):
+        """Retire de la galerie et du cache les visages d'une personne et/ou de photos supprimées"""
+        with self.encodings_lock:
+            self.gallery = self.gallery.without(name, filenames)
+            if self.pending_changes is not None:
+                self.pending_changes.append(('remove', filenames, name))
+        self._update_encoding_cache(removed=filenames)
+    
+    def _update_encoding_cache(self, stored=None, removed=(), encoder_key=None):
+        """Met à jour le cache d'encodages pour quelques photos, sans parcourir le dossier"""
+        try:
+            with self.cache_lock:
+                cache = FaceEncodingCache(self.settings['photos_folder'],
+                                          encoder_key=encoder_key or self.encoder.cache_key)
+                cache.load()
+                for filename, encoding in (stored or {}).items():
+                    cache.store(filename, encoding)
+                for filename in removed:
+                    cache.remove(filename)
+                cache.save(prune=False)
+        except OSError as e:
+            logger.warning(f"Impossible de mettre à jour le cache d'encodages: {e}")
+    
     def capture_face_photo(self, name):
         """Capture une photo d'un visage détecté et l'enregistre"""
         if not self.video_service or not hasattr(self.video_service, 'frame'):
@@ -396,6 +765,8 @@ class FaceRecognitionService:
         frame = self.video_service.frame
         if frame is None:
             return False, "Aucune image disponible"
+        # Le tampon du bus d'images est réutilisé par les images suivantes pendant l'encodage JPEG
+        frame = frame.copy()
         
         try:
             # Créer le dossier photos s'il n'existe pas
@@ -408,8 +779,10 @@ class FaceRecognitionService:
             # Sauvegarder l'image
             cv2.imwrite(filename, frame)
             
-            # Recharger les visages connus
-            self.load_known_faces()
+            # Ajouter le visage à la galerie (seule cette photo est encodée)
+            if not self._add_photo(filename):
+                os.remove(filename)
+                return False, "Aucun visage détecté dans l'image"
             
             return True, f"Photo de {name} sauvegardée sous {filename}"
         except Exception as e:
@@ -428,17 +801,20 @@ class FaceRecognitionService:
             # Extensions d'image supportées
             extensions = ['.jpg', '.jpeg', '.png']
             
+            deleted_files = []
+            
             # Parcourir tous les fichiers du dossier
             for filename in os.listdir(folder_path):
                 # Vérifier si le fichier correspond à la personne
                 if any(filename.lower().endswith(ext) for ext in extensions) and filename.startswith(name + "_"):
                     file_path = os.path.join(folder_path, filename)
                     os.remove(file_path)
+                    deleted_files.append(filename)
                     deleted_count += 1
                     logger.info(f"Photo supprimée: {filename}")
             
-            # Recharger les visages connus
-            self.load_known_faces()
+            # Retirer les visages de la galerie, sans réencoder les autres photos
+            self._remove_photos(deleted_files, name)
             
             if deleted_count > 0:
                 return True, f"{deleted_count} photos de {name} supprimées"
@@ -464,18 +840,12 @@ class FaceRecognitionService:
             # Sauvegarder le fichier
             file_object.save(filename)
             
-            # Vérifier si un visage est détecté dans l'image
-            image = face_recognition.load_image_file(filename)
-            face_locations = face_recognition.face_locations(image)
-            
-            if not face_locations:
+            # Encoder le visage et l'ajouter à la galerie
+            if not self._add_photo(filename):
                 # Supprimer le fichier si aucun visage n'est détecté
                 os.remove(filename)
                 return False, "Aucun visage détecté dans l'image"
             
-            # Recharger les visages connus
-            self.load_known_faces()
-            
             return True, f"Photo de {person_name} ajoutée avec succès"
         except Exception as e:
             logger.error(f"Erreur lors de l'ajout de la personne: {e}")
@@ -0,0 +1,76 @@
+import cv2
+
+ROI_FACE_SIZE = 48  # Taille du visage dans la fenêtre réduite (pixels): deux fois la fenêtre de Haar
+ROI_PADDING = 0.75  # Marge de la fenêtre autour du dernier visage, en fraction de sa taille
+
+
+class FaceRoiSearch:
+    """
+    Recherche d'un visage autour de sa dernière position
+
+    Entre deux itérations du suivi, le visage ne se déplace que de quelques
+    pixels: au lieu de parcourir toute l'image, la détection porte sur une
+    fenêtre entourant le dernier visage trouvé, réduite pour que ce visage y
+    mesure environ ROI_FACE_SIZE pixels (un niveau plus grossier de la
+    pyramide du détecteur). L'image entière n'est parcourue que si le visage
+    n'est pas retrouvé dans la fenêtre, ou qu'aucun visage n'est encore suivi.
+    """
+
+    def __init__(self, padding=ROI_PADDING, face_size=ROI_FACE_SIZE):
+        self.padding = padding
+        self.face_size = face_size
+        self.last_box = None
+        self.mode = None  # 'roi' ou 'full': recherche ayant produit le dernier résultat
+        self.roi_scans = 0
+        self.full_scans = 0
+
+    def reset(self):
+        """Oublie le dernier visage: la prochaine recherche parcourt toute l'image"""
+        self.last_box = None
+
+    def detect(self, detector, frame, min_size=None, max_size=None):
+        """
+        Détecte les visages, autour du dernier visage trouvé si possible
+
+        Args:
+            detector: FaceDetector utilisé
+            frame: Image BGR
+            min_size: Côté minimal d'un visage en pixels dans l'image
+            max_size: Côté maximal d'un visage en pixels dans l'image
+
+        Returns:
+            list: Boîtes (top, right, bottom, left) dans l'image; le plus grand
+                visage devient celui autour duquel chercher ensuite
+        """
+        boxes = []
+        if self.last_box is not None:
+            boxes = self._detect_window(detector, frame, min_size, max_size)
+            self.roi_scans += 1
+            self.mode = 'roi'
+        if not boxes:
+            boxes = detector.detect(frame, min_size=min_size, max_size=max_size)
+            self.full_scans += 1
+            self.mode = 'full'
+        self.last_box = max(boxes, key=lambda box: (box[2] - box[0]) * (box[1] - box[3])) if boxes else None
+        return boxes
+
+    def _detect_window(self, detector, frame, min_size, max_size):
+        top, right, bottom, left = self.last_box
+        size = max(bottom - top, right - left)
+        margin = int(self.padding * size)
+        height, width = frame.shape[:2]
+        window_top, window_left = max(0, top - margin), max(0, left - margin)
+        window = frame[window_top:min(height, bottom + margin), window_left:min(width, right + margin)]
+
+        factor = min(1.0, self.face_size / size)
+        if factor < 1.0:
+            window = cv2.resize(window, (0, 0), fx=factor, fy=factor, interpolation=cv2.INTER_AREA)
+        boxes = detector.detect(window, min_size=min_size * factor if min_size else None,
+                                max_size=max_size * factor if max_size else None)
+        return [(int(box_top / factor) + window_top, int(box_right / factor) + window_left,
+                 int(box_bottom / factor) + window_top, int(box_left / factor) + window_left)
+                for box_top, box_right, box_bottom, box_left in boxes]
+
+    def get_stats(self):
+        """Retourne la dernière recherche effectuée et le nombre de recherches de chaque type"""
+        return {"mode": self.mode, "roi_scans": self.roi_scans, "full_scans": self.full_scans}
@@ -0,0 +1,86 @@
+from collections import deque
+import statistics
+
+SIZE_HISTORY = 10           # Largeurs de visage retenues
+MIN_SAMPLES = 3             # Largeurs nécessaires avant de restreindre les tailles cherchées
+SIZE_MARGIN = 1.25          # Marge de la bande autour des largeurs observées (facteur)
+FULL_SCAN_INTERVAL = 10     # Une détection sur N parcourt toute l'image et toutes les tailles
+STABLE_SPREAD = 0.15        # Écart relatif des largeurs sous lequel la cible est stable
+STABLE_SCALE_FACTOR = 1.2   # Pas de la pyramide de la cascade de Haar pour une cible stable
+
+
+class FaceScaleBand:
+    """
+    Tailles de visage à chercher d'après les dernières largeurs observées
+
+    detectMultiScale parcourt tous les niveaux de sa pyramide entre minSize et
+    la taille de l'image; les niveaux des petits visages, sur les images les
+    plus grandes, sont les plus coûteux. Tant qu'un visage est suivi, sa
+    largeur varie peu d'une détection à l'autre: band() limite la recherche
+    aux largeurs récentes, avec une marge, et scale_factor() espace les
+    niveaux quand ces largeurs sont stables. Une détection sur
+    full_scan_interval parcourt toute l'image et toutes les tailles pour
+    trouver un nouveau visage (plus proche) hors de la bande.
+    """
+
+    def __init__(self, history=SIZE_HISTORY, margin=SIZE_MARGIN, full_scan_interval=FULL_SCAN_INTERVAL):
+        self.widths = deque(maxlen=history)
+        self.margin = margin
+        self.full_scan_interval = full_scan_interval
+        self.since_full_scan = 0
+        self.periodic_scans = 0
+
+    def reset(self):
+        """Oublie les largeurs observées"""
+        self.widths.clear()
+        self.since_full_scan = 0
+
+    def record(self, width):
+        """Enregistre la largeur (pixels) du visage suivi, None s'il est perdu"""
+        if width is None:
+            self.widths.clear()
+        else:
+            self.widths.append(width)
+
+    def full_scan_due(self):
+        """Indique si la prochaine détection doit parcourir toute l'image et toutes les tailles"""
+        if not self.widths:
+            self.since_full_scan = 0
+            return False
+        self.since_full_scan += 1
+        if self.since_full_scan < self.full_scan_interval:
+            return False
+        self.since_full_scan = 0
+        self.periodic_scans += 1
+        return True
+
+    def band(self, min_size=None):
+        """
+        Tailles de visage à chercher
+
+        Args:
+            min_size: Taille minimale imposée par les paramètres (pixels)
+
+        Returns:
+            tuple: (min, max) en pixels, ou None pour toutes les tailles
+                (pas assez de largeurs observées)
+        """
+        if len(self.widths) < MIN_SAMPLES:
+            return None
+        low = max(min(self.widths) / self.margin, min_size or 0)
+        high = max(self.widths) * self.margin
+        return (low, high) if low < high else None
+
+    def is_stable(self):
+        """Indique si les dernières largeurs sont assez proches pour espacer les niveaux de la pyramide"""
+        if len(self.widths) < MIN_SAMPLES:
+            return False
+        return (max(self.widths) - min(self.widths)) / statistics.median(self.widths) <= STABLE_SPREAD
+
+    def scale_factor(self, default):
+        """Pas de la pyramide à utiliser dans la bande (default si la cible n'est pas stable)"""
+        return max(default, STABLE_SCALE_FACTOR) if self.is_stable() else default
+
+    def get_status(self):
+        """Retourne les largeurs observées, la stabilité et le nombre de parcours complets périodiques"""
+        return {"widths": list(self.widths), "stable": self.is_stable(), "periodic_scans": self.periodic_scans}
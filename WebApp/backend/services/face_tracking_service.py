@@ -3,6 +3,11 @@ import numpy as np
 import threading
 import time
 import logging
+from services.face_detectors import HAAR_SCALE_FACTOR, HaarDetector, create_detector
+from services.face_roi_search import FaceRoiSearch
+from services.face_scale_band import FaceScaleBand
+from services.tracking_controller import TrackingController, face_width_for_distance, merge_gains
+from services.tracking_loop import CONTROL_RATE, TrackingLoop
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
@@ -30,7 +35,12 @@ class FaceTrackingService:
         self.tracking_thread = None
         self.face_cascade = None
         self.drone_service = None
+        self.video_service = None
         self.stop_event = threading.Event()
+        self.face_detected = False
+        self.face_width = None  # Largeur du dernier visage suivi (pixels)
+        self.size_band = None   # Tailles (min, max) cherchées par la dernière détection, None: toutes
+        self.scale_factor = HAAR_SCALE_FACTOR  # Pas de la pyramide de Haar de la dernière détection
         
         # Configuration du suivi
         self.tracking_settings = {
@@ -40,7 +50,24 @@ class FaceTrackingService:
             'deadzone_x': 50,            # Zone morte de détection horizontale en pixels
             'deadzone_y': 40,            # Zone morte de détection verticale en pixels
             'face_size_min': 50,         # Taille minimale du visage à détecter
+            'detector': 'haar',          # Détecteur de visages: 'haar', 'hog', 'cnn' ou 'yunet'
+            'roi_search': True,          # Chercher le visage autour de sa dernière position avant toute l'image
+            'adaptive_scale': True,      # Chercher le visage aux tailles récemment observées avant toutes les tailles
+            'pid_gains': merge_gains(),  # Gains kp, ki, kd, kf des axes 'yaw', 'vertical' et 'distance'
+            'control_rate': CONTROL_RATE,  # Commandes RC par seconde, entre deux détections
+            'follow_distance': False,    # Avancer ou reculer pour garder le visage à target_distance
+            'target_distance': 150,      # Distance souhaitée du visage (cm), estimée d'après sa largeur
+            'distance_hysteresis': 0.15, # Écart relatif de largeur du visage toléré avant de corriger
+            'forward_speed': 20,         # Vitesse avant/arrière maximale (0-100)
         }
+        self.detector = None  # Détecteur autre que la cascade de Haar chargée ci-dessous
+        self.roi_search = FaceRoiSearch()
+        self.scale_band = FaceScaleBand()
+        self.controller = TrackingController(self.tracking_settings['pid_gains'])
+        # Commandes envoyées à cadence fixe sur la position du visage prédite entre deux détections
+        self.control_loop = TrackingLoop(self.controller, self.tracking_settings['control_rate'])
+        # Durées de la dernière itération du suivi et moyenne glissante de la détection
+        self.timings = {"detection_ms": 0.0, "mean_detection_ms": 0.0, "iteration_ms": 0.0}
         
         # Chargement du classificateur de visages
         try:
@@ -54,31 +81,43 @@ class FaceTrackingService:
     def init_drone_service(self, drone_service):
         """Initialise le service avec une référence au service drone"""
         self.drone_service = drone_service
+    
+    def init_video_service(self, video_service):
+        """Initialise le service avec une référence au service vidéo"""
+        self.video_service = video_service
         
     def start_face_tracking(self):
         """Démarre le suivi de visage"""
         if self.is_tracking:
             return True, "Le suivi de visage est déjà actif"
         
-        if not self.face_cascade:
+        if self.tracking_settings['detector'] == 'haar' and not self.face_cascade:
             return False, "Impossible de démarrer le suivi: classificateur de visages non chargé"
         
         if not self.drone_service or not self.drone_service.connected or not self.drone_service.drone:
             return False, "Impossible de démarrer le suivi: drone non connecté"
         
+        if not self.video_service:
+            return False, "Impossible de démarrer le suivi: service vidéo non initialisé"
+        
         try:
             # Réinitialiser l'événement d'arrêt
             self.stop_event.clear()
+            self.roi_search.reset()
+            self.scale_band.reset()
+            self.face_width = None
             
-            # Démarrer le thread de suivi
+            # Démarrer le thread de suivi (détections) et la boucle de commande
             self.is_tracking = True
             self.tracking_thread = threading.Thread(target=self._tracking_loop, daemon=True)
             self.tracking_thread.start()
+            self.control_loop.start(self.drone_service)
             
             logger.info("Suivi de visage démarré")
             return True, "Suivi de visage démarré"
         except Exception as e:
             self.is_tracking = False
+            self.control_loop.stop()
             logger.error(f"Erreur lors du démarrage du suivi de visage: {e}")
             return False, f"Erreur lors du démarrage du suivi: {str(e)}"
     
@@ -94,6 +133,7 @@ class FaceTrackingService:
             # Attendre que le thread se termine (avec timeout)
             if self.tracking_thread and self.tracking_thread.is_alive():
                 self.tracking_thread.join(timeout=1.0)
+            self.control_loop.stop()
             
             self.is_tracking = False
             
@@ -109,13 +149,44 @@ class FaceTrackingService:
     
     def update_settings(self, settings):
         """Met à jour les paramètres de suivi"""
+        for key in ('control_rate', 'target_distance'):
+            try:
+                if key in settings and float(settings[key]) <= 0:
+                    return False, f"Le paramètre {key} doit être positif"
+            except (ValueError, TypeError):
+                return False, f"Valeur invalide pour {key}"
+        
+        # Charger le nouveau détecteur avant de modifier les paramètres
+        name = settings.get('detector')
+        if name is not None and name != self.tracking_settings['detector']:
+            try:
+                self.detector = None if name == 'haar' else create_detector(name)
+            except (ValueError, RuntimeError) as e:
+                return False, str(e)
+            self.roi_search.reset()
+            self.scale_band.reset()
+        
+        # Gains partiels (un axe, un gain) complétés par les gains actuels
+        if 'pid_gains' in settings:
+            try:
+                gains = merge_gains({**self.tracking_settings['pid_gains'],
+                                     **{axis: {**self.tracking_settings['pid_gains'].get(axis, {}), **values}
+                                        for axis, values in settings['pid_gains'].items()}})
+            except (ValueError, TypeError, AttributeError) as e:
+                return False, f"Gains invalides: {e}"
+            self.tracking_settings['pid_gains'] = gains
+            self.controller.configure(gains=gains)
+        
         for key, value in settings.items():
+            if key == 'pid_gains':
+                continue
             if key in self.tracking_settings:
                 try:
                     # Convertir la valeur au même type que la valeur existante
                     self.tracking_settings[key] = type(self.tracking_settings[key])(value)
                 except (ValueError, TypeError):
                     logger.warning(f"Impossible de convertir la valeur de {key}")
+        self.control_loop.rate = self.tracking_settings['control_rate']
         
         return True, "Paramètres mis à jour"
     
@@ -124,53 +195,103 @@ class FaceTrackingService:
         return {
             "is_tracking": self.is_tracking,
             "settings": self.tracking_settings,
-            "face_detected": False  # Pourrait être mis à jour dans la boucle de suivi
+            "face_detected": self.face_detected,
+            "face_width": self.face_width,
+            "detection": {**self.roi_search.get_stats(), **self.timings,
+                          "size_band": [round(size) for size in self.size_band] if self.size_band else None,
+                          "scale_factor": self.scale_factor,
+                          "size_history": self.scale_band.get_status()},
+            "controller": self.controller.get_status(),
+            "control_loop": self.control_loop.get_status()
         }
     
+    def _detect_faces(self, frame):
+        """Détecte les visages avec le détecteur choisi (boîtes top, right, bottom, left)"""
+        min_size = self.tracking_settings['face_size_min']
+        
+        # Visage suivi: seules les tailles récemment observées sont cherchées, sauf lors
+        # du parcours périodique de toute l'image qui permet de trouver un nouveau visage
+        band = None
+        if self.tracking_settings['adaptive_scale']:
+            if self.scale_band.full_scan_due():
+                self.roi_search.reset()
+            else:
+                band = self.scale_band.band(min_size)
+        self.size_band = band
+        
+        boxes = []
+        if band is not None:
+            self.scale_factor = self.scale_band.scale_factor(HAAR_SCALE_FACTOR)
+            boxes = self._search_faces(self._detector(self.scale_factor), frame, *band)
+        if not boxes:
+            self.scale_factor = HAAR_SCALE_FACTOR
+            boxes = self._search_faces(self._detector(), frame, min_size)
+        
+        largest = max(boxes, key=lambda box: (box[2] - box[0]) * (box[1] - box[3])) if boxes else None
+        self.scale_band.record(largest[1] - largest[3] if largest else None)
+        return boxes
+    
+    def _detector(self, scale_factor=HAAR_SCALE_FACTOR):
+        """Détecteur choisi; la cascade de Haar utilise le pas de pyramide donné"""
+        if self.tracking_settings['detector'] == 'haar' or self.detector is None:
+            return HaarDetector(self.face_cascade, scale_factor=scale_factor)
+        return self.detector
+    
+    def _search_faces(self, detector, frame, min_size, max_size=None):
+        if self.tracking_settings['roi_search']:
+            return self.roi_search.detect(detector, frame, min_size, max_size)
+        return detector.detect(frame, min_size=min_size, max_size=max_size)
+    
+    def _target_face_width(self):
+        """Largeur cible du visage en fraction de l'image, None sans maintien de la distance"""
+        if not self.tracking_settings['follow_distance']:
+            return None
+        return face_width_for_distance(self.tracking_settings['target_distance'])
+    
     def _tracking_loop(self):
         """Boucle principale de suivi de visage"""
         logger.info("Démarrage de la boucle de suivi de visage")
         
         last_detection_time = 0
-        is_first_detection = True
         face_detected = False
+        subscriber = None
         
         try:
+            subscriber = self.video_service.frame_bus.subscribe('face_tracking')
+            
             while not self.stop_event.is_set() and self.drone_service.connected:
                 current_time = time.time()
                 
                 # Limiter la fréquence de détection
-                if current_time - last_detection_time < self.tracking_settings['detection_frequency']:
-                    time.sleep(0.01)  # Pause courte pour ne pas surcharger le CPU
+                remaining = self.tracking_settings['detection_frequency'] - (current_time - last_detection_time)
+                if remaining > 0:
+                    self.stop_event.wait(remaining)
                     continue
                 
-                # Récupérer l'image actuelle
-                frame = self.drone_service.drone.get_frame_read().frame
+                # Attendre une image qui n'a pas encore été analysée
+                packet = subscriber.next_frame(timeout=0.5)
                 
-                if frame is None:
+                if packet is None:
                     logger.warning("Aucune image reçue du drone")
-                    time.sleep(0.1)
                     continue
+                iteration_start = time.perf_counter()
+                # La détection (fenêtre, puis bande de tailles, puis toute l'image) peut durer
+                # plus que quelques images: le tampon du bus serait réutilisé entre-temps
+                frame = packet.frame.copy()
                 
-                # Convertir en niveaux de gris pour la détection
-                gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                
-                # Détecter les visages
-                faces = self.face_cascade.detectMultiScale(
-                    gray_frame,
-                    scaleFactor=1.1,
-                    minNeighbors=5,
-                    minSize=(self.tracking_settings['face_size_min'], self.tracking_settings['face_size_min'])
-                )
+                # Détecter les visages (x, y, w, h)
+                faces = [(left, top, right - left, bottom - top)
+                         for top, right, bottom, left in self._detect_faces(frame)]
+                self._record_detection_time(time.perf_counter() - iteration_start)
                 
                 # Si aucun visage n'est détecté
                 if len(faces) == 0:
                     logger.debug("Aucun visage détecté")
                     face_detected = False
                     
-                    # Si c'est la première itération, ne rien faire
-                    if not is_first_detection:
-                        self.drone_service.drone.send_rc_control(0, 0, 0, 0)  # Arrêter tout mouvement
+                    # La boucle de commande arrête le drone
+                    self.control_loop.lose()
+                    self.face_width = None
                     
                 else:
                     # Prendre le plus grand visage détecté (supposé être le plus proche)
@@ -178,63 +299,50 @@ class FaceTrackingService:
                     x, y, w, h = largest_face
                     
                     face_detected = True
-                    is_first_detection = False
-                    
-                    # Calculer la position centrale du visage
-                    face_center_x = x + w // 2
-                    face_center_y = y + h // 2
-                    
-                    # Calculer le centre de l'image
-                    frame_center_x = frame.shape[1] // 2
-                    frame_center_y = frame.shape[0] // 2
-                    
-                    # Calculer l'écart entre le visage et le centre
-                    delta_x = face_center_x - frame_center_x
-                    delta_y = face_center_y - frame_center_y
-                    
-                    # Initialiser les vitesses
-                    yaw_speed = 0    # Rotation horizontale
-                    up_down_speed = 0  # Mouvement vertical
+                    self.face_width = w
                     
-                    # Ajuster la rotation horizontale (yaw)
-                    if abs(delta_x) > self.tracking_settings['deadzone_x']:
-                        # Si le visage est à droite du centre
-                        if delta_x > 0:
-                            yaw_speed = self.tracking_settings['rotation_speed']
-                        # Si le visage est à gauche du centre
-                        else:
-                            yaw_speed = -self.tracking_settings['rotation_speed']
-                        
-                        # Ajuster la vitesse en fonction de la distance au centre
-                        # Plus le visage est loin du centre, plus la rotation est rapide
-                        yaw_speed = int(yaw_speed * min(abs(delta_x) / 100, 1.0))
-                    
-                    # Ajuster le mouvement vertical
-                    if abs(delta_y) > self.tracking_settings['deadzone_y']:
-                        # Si le visage est en dessous du centre (y augmente vers le bas)
-                        if delta_y > 0:
-                            up_down_speed = -self.tracking_settings['vertical_speed']  # Descendre
-                        # Si le visage est au-dessus du centre
-                        else:
-                            up_down_speed = self.tracking_settings['vertical_speed']  # Monter
-                        
-                        # Ajuster la vitesse en fonction de la distance au centre
-                        up_down_speed = int(up_down_speed * min(abs(delta_y) / 100, 1.0))
-                    
-                    # Envoyer la commande au drone
-                    # Format: lr, fb, ud, yaw (left/right, forward/backward, up/down, rotation)
-                    self.drone_service.drone.send_rc_control(0, 0, up_down_speed, yaw_speed)
-                    logger.debug(f"Mouvement - Rotation: {yaw_speed}, Vertical: {up_down_speed}")
+                    # Écarts normalisés du visage au centre (et à sa largeur cible), filtrés
+                    # puis régulés par la boucle de commande à l'instant de chaque envoi
+                    self._configure_controller(frame.shape)
+                    errors = self.controller.measure((y, x + w, y + h, x), frame.shape, self._target_face_width())
+                    self.control_loop.observe(errors, packet.timestamp)
                 
                 # Mettre à jour le temps de la dernière détection
                 last_detection_time = current_time
+                self.face_detected = face_detected
+                self.timings["iteration_ms"] = (time.perf_counter() - iteration_start) * 1000
                 
         except Exception as e:
             logger.error(f"Erreur dans la boucle de suivi de visage: {e}")
         finally:
+            if subscriber is not None:
+                subscriber.close()
+            self.control_loop.stop()
+            
             # S'assurer que le drone arrête tout mouvement à la fin du suivi
             if self.drone_service and self.drone_service.connected and self.drone_service.drone:
                 self.drone_service.drone.send_rc_control(0, 0, 0, 0)
             
             self.is_tracking = False
-            logger.info("Boucle de suivi de visage terminée")
\ No newline at end of file
+            self.face_detected = False
+            self.face_width = None
+            logger.info("Boucle de suivi de visage terminée")
+    
+    def _configure_controller(self, frame_shape):
+        """Applique au régulateur les vitesses maximales et les zones mortes des paramètres"""
+        height, width = frame_shape[:2]
+        self.controller.configure(
+            max_speeds={'yaw': self.tracking_settings['rotation_speed'],
+                        'vertical': self.tracking_settings['vertical_speed'],
+                        'distance': self.tracking_settings['forward_speed']},
+            deadbands={'yaw': self.tracking_settings['deadzone_x'] / (width / 2),
+                       'vertical': self.tracking_settings['deadzone_y'] / (height / 2),
+                       'distance': self.tracking_settings['distance_hysteresis']}
+        )
+    
+    def _record_detection_time(self, elapsed):
+        """Enregistre la durée d'une détection (dernière valeur et moyenne glissante)"""
+        detection_ms = elapsed * 1000
+        mean = self.timings["mean_detection_ms"]
+        self.timings["detection_ms"] = detection_ms
+        self.timings["mean_detection_ms"] = detection_ms if mean == 0.0 else 0.9 * mean + 0.1 * detection_ms
\ No newline at end of file
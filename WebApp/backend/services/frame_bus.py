@@ -0,0 +1,130 @@
+import threading
+import time
+
+
+class FramePacket:
+    """
+    Image publiée sur le bus, numérotée et horodatée
+
+    Le producteur recycle ses tampons: un abonné qui doit conserver l'image
+    au-delà de quelques images suivantes doit en faire une copie.
+    """
+
+    __slots__ = ('seq', 'timestamp', 'frame')
+
+    def __init__(self, seq, timestamp, frame):
+        self.seq = seq              # Numéro de séquence strictement croissant
+        self.timestamp = timestamp  # Instant de capture (time.time())
+        self.frame = frame          # Image BGR (numpy array)
+
+
+class FrameSubscriber:
+    """Abonné au bus d'images: ne reçoit jamais deux fois la même image"""
+
+    def __init__(self, bus, name):
+        self.bus = bus
+        self.name = name
+        self.last_seq = 0
+        self.received = 0
+        self.dropped = 0
+
+    def next_frame(self, timeout=None):
+        """
+        Attend la prochaine image publiée après la dernière reçue
+
+        Args:
+            timeout: Temps d'attente maximal en secondes (None = infini)
+
+        Returns:
+            FramePacket ou None si aucune nouvelle image n'est arrivée à temps
+        """
+        packet = self.bus.wait_for_frame(self.last_seq, timeout)
+        if packet is None:
+            return None
+
+        # Les images publiées entre deux lectures sont comptées comme perdues
+        if self.last_seq:
+            self.dropped += packet.seq - self.last_seq - 1
+        self.last_seq = packet.seq
+        self.received += 1
+        return packet
+
+    def get_stats(self):
+        """Retourne les statistiques de réception de l'abonné"""
+        return {
+            "last_seq": self.last_seq,
+            "received": self.received,
+            "dropped": self.dropped
+        }
+
+    def close(self):
+        """Se désabonne du bus"""
+        self.bus.unsubscribe(self)
+
+
+class FrameBus:
+    """Bus publication/abonnement des images décodées du flux vidéo"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._latest = None
+        self._seq = 0
+        self._subscribers = []
+
+    @property
+    def seq(self):
+        """Numéro de séquence de la dernière image publiée"""
+        return self._seq
+
+    def publish(self, frame, timestamp=None):
+        """Publie une nouvelle image et réveille les abonnés en attente"""
+        with self._condition:
+            self._seq += 1
+            self._latest = FramePacket(self._seq, timestamp or time.time(), frame)
+            self._condition.notify_all()
+            return self._latest
+
+    def clear(self):
+        """Oublie la dernière image (flux arrêté) sans réinitialiser la séquence"""
+        with self._condition:
+            self._latest = None
+
+    def latest(self):
+        """Retourne la dernière image publiée (ou None)"""
+        return self._latest
+
+    def wait_for_frame(self, after_seq=0, timeout=None):
+        """
+        Bloque jusqu'à ce qu'une image de séquence supérieure à after_seq soit disponible
+
+        Returns:
+            FramePacket ou None en cas de timeout
+        """
+        with self._condition:
+            ready = self._condition.wait_for(
+                lambda: self._latest is not None and self._latest.seq > after_seq,
+                timeout
+            )
+            return self._latest if ready else None
+
+    def subscribe(self, name):
+        """Crée un nouvel abonné nommé"""
+        subscriber = FrameSubscriber(self, name)
+        with self._condition:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Retire un abonné du bus"""
+        with self._condition:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def get_stats(self):
+        """Retourne la séquence courante et les images perdues par abonné"""
+        with self._condition:
+            subscribers = list(self._subscribers)
+        return {
+            "seq": self._seq,
+            "subscribers": {s.name: s.get_stats() for s in subscribers}
+        }
@@ -0,0 +1,231 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+import time
+import logging
+import cv2
+import numpy as np
+from config import (VIDEO_SOURCE, VIDEO_SOURCE_PATH, VIDEO_SOURCE_FPS, VIDEO_SOURCE_LOOP,
+                    VIDEO_WIDTH, VIDEO_HEIGHT)
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+class FrameSource(ABC):
+    """
+    Interface commune des sources d'images de VideoService
+
+    L'attribut frame contient la dernière image décodée (BGR). Comme pour
+    djitellopy.BackgroundFrameRead, un nouvel objet est affecté à chaque image:
+    un objet identique signifie qu'aucune nouvelle image n'est arrivée.
+    """
+
+    name = 'base'
+    requires_drone = False  # La source a-t-elle besoin d'un drone connecté?
+
+    def __init__(self):
+        self.frame = None
+
+    def is_available(self):
+        """Indique si la source peut fournir des images"""
+        return True
+
+    @abstractmethod
+    def start(self):
+        """Démarre la production d'images"""
+
+    @abstractmethod
+    def stop(self):
+        """Arrête la production d'images"""
+
+
+class TelloFrameSource(FrameSource):
+    """Flux vidéo H.264 du drone Tello décodé par djitellopy"""
+
+    name = 'tello'
+    requires_drone = True
+
+    def __init__(self, drone_service):
+        super().__init__()
+        self.drone_service = drone_service
+        self._frame_read = None
+
+    @property
+    def frame(self):
+        """Dernière image décodée par le BackgroundFrameRead du drone"""
+        if self._frame_read is None:
+            if not self.drone_service.drone:
+                return None
+            self._frame_read = self.drone_service.drone.get_frame_read()
+        return self._frame_read.frame
+
+    @frame.setter
+    def frame(self, value):
+        # L'image est fournie par djitellopy, rien à stocker
+        pass
+
+    def is_available(self):
+        return bool(self.drone_service.connected and self.drone_service.drone)
+
+    def start(self):
+        self._frame_read = None
+        self.drone_service.drone.streamon()
+
+    def stop(self):
+        self._frame_read = None
+        if self.drone_service.connected and self.drone_service.drone:
+            self.drone_service.drone.streamoff()
+
+
+class _ThreadedFrameSource(FrameSource):
+    """Source cadencée par un thread à fréquence fixe"""
+
+    def __init__(self, fps):
+        super().__init__()
+        self.fps = fps
+        self.frames_produced = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._open()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        self._close()
+
+    def _run(self):
+        """Produit les images à cadence fixe, sans dériver si une image est lente"""
+        period = 1.0 / self.fps if self.fps > 0 else 0
+        next_time = time.monotonic()
+        while not self._stop_event.is_set():
+            frame = self._next_frame()
+            if frame is None:
+                logger.info(f"Fin de la source vidéo '{self.name}'")
+                break
+            self.frame = frame
+            self.frames_produced += 1
+
+            next_time += period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                next_time = time.monotonic()
+
+    def _open(self):
+        pass
+
+    def _close(self):
+        pass
+
+    @abstractmethod
+    def _next_frame(self):
+        """Produit l'image suivante, ou None à la fin de la source"""
+
+
+class FileFrameSource(_ThreadedFrameSource):
+    """Rejoue un fichier vidéo ou un dossier d'images à une cadence configurable"""
+
+    name = 'file'
+
+    def __init__(self, path, fps=VIDEO_SOURCE_FPS, loop=VIDEO_SOURCE_LOOP):
+        super().__init__(fps)
+        self.path = path
+        self.loop = loop
+        self._capture = None
+        self._images = []
+        self._index = 0
+
+    def is_available(self):
+        return bool(self.path) and os.path.exists(self.path)
+
+    def _open(self):
+        if os.path.isdir(self.path):
+            self._images = sorted(
+                os.path.join(self.path, f) for f in os.listdir(self.path)
+                if f.lower().endswith(IMAGE_EXTENSIONS)
+            )
+            if not self._images:
+                raise ValueError(f"Aucune image dans le dossier '{self.path}'")
+            self._index = 0
+        else:
+            self._capture = cv2.VideoCapture(self.path)
+            if not self._capture.isOpened():
+                raise ValueError(f"Impossible d'ouvrir la vidéo '{self.path}'")
+
+    def _close(self):
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+    def _next_frame(self):
+        if self._capture is not None:
+            ret, frame = self._capture.read()
+            if not ret and self.loop:
+                self._capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                ret, frame = self._capture.read()
+            return frame if ret else None
+
+        if self._index >= len(self._images):
+            if not self.loop:
+                return None
+            self._index = 0
+        frame = cv2.imread(self._images[self._index])
+        self._index += 1
+        return frame
+
+
+class SyntheticFrameSource(_ThreadedFrameSource):
+    """Génère des images déterministes (fond bruité et disque en mouvement)"""
+
+    name = 'synthetic'
+
+    def __init__(self, fps=VIDEO_SOURCE_FPS, width=VIDEO_WIDTH, height=VIDEO_HEIGHT, seed=0):
+        super().__init__(fps)
+        self.width = width
+        self.height = height
+        rng = np.random.default_rng(seed)
+        self._background = rng.integers(0, 64, (height, width, 3), dtype=np.uint8)
+
+    def _next_frame(self):
+        frame = self._background.copy()
+        t = self.frames_produced / max(self.fps, 1)
+        center = (int(self.width / 2 + self.width / 4 * np.cos(t)),
+                  int(self.height / 2 + self.height / 4 * np.sin(2 * t)))
+        cv2.circle(frame, center, min(self.width, self.height) // 8, (200, 180, 160), -1)
+        cv2.putText(frame, f"{self.frames_produced}", (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        return frame
+
+
+def create_frame_source(drone_service, kind=None, path=None, fps=None):
+    """
+    Crée la source d'images configurée dans config.py
+
+    Args:
+        drone_service: Service drone (utilisé par la source 'tello')
+        kind: 'tello', 'file' ou 'synthetic' (VIDEO_SOURCE par défaut)
+        path: Fichier vidéo ou dossier d'images pour 'file' (VIDEO_SOURCE_PATH par défaut)
+        fps: Cadence de rejeu pour 'file' et 'synthetic' (VIDEO_SOURCE_FPS par défaut)
+    """
+    kind = kind or VIDEO_SOURCE
+    fps = fps or VIDEO_SOURCE_FPS
+
+    if kind == 'tello':
+        return TelloFrameSource(drone_service)
+    if kind == 'file':
+        return FileFrameSource(path or VIDEO_SOURCE_PATH, fps=fps)
+    if kind == 'synthetic':
+        return SyntheticFrameSource(fps=fps)
+    raise ValueError(f"Source vidéo inconnue: '{kind}'")
@@ -4,6 +4,7 @@ import time
 import threading
 import logging
 from services.drone_service import DroneService
+from services.video_service import VideoService
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,7 @@ class GestureService:
             
         self._initialized = True
         self.drone_service = DroneService()
+        self.video_service = VideoService()
         self.is_running = False
         self.detection_thread = None
         self.last_gesture_time = 0
@@ -80,6 +82,7 @@ class GestureService:
     
     def _detection_loop(self):
         """Boucle principale de détection des gestes"""
+        subscriber = self.video_service.frame_bus.subscribe('gesture')
         try:
             with self.mp_hands.Hands(
                 max_num_hands=1,
@@ -90,11 +93,11 @@ class GestureService:
                 
                 while self.is_running and self.drone_service.connected:
                     try:
-                        # Récupérer la frame vidéo du drone
-                        frame = self.drone_service.drone.get_frame_read().frame
-                        if frame is None:
-                            time.sleep(0.1)
+                        # Attendre une nouvelle frame sur le bus vidéo
+                        packet = subscriber.next_frame(timeout=0.5)
+                        if packet is None:
                             continue
+                        frame = packet.frame
                         
                         # Convertir la frame pour MediaPipe
                         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -143,6 +146,8 @@ class GestureService:
         except Exception as e:
             logger.error(f"Erreur fatale dans la détection des gestes: {e}")
             self.is_running = False
+        finally:
+            subscriber.close()
     
     def _count_fingers_up(self, hand_position, handedness="Left"):
         """
@@ -0,0 +1,149 @@
+import itertools
+import cv2
+import numpy as np
+
+IOU_MATCH_THRESHOLD = 0.3  # Recouvrement minimal entre un visage détecté et une piste
+TRACK_MAX_MISSED = 3  # Images sans correspondance avant l'abandon d'une piste
+CONFIDENCE_HALF_LIFE = 2.0  # Secondes pour que la confiance d'une identité non revérifiée diminue de moitié
+UNKNOWN_RETRY_INTERVAL = 1.0  # Secondes entre deux tentatives de reconnaissance d'un visage inconnu
+TEMPLATE_MIN_SCORE = 0.5  # Corrélation minimale pour suivre un visage entre deux détections
+
+
+def box_iou(a, b):
+    """Recouvrement (intersection / union) de deux boîtes (top, right, bottom, left)"""
+    top, bottom = max(a[0], b[0]), min(a[2], b[2])
+    left, right = max(a[3], b[3]), min(a[1], b[1])
+    intersection = max(0, bottom - top) * max(0, right - left)
+    area_a = (a[2] - a[0]) * (a[1] - a[3])
+    area_b = (b[2] - b[0]) * (b[1] - b[3])
+    union = area_a + area_b - intersection
+    return intersection / union if union > 0 else 0.0
+
+
+class FaceTrack:
+    """Visage suivi d'une image à l'autre, avec la dernière identité reconnue"""
+
+    def __init__(self, track_id, box):
+        self.track_id = track_id
+        self.box = box
+        self.name = None
+        self.confidence = 0.0  # Confiance de la dernière reconnaissance
+        self.recognized_at = None
+        self.missed = 0
+        self.template = None
+
+    def identify(self, name, confidence, now):
+        """Enregistre le résultat d'une reconnaissance"""
+        self.name = name
+        self.confidence = confidence
+        self.recognized_at = now
+
+    def current_confidence(self, now):
+        """Confiance de l'identité, diminuée depuis la dernière reconnaissance"""
+        if self.recognized_at is None:
+            return 0.0
+        return self.confidence * 0.5 ** ((now - self.recognized_at) / CONFIDENCE_HALF_LIFE)
+
+
+class IdentityTracker:
+    """
+    Associe les visages d'une image à l'autre pour réutiliser leur identité
+
+    Les visages détectés sont associés aux pistes existantes par recouvrement
+    (IoU); seuls les visages d'une nouvelle piste, ou dont la confiance a trop
+    diminué, doivent être réencodés. Entre deux détections, follow() déplace
+    les pistes par corrélation de l'apparence du visage (cv2.matchTemplate)
+    autour de leur dernière position.
+    """
+
+    def __init__(self):
+        self.tracks = []
+        self._ids = itertools.count(1)
+        self.recognitions = 0  # Visages encodés
+        self.reused = 0  # Visages dont l'identité a été reprise d'une piste
+
+    def reset(self):
+        self.tracks = []
+
+    def update(self, boxes, gray, now):
+        """
+        Associe les visages détectés aux pistes
+
+        Args:
+            boxes: Boîtes (top, right, bottom, left) des visages détectés
+            gray: Image en niveaux de gris, dans le repère des boîtes
+            now: Heure de l'image (secondes)
+
+        Returns:
+            list: Piste de chaque visage, dans l'ordre des boîtes
+        """
+        pairs = sorted(((box_iou(box, track.box), i, j)
+                        for i, box in enumerate(boxes) for j, track in enumerate(self.tracks)),
+                       reverse=True)
+        assigned = [None] * len(boxes)
+        used = set()
+        for iou, i, j in pairs:
+            if iou < IOU_MATCH_THRESHOLD:
+                break
+            if assigned[i] is None and j not in used:
+                assigned[i] = self.tracks[j]
+                used.add(j)
+
+        for j, track in enumerate(self.tracks):
+            if j not in used:
+                track.missed += 1
+        self.tracks = [track for track in self.tracks if track.missed <= TRACK_MAX_MISSED]
+
+        for i, box in enumerate(boxes):
+            track = assigned[i]
+            if track is None:
+                track = FaceTrack(next(self._ids), box)
+                self.tracks.append(track)
+            track.box = tuple(int(v) for v in box)
+            track.missed = 0
+            track.template = self._crop(gray, track.box)
+            assigned[i] = track
+        return assigned
+
+    def needs_recognition(self, track, now, min_confidence):
+        """Indique si l'identité d'une piste doit être recalculée"""
+        if track.recognized_at is None:
+            return True
+        if track.name is None:
+            return now - track.recognized_at >= UNKNOWN_RETRY_INTERVAL
+        return track.current_confidence(now) < min_confidence
+
+    def follow(self, gray):
+        """
+        Déplace les pistes vers la zone la plus ressemblante de la nouvelle image
+
+        Returns:
+            list: Pistes suivies dans cette image
+        """
+        followed = []
+        for track in self.tracks:
+            if track.missed or track.template is None or track.template.size == 0:
+                continue
+            top, right, bottom, left = track.box
+            height, width = bottom - top, right - left
+            # Zone de recherche: la boîte agrandie de la moitié de sa taille de chaque côté
+            y0, x0 = max(0, top - height // 2), max(0, left - width // 2)
+            window = gray[y0:bottom + height // 2, x0:right + width // 2]
+            if window.shape[0] < track.template.shape[0] or window.shape[1] < track.template.shape[1]:
+                continue
+            scores = cv2.matchTemplate(window, track.template, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (dx, dy) = cv2.minMaxLoc(scores)
+            if score < TEMPLATE_MIN_SCORE:
+                continue
+            track.box = (y0 + dy, x0 + dx + width, y0 + dy + height, x0 + dx)
+            followed.append(track)
+        return followed
+
+    @staticmethod
+    def _crop(gray, box):
+        top, right, bottom, left = box
+        return np.ascontiguousarray(gray[max(0, top):bottom, max(0, left):right])
+
+    def get_stats(self):
+        """Retourne le nombre de pistes et de visages encodés ou repris"""
+        return {"tracks": len(self.tracks), "recognitions": self.recognitions, "reused": self.reused}
@@ -0,0 +1,69 @@
+import threading
+import cv2
+
+
+def mjpeg_part(jpeg_bytes):
+    """Construit une partie multipart MJPEG à partir d'une image JPEG encodée"""
+    return (b'--frame\r\n'
+            b'Content-Type: image/jpeg\r\n\r\n' + jpeg_bytes + b'\r\n')
+
+
+class MjpegBroadcaster:
+    """Encode chaque image du bus une seule fois et la partage entre tous les clients MJPEG"""
+
+    def __init__(self, frame_bus):
+        self.frame_bus = frame_bus
+        self._encode_lock = threading.Lock()
+        self._viewers_lock = threading.Lock()
+        self._cached_seq = 0
+        self._cached_part = None
+        self.encoded_count = 0
+        self.viewers = 0
+
+    def wait_for_part(self, after_seq=0, timeout=None):
+        """
+        Attend une image plus récente que after_seq et retourne sa partie MJPEG
+
+        Returns:
+            tuple: (seq, partie multipart ou None si l'encodage a échoué)
+            ou None si aucune nouvelle image n'est arrivée à temps
+        """
+        packet = self.frame_bus.wait_for_frame(after_seq, timeout)
+        if packet is None:
+            return None
+        return self._get_part(packet)
+
+    def _get_part(self, packet):
+        """Retourne la partie MJPEG en cache, en n'encodant qu'une fois par séquence"""
+        with self._encode_lock:
+            # Un autre client a déjà encodé cette image (ou une plus récente)
+            if packet.seq <= self._cached_seq:
+                return self._cached_seq, self._cached_part
+
+            ret, buffer = cv2.imencode('.jpg', packet.frame)
+            if not ret:
+                # Ne pas réessayer indéfiniment la même image
+                return packet.seq, None
+
+            self._cached_seq = packet.seq
+            self._cached_part = mjpeg_part(buffer.tobytes())
+            self.encoded_count += 1
+            return self._cached_seq, self._cached_part
+
+    def add_viewer(self):
+        """Signale l'ouverture d'un flux client"""
+        with self._viewers_lock:
+            self.viewers += 1
+
+    def remove_viewer(self):
+        """Signale la fermeture d'un flux client"""
+        with self._viewers_lock:
+            self.viewers -= 1
+
+    def get_stats(self):
+        """Retourne le nombre d'encodages JPEG et de clients connectés"""
+        return {
+            "encoded_frames": self.encoded_count,
+            "cached_seq": self._cached_seq,
+            "viewers": self.viewers
+        }
@@ -0,0 +1,125 @@
+import os
+import time
+from collections import deque
+
+SCALE_STEPS = (0.125, 0.18, 0.25, 0.35, 0.5)  # Facteurs de réduction possibles de l'image traitée
+MIN_INTERVAL = 0.1  # Intervalle minimal entre deux détections (secondes)
+MAX_INTERVAL = 2.0  # Intervalle maximal, atteint sur une scène sans visage
+IDLE_BACKOFF = 1.5  # Allongement de l'intervalle après chaque détection sans visage
+SMOOTHING = 0.3  # Poids de la dernière mesure dans les moyennes glissantes
+SCALE_UP_MARGIN = 0.7  # Part du budget de latence à ne pas dépasser pour agrandir l'image
+
+
+def cpu_cores():
+    """Cœurs utilisables par le processus"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def system_load():
+    """Charge moyenne du système sur une minute (None si indisponible)"""
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+
+
+class RecognitionScheduler:
+    """
+    Ajuste l'intervalle entre deux détections et la réduction de l'image
+
+    Le coût d'une détection est mesuré à chaque image traitée et ramené à la
+    surface traitée (proportionnelle au carré du facteur de réduction). Le
+    facteur retenu est le plus grand dont la durée prévue tient dans le budget
+    de latence; l'intervalle est le plus court qui garde la part d'un cœur
+    utilisée sous le budget CPU, lui-même limité par les cœurs laissés libres
+    par le reste du système. Sans visage, l'intervalle s'allonge jusqu'à
+    MAX_INTERVAL; dès qu'un visage apparaît, il revient au plus court.
+    """
+
+    def __init__(self, scale=0.25, interval=0.5):
+        self.scale = scale
+        self.interval = interval
+        self.area_cost = None  # Secondes de détection par unité de surface (facteur 1)
+        self.frame_time = None  # Durée moyenne d'une détection (secondes)
+        self.latency_budget = None
+        self.cpu_budget = None
+        self.faces_present = False
+        self._detections = deque(maxlen=20)  # Heures des dernières détections
+
+    def record(self, duration, faces_present, latency_budget, cpu_budget, now=None):
+        """
+        Prend en compte la durée d'une détection et ajuste les paramètres
+
+        Args:
+            duration: Durée de la détection (secondes)
+            faces_present: Au moins un visage détecté
+            latency_budget: Durée maximale souhaitée d'une détection (secondes)
+            cpu_budget: Part maximale d'un cœur utilisée par la détection
+
+        Returns:
+            bool: True si le facteur de réduction a changé
+        """
+        self._detections.append(time.time() if now is None else now)
+        self.faces_present = faces_present
+        cost = duration / self.scale ** 2
+        if self.area_cost is None:
+            self.area_cost, self.frame_time = cost, duration
+        else:
+            self.area_cost += SMOOTHING * (cost - self.area_cost)
+            self.frame_time += SMOOTHING * (duration - self.frame_time)
+
+        self.latency_budget = latency_budget
+        self.cpu_budget = min(cpu_budget, self.available_cpu())
+
+        previous_scale = self.scale
+        self.scale = self._select_scale(latency_budget, faces_present)
+        predicted = self.area_cost * self.scale ** 2
+        busy_interval = predicted / max(self.cpu_budget, 0.05)
+        if faces_present:
+            self.interval = max(MIN_INTERVAL, busy_interval)
+        else:
+            self.interval = min(MAX_INTERVAL, max(busy_interval, self.interval * IDLE_BACKOFF))
+        return self.scale != previous_scale
+
+    def _select_scale(self, latency_budget, faces_present):
+        """Plus grand facteur dont la durée prévue respecte le budget de latence"""
+        index = min(range(len(SCALE_STEPS)), key=lambda i: abs(SCALE_STEPS[i] - self.scale))
+        # Trop lent: réduire jusqu'à tenir dans le budget
+        while index > 0 and self.area_cost * SCALE_STEPS[index] ** 2 > latency_budget:
+            index -= 1
+        # Agrandir d'un cran seulement avec des visages et une marge suffisante
+        if (faces_present and index + 1 < len(SCALE_STEPS)
+                and self.area_cost * SCALE_STEPS[index + 1] ** 2 <= SCALE_UP_MARGIN * latency_budget):
+            index += 1
+        return SCALE_STEPS[index]
+
+    def available_cpu(self):
+        """Part d'un cœur laissée libre par le reste du système"""
+        load = system_load()
+        if load is None:
+            return 1.0
+        own = self.frame_time / self.interval if self.frame_time else 0.0
+        others = max(0.0, load - own)
+        return max(0.0, min(1.0, cpu_cores() - others))
+
+    def measured_rate(self):
+        """Détections par seconde sur les dernières détections"""
+        if len(self._detections) < 2:
+            return 0.0
+        elapsed = self._detections[-1] - self._detections[0]
+        return (len(self._detections) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def get_status(self):
+        """Retourne les paramètres courants et les mesures du planificateur"""
+        return {
+            "scale": self.scale,
+            "interval": self.interval,
+            "target_rate": 1 / self.interval,
+            "measured_rate": self.measured_rate(),
+            "frame_time": self.frame_time,
+            "latency_budget": self.latency_budget,
+            "cpu_budget": self.cpu_budget,
+            "faces_present": self.faces_present,
+        }
@@ -0,0 +1,252 @@
+import copy
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from services.shared_frame_ring import SharedFrameRing
+
+logger = logging.getLogger(__name__)
+
+WORKER_TIMEOUT = 10.0  # Attente maximale de la réponse du processus pour une image (secondes)
+RING_READ_ATTEMPTS = 3  # Lectures de l'image la plus récente avant d'abandonner (écrasée pendant la copie)
+STOP_TIMEOUT = 2.0  # Attente de l'arrêt du processus avant de le terminer (secondes)
+PARENT_CHECK_INTERVAL = 1.0  # Vérification de la présence du processus principal (secondes)
+
+
+class RecognitionWorker:
+    """
+    Processus de reconnaissance faciale
+
+    dlib garde le GIL pendant toute une détection ou un encodage: exécutée dans
+    un thread, la reconnaissance retarde les requêtes Flask de plusieurs dizaines
+    de millisecondes. Ici, détection, encodage et identification s'exécutent
+    dans un processus séparé, qui lit les images dans un anneau en mémoire
+    partagée (SharedFrameRing): celui de VideoService s'il est activé, aucune
+    copie n'est alors faite par le processus Flask, sinon un anneau privé où
+    chaque image est copiée. Seules les détections reviennent par une file. Les
+    paramètres modifiés et la galerie sont transmis au processus avant l'image
+    suivante.
+
+    Le processus est créé par fork: il n'importe pas à nouveau l'application,
+    dont les contrôleurs instancient les services à l'import.
+    """
+
+    def __init__(self, ring_name=None, timeout=WORKER_TIMEOUT):
+        """
+        Args:
+            ring_name: Anneau d'images partagé de VideoService (None: anneau privé)
+            timeout: Attente maximale de la réponse du processus pour une image
+        """
+        self.ring_name = ring_name
+        self.timeout = timeout
+        self._context = multiprocessing.get_context('fork')
+        self._process = None
+        self._requests = None
+        self._results = None
+        self._ring = None
+        self._settings = None
+        self._gallery = None
+        self.frames = 0
+        self.tracker_stats = {"tracks": 0, "recognitions": 0, "reused": 0}
+
+    def start(self, pipeline_factory, settings, gallery):
+        """
+        Démarre le processus
+
+        Args:
+            pipeline_factory: Fonction (paramètres, galerie) -> traitement d'images,
+                appelée dans le processus (FaceRecognitionService.create_pipeline)
+            settings: Paramètres de la reconnaissance
+            gallery: Galerie des visages connus
+
+        Raises:
+            RuntimeError: Le traitement n'a pas pu être créé dans le processus
+        """
+        self._settings = copy.deepcopy(settings)
+        self._gallery = gallery
+        self._requests = self._context.Queue()
+        self._results = self._context.Queue()
+        self._process = self._context.Process(
+            target=_run_worker,
+            args=(pipeline_factory, self._settings, gallery, self._requests, self._results),
+            name='face-recognition',
+            daemon=True
+        )
+        self._process.start()
+
+        # Attendre que le processus soit prêt: sa première image serait sinon
+        # chronométrée avec la création et le premier passage du traitement
+        try:
+            success, result = self._results.get(timeout=self.timeout)
+        except queue.Empty:
+            success, result = False, f"Processus de reconnaissance non prêt après {self.timeout} s"
+        if not success:
+            self.stop()
+            raise RuntimeError(result)
+        logger.info(f"Processus de reconnaissance démarré (pid {self._process.pid})")
+
+    def is_alive(self):
+        return self._process is not None and self._process.is_alive()
+
+    def sync(self, settings, gallery):
+        """Transmet au processus les paramètres modifiés et la nouvelle galerie"""
+        changes = {key: value for key, value in settings.items() if self._settings.get(key) != value}
+        if changes:
+            self._requests.put(('settings', copy.deepcopy(changes)))
+            self._settings = copy.deepcopy(settings)
+        if gallery is not self._gallery:
+            self._requests.put(('gallery', gallery))
+            self._gallery = gallery
+
+    def process(self, frame, scale, follow=False):
+        """
+        Fait traiter une image par le processus
+
+        Args:
+            frame: Image BGR; avec l'anneau de VideoService, le processus traite
+                l'image la plus récente de l'anneau, au moins aussi récente
+            scale: Facteur de réduction de l'image traitée
+            follow: Déplacer les visages suivis sans détection ni encodage
+
+        Returns:
+            list: Détections, au format de FaceRecognitionService._build_detections
+
+        Raises:
+            RuntimeError: Processus arrêté, sans réponse (il est alors arrêté) ou en erreur
+        """
+        if not self.is_alive():
+            raise RuntimeError("Processus de reconnaissance arrêté")
+        # stop() peut être appelé depuis un autre thread pendant l'attente
+        requests, results = self._requests, self._results
+
+        if self.ring_name is not None:
+            ring_name, seq = self.ring_name, None
+        else:
+            # L'anneau privé n'est recréé que si l'image grandit
+            if self._ring is None or any(size > limit for size, limit in zip(frame.shape, self._ring.max_shape)):
+                self._release_ring()
+                self._ring = SharedFrameRing.create(2, frame.shape)
+            ring_name, seq = self._ring.name, self._ring.publish(frame)
+        requests.put(('follow' if follow else 'detect', (ring_name, seq, scale)))
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                success, result = results.get(timeout=0.1)
+                break
+            except queue.Empty:
+                if not self.is_alive():
+                    raise RuntimeError("Processus de reconnaissance arrêté")
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"Pas de réponse du processus de reconnaissance après {self.timeout} s")
+
+        if not success:
+            raise RuntimeError(result)
+        detections, self.tracker_stats = result
+        self.frames += 1
+        return detections
+
+    def stop(self):
+        """Arrête le processus et libère la mémoire partagée"""
+        if self._process is not None:
+            if self._process.is_alive():
+                self._requests.put(('stop', None))
+                self._process.join(timeout=STOP_TIMEOUT)
+                if self._process.is_alive():
+                    logger.warning("Le processus de reconnaissance ne répond pas: arrêt forcé")
+                    self._process.terminate()
+                    self._process.join(timeout=STOP_TIMEOUT)
+            logger.info("Processus de reconnaissance arrêté")
+            self._process = None
+        self._requests = self._results = None
+        self._release_ring()
+
+    def get_status(self):
+        """Retourne l'état du processus et le nombre d'images traitées"""
+        return {
+            "pid": self._process.pid if self._process is not None else None,
+            "alive": self.is_alive(),
+            "frames": self.frames,
+        }
+
+    def _release_ring(self):
+        if self._ring is not None:
+            self._ring.close()
+            self._ring = None
+
+
+def _read_frame(ring, seq):
+    """
+    Copie l'image demandée, ou la plus récente, hors de l'anneau
+
+    Le traitement dure plus longtemps que quelques images: sur une vue,
+    l'image pourrait être écrasée pendant la détection.
+    """
+    for _ in range(RING_READ_ATTEMPTS):
+        packet = ring.copy(seq)
+        if packet is not None:
+            return packet.frame
+        seq = None
+    raise RuntimeError(f"Aucune image lisible dans l'anneau '{ring.name}'")
+
+
+def _run_worker(pipeline_factory, settings, gallery, requests, results):
+    """Boucle du processus de reconnaissance: traite les commandes jusqu'à 'stop'"""
+    # Ctrl+C est géré par le processus principal, qui arrête ce processus
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    parent = os.getppid()
+    try:
+        pipeline = pipeline_factory(settings, gallery)
+        pipeline.warm_up()
+    except Exception as e:
+        results.put((False, f"Impossible de démarrer le processus de reconnaissance: {e}"))
+        return
+    results.put((True, None))
+    ring = None
+    last_scale = None
+    try:
+        while True:
+            try:
+                command, payload = requests.get(timeout=PARENT_CHECK_INTERVAL)
+            except queue.Empty:
+                # Processus principal disparu sans arrêter ce processus (kill, plantage):
+                # s'arrêter au lieu de garder ses sockets hérités
+                if os.getppid() != parent:
+                    break
+                continue
+            if command == 'stop':
+                break
+            if command == 'settings':
+                pipeline.update_settings(payload)
+                continue
+            if command == 'gallery':
+                pipeline.gallery = payload
+                continue
+
+            try:
+                name, seq, scale = payload
+                if ring is None or ring.name != name:
+                    if ring is not None:
+                        ring.close()
+                    ring = SharedFrameRing.attach(name)
+                frame = _read_frame(ring, seq)
+
+                # Les positions des visages suivis dépendent de l'échelle de traitement
+                if scale != last_scale:
+                    pipeline.identity_tracker.reset()
+                    last_scale = scale
+
+                if command == 'follow':
+                    detections = pipeline._follow_frame(frame, scale)
+                else:
+                    detections = pipeline._process_frame(frame, scale)
+                results.put((True, (detections, pipeline.identity_tracker.get_stats())))
+            except Exception as e:
+                logger.error(f"Erreur dans le processus de reconnaissance: {e}")
+                results.put((False, f"Erreur dans le processus de reconnaissance: {e}"))
+    finally:
+        if ring is not None:
+            ring.close()
@@ -0,0 +1,271 @@
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+
+RING_MAGIC = 0x54464652  # 'RFFT': segment créé par SharedFrameRing
+DATA_ALIGNMENT = 64
+
+# En-tête du segment, puis un en-tête par emplacement, puis les images
+RING_HEADER = np.dtype([('magic', '<u4'), ('slots', '<u4'), ('slot_bytes', '<u8'),
+                        ('max_shape', '<u4', 3), ('latest', '<u8')])
+SLOT_HEADER = np.dtype([('seq', '<u8'), ('timestamp', '<f8'), ('shape', '<u4', 3)])
+
+
+def _open_untracked(name):
+    """
+    Ouvre un segment existant sans le confier au suivi des ressources
+
+    Le segment appartient à l'écrivain: suivi par le processus lecteur, il
+    serait supprimé à la sortie de ce dernier. Avant Python 3.13, SharedMemory
+    enregistre aussi les segments simplement ouverts, sans option pour l'éviter.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class RingFrame:
+    """
+    Image lue dans l'anneau
+
+    frame est une vue sur la mémoire partagée (sauf après copy()): elle reste
+    valide tant que SharedFrameRing.is_current() le confirme.
+    """
+
+    __slots__ = ('seq', 'timestamp', 'frame')
+
+    def __init__(self, seq, timestamp, frame):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.frame = frame
+
+
+class SharedFrameRing:
+    """
+    Anneau d'images en mémoire partagée, lisible par d'autres processus sans copie
+
+    Un segment multiprocessing.shared_memory contient N emplacements de taille
+    fixe (images uint8 d'au plus max_shape), chacun précédé d'un en-tête:
+    numéro de séquence, horodatage et dimensions de l'image. L'image de
+    séquence s (à partir de 1) occupe l'emplacement (s - 1) % N; elle est
+    écrasée N images plus tard.
+
+    Un seul processus écrit. Pendant l'écriture, la séquence de l'emplacement
+    vaut 0; elle n'est publiée qu'une fois l'image complète. Un lecteur vérifie
+    donc, après avoir utilisé une vue, que l'emplacement porte toujours la même
+    séquence (is_current); copy() fait cette vérification pour lui.
+
+    Les autres processus s'attachent par le nom du segment (attach), sans
+    connaître le nombre d'emplacements ni la taille des images.
+    """
+
+    def __init__(self, memory, owner):
+        self._memory = memory
+        self.owner = owner
+        header = np.ndarray((), RING_HEADER, buffer=memory.buf)
+        if header['magic'] != RING_MAGIC:
+            raise ValueError(f"Le segment '{memory.name}' n'est pas un anneau d'images")
+        self.slots = int(header['slots'])
+        self.slot_bytes = int(header['slot_bytes'])
+        self.max_shape = tuple(int(v) for v in header['max_shape'])
+        self._header = header
+        self._slot_headers = np.ndarray((self.slots,), SLOT_HEADER, buffer=memory.buf,
+                                        offset=RING_HEADER.itemsize)
+        data_offset = self._data_offset(self.slots)
+        self._data = [np.ndarray((self.slot_bytes,), np.uint8, buffer=memory.buf,
+                                 offset=data_offset + index * self.slot_bytes)
+                      for index in range(self.slots)]
+
+    @staticmethod
+    def _data_offset(slots):
+        offset = RING_HEADER.itemsize + slots * SLOT_HEADER.itemsize
+        return -(-offset // DATA_ALIGNMENT) * DATA_ALIGNMENT
+
+    @classmethod
+    def create(cls, slots, max_shape, name=None):
+        """
+        Crée l'anneau (processus écrivain)
+
+        Args:
+            slots: Nombre d'emplacements (au moins 2)
+            max_shape: Dimensions maximales d'une image, (hauteur, largeur, canaux)
+            name: Nom du segment (aléatoire par défaut); un segment orphelin
+                du même nom, laissé par un processus arrêté brutalement, est remplacé
+        """
+        if slots < 2:
+            raise ValueError("Un anneau d'images nécessite au moins 2 emplacements")
+        max_shape = tuple(max_shape) + (1,) * (3 - len(max_shape))
+        slot_bytes = int(np.prod(max_shape))
+        size = cls._data_offset(slots) + slots * slot_bytes
+        try:
+            memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        header = np.ndarray((), RING_HEADER, buffer=memory.buf)
+        header['slots'] = slots
+        header['slot_bytes'] = slot_bytes
+        header['max_shape'] = max_shape
+        header['latest'] = 0
+        np.ndarray((slots,), SLOT_HEADER, buffer=memory.buf, offset=RING_HEADER.itemsize)['seq'] = 0
+        header['magic'] = RING_MAGIC
+        del header
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """S'attache à un anneau existant (processus lecteur)"""
+        memory = _open_untracked(name)
+        try:
+            return cls(memory, owner=False)
+        except ValueError:
+            memory.close()
+            raise
+
+    @property
+    def name(self):
+        return self._memory.name
+
+    @property
+    def seq(self):
+        """Séquence de la dernière image publiée (0 si aucune)"""
+        return int(self._header['latest'])
+
+    def _slot(self, seq):
+        return (seq - 1) % self.slots
+
+    def _view(self, index, shape):
+        shape = tuple(int(v) for v in shape)
+        return self._data[index][:int(np.prod(shape))].reshape(shape if shape[2] > 1 else shape[:2])
+
+    # Écriture
+
+    def reserve(self):
+        """
+        Réserve l'emplacement de la prochaine image, à remplir avant commit()
+
+        Returns:
+            tuple: (séquence, tableau de dimensions max_shape où écrire l'image)
+        """
+        seq = self.seq + 1
+        index = self._slot(seq)
+        # Les lecteurs voient l'emplacement invalide pendant l'écriture
+        self._slot_headers['seq'][index] = 0
+        return seq, self._view(index, self.max_shape)
+
+    def commit(self, seq, timestamp=None, shape=None):
+        """Publie l'image écrite dans l'emplacement réservé"""
+        index = self._slot(seq)
+        shape = tuple(shape or self.max_shape)
+        self._slot_headers['timestamp'][index] = time.time() if timestamp is None else timestamp
+        self._slot_headers['shape'][index] = shape + (1,) * (3 - len(shape))
+        self._slot_headers['seq'][index] = seq
+        self._header['latest'] = seq
+
+    def publish(self, frame, timestamp=None):
+        """Copie une image dans l'anneau et la publie; retourne sa séquence"""
+        shape = frame.shape + (1,) * (3 - frame.ndim)
+        if any(size > limit for size, limit in zip(shape, self.max_shape)):
+            raise ValueError(f"Image {frame.shape} plus grande que l'anneau {self.max_shape}")
+        seq, _ = self.reserve()
+        self._view(self._slot(seq), shape)[...] = frame
+        self.commit(seq, timestamp, shape)
+        return seq
+
+    # Lecture
+
+    def read(self, seq=None):
+        """
+        Vue sans copie sur une image de l'anneau
+
+        Args:
+            seq: Séquence voulue (None: dernière image publiée)
+
+        Returns:
+            RingFrame, ou None si l'image n'a pas encore été publiée, est en
+            cours d'écriture ou a déjà été écrasée (le lecteur a pris plus de
+            N images de retard)
+        """
+        seq = self.seq if seq is None else seq
+        if seq <= 0:
+            return None
+        index = self._slot(seq)
+        if int(self._slot_headers['seq'][index]) != seq:
+            return None
+        timestamp = float(self._slot_headers['timestamp'][index])
+        shape = tuple(self._slot_headers['shape'][index])
+        frame = RingFrame(seq, timestamp, self._view(index, shape))
+        # L'en-tête a pu changer pendant sa lecture
+        return frame if self.is_current(frame) else None
+
+    def is_current(self, frame):
+        """Indique si la vue d'une image lue n'a pas été écrasée depuis"""
+        return int(self._slot_headers['seq'][self._slot(frame.seq)]) == frame.seq
+
+    def copy(self, seq=None):
+        """
+        Copie cohérente d'une image de l'anneau
+
+        Returns:
+            RingFrame dont l'image est une copie, ou None (voir read())
+        """
+        frame = self.read(seq)
+        if frame is None:
+            return None
+        frame.frame = frame.frame.copy()
+        return frame if self.is_current(frame) else None
+
+    def wait_for_frame(self, after_seq=0, timeout=None, poll_interval=0.002):
+        """
+        Attend une image de séquence supérieure à after_seq et retourne la dernière
+
+        Les images intermédiaires (seq - after_seq - 1) sont perdues pour ce
+        lecteur, comme avec FrameSubscriber.
+
+        Returns:
+            RingFrame ou None en cas de timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.seq > after_seq:
+                frame = self.read()
+                if frame is not None:
+                    return frame
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(poll_interval)
+
+    def get_status(self):
+        """Retourne le nom du segment, sa capacité et la dernière séquence"""
+        return {
+            "name": self.name,
+            "slots": self.slots,
+            "max_shape": list(self.max_shape),
+            "seq": self.seq,
+        }
+
+    def close(self):
+        """Détache l'anneau de ce processus (et le supprime s'il en est le créateur)"""
+        if self._memory is None:
+            return
+        # Les vues doivent disparaître avant de fermer le segment
+        self._header = self._slot_headers = None
+        self._data = []
+        try:
+            self._memory.close()
+        except BufferError:
+            # Des vues sont encore utilisées (images publiées sur le bus d'images):
+            # le segment restera projeté jusqu'à la sortie du processus
+            pass
+        if self.owner:
+            self._memory.unlink()
+        self._memory = None
@@ -0,0 +1,134 @@
+import threading
+
+import numpy as np
+
+# Bruit des mesures (écart type, en erreur normalisée: 0.02 ≈ 6 px sur une demi-largeur de 320 px)
+MEASUREMENT_NOISE = 0.02
+# Accélérations de la cible dans l'image (écart type, erreur normalisée par s²):
+# position (visage et rotation du drone) puis taille
+ACCELERATION_NOISE = (1.0, 1.0, 0.5)
+INITIAL_VELOCITY_NOISE = 1.0  # Incertitude de la vitesse d'une nouvelle cible (par seconde)
+MAX_PREDICTION = 0.5          # Horizon maximal d'extrapolation (secondes)
+MAX_AGE = 1.0                 # Au-delà, la dernière mesure est trop ancienne: cible perdue
+INNOVATION_SMOOTHING = 0.1    # Lissage de la moyenne de l'innovation normalisée
+
+
+class TargetFilter:
+    """
+    Filtre de Kalman à vitesse constante sur la cible suivie
+
+    L'état contient la position (x, y) et la taille du visage, en erreurs
+    normalisées (TrackingController.measure), et leurs vitesses. Chaque
+    détection corrige l'état à son instant de capture; entre deux détections,
+    predict() extrapole la cible à n'importe quel instant, ce qui permet
+    d'envoyer des commandes à une cadence fixe indépendante de la durée de la
+    détection.
+
+    L'innovation (écart entre la mesure et la prédiction) est conservée pour
+    l'API d'état: son carré normalisé par sa covariance vaut 3 en moyenne
+    quand les bruits du filtre correspondent au mouvement réel de la cible.
+    Les méthodes peuvent être appelées depuis plusieurs threads.
+    """
+
+    def __init__(self, measurement_noise=MEASUREMENT_NOISE, acceleration_noise=ACCELERATION_NOISE,
+                 max_age=MAX_AGE):
+        """
+        Args:
+            measurement_noise: Écart type du bruit des mesures
+            acceleration_noise: Écarts types des accélérations de x, y et de la taille
+            max_age: Âge maximal de la dernière mesure pour prédire la cible (secondes)
+        """
+        self.measurement_noise = measurement_noise
+        self.acceleration_noise = np.asarray(acceleration_noise, dtype=float)
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Oublie la cible"""
+        with self.lock:
+            self.state = None
+            self.covariance = None
+            self.time = None
+            self.innovation = (0.0, 0.0, 0.0)
+            self.normalized_innovation = 0.0
+            self.mean_normalized_innovation = 0.0
+            self.updates = 0
+
+    def update(self, measurement, timestamp):
+        """
+        Corrige l'état avec une mesure
+
+        Args:
+            measurement: (x, y, taille) mesurés
+            timestamp: Instant de capture de l'image mesurée (secondes)
+        """
+        measurement = np.asarray(measurement, dtype=float)
+        with self.lock:
+            if self.state is None or timestamp - self.time > self.max_age:
+                self._initialize(measurement, timestamp)
+                return
+            # Une mesure plus ancienne que l'état est appliquée à l'instant de l'état
+            dt = max(0.0, timestamp - self.time)
+            state, covariance = self._predict(dt)
+
+            innovation = measurement - state[:3]
+            innovation_covariance = covariance[:3, :3] + np.eye(3) * self.measurement_noise ** 2
+            gain = covariance[:, :3] @ np.linalg.inv(innovation_covariance)
+            self.state = state + gain @ innovation
+            self.covariance = covariance - gain @ covariance[:3, :]
+            self.time = max(self.time, timestamp)
+
+            self.innovation = tuple(float(value) for value in innovation)
+            self.normalized_innovation = float(innovation @ np.linalg.solve(innovation_covariance, innovation))
+            self.mean_normalized_innovation += INNOVATION_SMOOTHING * (
+                self.normalized_innovation - self.mean_normalized_innovation)
+            self.updates += 1
+
+    def predict(self, now):
+        """
+        Position et vitesse estimées de la cible à un instant
+
+        Args:
+            now: Instant de la prédiction (secondes, même horloge que les mesures)
+
+        Returns:
+            tuple: ((x, y, taille), (vx, vy, vtaille)), ou None si aucune cible
+                n'a été mesurée depuis max_age secondes
+        """
+        with self.lock:
+            if self.state is None or now - self.time > self.max_age:
+                return None
+            horizon = min(max(0.0, now - self.time), MAX_PREDICTION)
+            position = self.state[:3] + self.state[3:] * horizon
+            return tuple(float(value) for value in position), tuple(float(value) for value in self.state[3:])
+
+    def get_status(self):
+        """Retourne l'état estimé, la dernière innovation et sa moyenne normalisée"""
+        with self.lock:
+            return {
+                "tracking": self.state is not None,
+                "state": [round(float(value), 4) for value in self.state] if self.state is not None else None,
+                "innovation": [round(value, 4) for value in self.innovation],
+                "normalized_innovation": round(self.normalized_innovation, 3),
+                "mean_normalized_innovation": round(self.mean_normalized_innovation, 3),
+                "updates": self.updates,
+            }
+
+    def _initialize(self, measurement, timestamp):
+        self.state = np.concatenate([measurement, np.zeros(3)])
+        self.covariance = np.diag([self.measurement_noise ** 2] * 3 + [INITIAL_VELOCITY_NOISE ** 2] * 3)
+        self.time = timestamp
+        self.innovation = (0.0, 0.0, 0.0)
+        self.normalized_innovation = 0.0
+
+    def _predict(self, dt):
+        transition = np.eye(6)
+        transition[:3, 3:] = np.eye(3) * dt
+        # Accélération blanche: bruit de processus du modèle à vitesse constante
+        variance = self.acceleration_noise ** 2
+        noise = np.zeros((6, 6))
+        noise[:3, :3] = np.diag(variance * dt ** 4 / 4)
+        noise[:3, 3:] = noise[3:, :3] = np.diag(variance * dt ** 3 / 2)
+        noise[3:, 3:] = np.diag(variance * dt ** 2)
+        return transition @ self.state, transition @ self.covariance @ transition.T + noise
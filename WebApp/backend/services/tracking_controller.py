@@ -0,0 +1,244 @@
+import math
+
+# Gains par axe, pour une erreur normalisée (-1 à 1: demi-image ou taille cible)
+# et une commande RC (-100 à 100). Réglés avec benchmarks/bench_tracking_control.py
+DEFAULT_GAINS = {
+    'yaw': {'kp': 90.0, 'ki': 10.0, 'kd': 4.0, 'kf': 20.0},
+    'vertical': {'kp': 90.0, 'ki': 10.0, 'kd': 4.0, 'kf': 20.0},
+    'distance': {'kp': 120.0, 'ki': 20.0, 'kd': 0.0, 'kf': 50.0},
+}
+DERIVATIVE_TIME_CONSTANT = 0.1  # Filtre passe-bas du terme dérivé (secondes)
+VELOCITY_TIME_CONSTANT = 0.2    # Lissage de la vitesse de la cible utilisée par l'anticipation (secondes)
+MAX_TIME_STEP = 1.0             # Au-delà, mesure trop ancienne: pas de dérivée ni d'intégration
+DEADBAND_RELEASE = 0.3          # Une fois sortie de la zone morte, l'erreur est ramenée à cette fraction de la zone
+CAMERA_HORIZONTAL_FOV = 70.0    # Champ horizontal de la caméra du Tello (degrés, 82.6° en diagonale)
+FACE_WIDTH = 16.0               # Largeur moyenne d'un visage (cm)
+
+
+class PidController:
+    """
+    Régulateur PID avec anticipation
+
+    sortie = kp·e + ki·∫e + kd·de/dt (filtré) + kf·anticipation, bornée à ±limit.
+
+    Le terme dérivé est filtré (premier ordre, constante de temps
+    derivative_time): les boîtes des détecteurs tremblent de quelques pixels
+    d'une image à l'autre. L'intégrale n'est pas accumulée quand la sortie est
+    saturée dans le sens de l'erreur et reste bornée (anti-emballement): elle
+    ne doit pas faire dépasser la cible après une longue saturation.
+
+    La zone morte a une hystérésis: la sortie reste nulle tant que l'erreur
+    n'en sort pas, puis la régulation continue jusqu'à DEADBAND_RELEASE fois
+    la zone morte. Sans elle, la cible s'arrêterait au bord de la zone.
+    """
+
+    def __init__(self, kp=0.0, ki=0.0, kd=0.0, kf=0.0, limit=100.0, deadband=0.0,
+                 derivative_time=DERIVATIVE_TIME_CONSTANT):
+        """
+        Args:
+            kp, ki, kd, kf: Gains proportionnel, intégral, dérivé et d'anticipation
+            limit: Valeur absolue maximale de la sortie
+            deadband: Erreur tolérée sans commande (voir DEADBAND_RELEASE)
+            derivative_time: Constante de temps du filtre du terme dérivé (secondes)
+        """
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.kf = kf
+        self.limit = limit
+        self.deadband = deadband
+        self.derivative_time = derivative_time
+        self.reset()
+
+    def reset(self):
+        """Oublie l'historique (intégrale, dernière erreur)"""
+        self.active = False
+        self.integral = 0.0
+        self.derivative = 0.0
+        self.last_error = None
+        self.output = 0.0
+
+    def update(self, error, dt, feed_forward=0.0):
+        """
+        Calcule la commande pour une nouvelle mesure
+
+        Args:
+            error: Erreur mesurée (cible - position)
+            dt: Temps écoulé depuis la mesure précédente (secondes)
+            feed_forward: Entrée d'anticipation (vitesse de la cible)
+
+        Returns:
+            float: Commande bornée à ±limit
+        """
+        threshold = self.deadband * DEADBAND_RELEASE if self.active else self.deadband
+        if self.deadband and abs(error) <= threshold:
+            self.reset()
+            return 0.0
+        self.active = True
+
+        valid_step = self.last_error is not None and 0 < dt <= MAX_TIME_STEP
+        if valid_step and self.kd:
+            raw = (error - self.last_error) / dt
+            alpha = dt / (self.derivative_time + dt)
+            self.derivative += alpha * (raw - self.derivative)
+        elif not valid_step:
+            self.derivative = 0.0
+        self.last_error = error
+
+        unbounded = (self.kp * error + self.ki * self.integral + self.kd * self.derivative
+                     + self.kf * feed_forward)
+        saturated = abs(unbounded) >= self.limit and math.copysign(1, unbounded) == math.copysign(1, error)
+        if valid_step and self.ki and not saturated:
+            self.integral += error * dt
+            integral_limit = self.limit / self.ki
+            self.integral = max(-integral_limit, min(integral_limit, self.integral))
+            unbounded = (self.kp * error + self.ki * self.integral + self.kd * self.derivative
+                         + self.kf * feed_forward)
+
+        self.output = max(-self.limit, min(self.limit, unbounded))
+        return self.output
+
+
+class TrackingController:
+    """
+    Commandes RC pour garder un visage au centre de l'image (et à distance)
+
+    Trois axes indépendants, chacun régulé par un PidController:
+      - yaw: écart horizontal du centre du visage, en demi-largeurs d'image,
+      - vertical: écart vertical, en demi-hauteurs d'image (visage trop bas: descendre),
+      - distance: écart relatif de la largeur du visage à la largeur cible (visage
+        trop petit: avancer), seulement si une largeur cible est donnée.
+    L'anticipation utilise la vitesse de la cible dans l'image, estimée entre
+    deux mesures: un visage qui se déplace est suivi sans retard permanent.
+    """
+
+    def __init__(self, gains=None, max_speeds=None, deadbands=None):
+        """
+        Args:
+            gains: Gains par axe ('yaw', 'vertical', 'distance'), complétant DEFAULT_GAINS
+            max_speeds: Commande maximale par axe (RC 0-100)
+            deadbands: Zone morte par axe, en erreur normalisée
+        """
+        gains = merge_gains(gains)
+        max_speeds = {'yaw': 20, 'vertical': 20, 'distance': 20, **(max_speeds or {})}
+        deadbands = {'yaw': 0.0, 'vertical': 0.0, 'distance': 0.0, **(deadbands or {})}
+        self.axes = {axis: PidController(limit=max_speeds[axis], deadband=deadbands[axis], **gains[axis])
+                     for axis in DEFAULT_GAINS}
+        self.last_time = None
+        self.last_target = None
+        self.velocity = (0.0, 0.0, 0.0)
+
+    def reset(self):
+        """Oublie la cible (nouvelle cible ou cible perdue)"""
+        for controller in self.axes.values():
+            controller.reset()
+        self.last_time = None
+        self.last_target = None
+        self.velocity = (0.0, 0.0, 0.0)
+
+    def configure(self, gains=None, max_speeds=None, deadbands=None):
+        """Met à jour gains, vitesses maximales et zones mortes sans perdre l'état"""
+        for axis, controller in self.axes.items():
+            for name, value in ((gains or {}).get(axis) or {}).items():
+                setattr(controller, name, float(value))
+            if max_speeds and axis in max_speeds:
+                controller.limit = max_speeds[axis]
+            if deadbands and axis in deadbands:
+                controller.deadband = deadbands[axis]
+
+    @staticmethod
+    def measure(box, frame_shape, target_width=None):
+        """
+        Erreurs normalisées d'un visage
+
+        Args:
+            box: Boîte (top, right, bottom, left) en pixels
+            frame_shape: Dimensions de l'image
+            target_width: Largeur cible du visage en fraction de la largeur d'image (None: pas de distance)
+
+        Returns:
+            tuple: (x, y, taille) avec x > 0 à droite du centre, y > 0 sous le centre,
+                taille > 0 si le visage est plus petit que la cible (None sans largeur cible)
+        """
+        top, right, bottom, left = box
+        height, width = frame_shape[:2]
+        x = ((left + right) / 2 - width / 2) / (width / 2)
+        y = ((top + bottom) / 2 - height / 2) / (height / 2)
+        size = None
+        if target_width:
+            size = (target_width - (right - left) / width) / target_width
+        return x, y, size
+
+    def update(self, errors, now, velocity=None):
+        """
+        Calcule la commande RC pour une nouvelle mesure
+
+        Args:
+            errors: (x, y, taille) retournés par measure(), taille None sans maintien de la distance
+            now: Instant de la mesure (secondes, même horloge que les mesures précédentes:
+                time.time() pour l'horodatage des images)
+            velocity: Vitesse de (x, y, taille) par seconde (None: estimée entre deux mesures)
+
+        Returns:
+            tuple: (lr, fb, ud, yaw) entiers
+        """
+        x, y, size = errors
+        # Sans maintien de la distance, l'erreur de taille est estimée nulle pour la vitesse
+        measured = (x, y, size if size is not None else 0.0)
+        dt = now - self.last_time if self.last_time is not None else 0.0
+        if velocity is None:
+            velocity = self._estimate_velocity(measured, dt)
+        self.last_time = now
+        self.last_target = measured
+
+        vx, vy, vsize = velocity
+        yaw = self.axes['yaw'].update(x, dt, vx)
+        # Visage sous le centre (y > 0): descendre
+        up_down = -self.axes['vertical'].update(y, dt, vy)
+        forward = 0.0
+        if size is not None:
+            forward = self.axes['distance'].update(size, dt, vsize)
+        else:
+            self.axes['distance'].reset()
+        return 0, int(round(forward)), int(round(up_down)), int(round(yaw))
+
+    def _estimate_velocity(self, errors, dt):
+        if self.last_target is None or not 0 < dt <= MAX_TIME_STEP:
+            self.velocity = (0.0, 0.0, 0.0)
+            return self.velocity
+        alpha = dt / (VELOCITY_TIME_CONSTANT + dt)
+        self.velocity = tuple(previous + alpha * ((value - last) / dt - previous)
+                              for previous, value, last in zip(self.velocity, errors, self.last_target))
+        return self.velocity
+
+    def get_status(self):
+        """Retourne la dernière commande et l'intégrale de chaque axe"""
+        return {axis: {"output": round(controller.output, 2), "integral": round(controller.integral, 4)}
+                for axis, controller in self.axes.items()}
+
+
+def merge_gains(gains=None):
+    """Gains par axe: DEFAULT_GAINS complétés par ceux fournis"""
+    merged = {axis: dict(values) for axis, values in DEFAULT_GAINS.items()}
+    for axis, values in (gains or {}).items():
+        if axis not in merged:
+            raise ValueError(f"Axe inconnu: '{axis}' (disponibles: {', '.join(merged)})")
+        unknown = set(values) - set(merged[axis])
+        if unknown:
+            raise ValueError(f"Gain inconnu pour l'axe '{axis}': {', '.join(sorted(unknown))}")
+        merged[axis].update({name: float(value) for name, value in values.items()})
+    return merged
+
+
+def face_width_for_distance(distance, fov=CAMERA_HORIZONTAL_FOV):
+    """
+    Largeur approximative d'un visage vu à une distance donnée (caméra sténopé)
+
+    Args:
+        distance: Distance du visage (cm)
+        fov: Champ horizontal de la caméra (degrés)
+
+    Returns:
+        float: Largeur du visage en fraction de la largeur d'image (target_width de measure())
+    """
+    return FACE_WIDTH / (2 * distance * math.tan(math.radians(fov / 2)))
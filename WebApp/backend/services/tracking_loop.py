@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+
+from services.target_filter import TargetFilter
+
+CONTROL_RATE = 30.0  # Cadence des commandes RC (Hz)
+STOP_COMMAND = (0, 0, 0, 0)
+
+logger = logging.getLogger('tracking_loop')
+
+
+class TrackingLoop:
+    """
+    Boucle de commande du suivi à cadence fixe
+
+    Les détections alimentent un TargetFilter (observe, lose) à leur propre
+    rythme; un thread envoie au drone, rate fois par seconde, la commande du
+    TrackingController calculée sur la position de la cible prédite à
+    l'instant de l'envoi. Les commandes restent ainsi régulières même quand
+    une détection dure plusieurs centaines de millisecondes. Sans cible, une
+    seule commande d'arrêt est envoyée.
+    """
+
+    def __init__(self, controller, rate=CONTROL_RATE):
+        """
+        Args:
+            controller: TrackingController utilisé pour calculer les commandes
+            rate: Cadence des commandes (Hz)
+        """
+        self.controller = controller
+        self.filter = TargetFilter()
+        self.rate = rate
+        self.drone_service = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.last_command = STOP_COMMAND
+        self.follow_distance = False  # La dernière mesure contient-elle l'erreur de taille?
+        # Capture → mesure, âge de la mesure utilisée par la dernière commande et période réelle (ms)
+        self.timings = {"latency_ms": 0.0, "age_ms": 0.0, "period_ms": 0.0}
+
+    def start(self, drone_service):
+        """Démarre l'envoi des commandes (sans effet si la boucle tourne déjà)"""
+        if self.is_running():
+            return
+        self.drone_service = drone_service
+        self.filter.reset()
+        self.controller.reset()
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Arrête l'envoi des commandes"""
+        self.stop_event.set()
+        thread, self.thread = self.thread, None
+        if thread is not None and thread is not threading.current_thread() and thread.is_alive():
+            thread.join(timeout=1.0)
+
+    def is_running(self):
+        """Indique si la boucle envoie des commandes"""
+        return self.thread is not None and self.thread.is_alive()
+
+    def observe(self, errors, timestamp):
+        """
+        Transmet une détection de la cible au filtre
+
+        Args:
+            errors: (x, y, taille) retournés par TrackingController.measure()
+            timestamp: Instant de capture de l'image (time.time())
+        """
+        x, y, size = errors
+        # Sans maintien de la distance, la taille n'est pas mesurée: le filtre l'estime nulle
+        self.follow_distance = size is not None
+        self.filter.update((x, y, size if size is not None else 0.0), timestamp)
+        self.timings["latency_ms"] = (time.time() - timestamp) * 1000
+
+    def lose(self):
+        """Signale la perte (ou le changement) de la cible: la boucle arrête le drone"""
+        self.filter.reset()
+        self.controller.reset()
+
+    def command(self, now):
+        """
+        Commande RC pour la cible prédite à un instant
+
+        Args:
+            now: Instant de l'envoi (time.time())
+
+        Returns:
+            tuple: (lr, fb, ud, yaw), STOP_COMMAND sans cible
+        """
+        measured = self.filter.time  # Lu avant la prédiction: la cible peut être perdue entre-temps
+        prediction = self.filter.predict(now)
+        if prediction is None:
+            self.controller.reset()
+            return STOP_COMMAND
+        errors, velocity = prediction
+        if not self.follow_distance:
+            errors = errors[:2] + (None,)
+        self.timings["age_ms"] = (now - measured) * 1000 if measured is not None else 0.0
+        return self.controller.update(errors, now, velocity)
+
+    def get_status(self):
+        """Retourne la cadence, les durées, la dernière commande et l'état du filtre"""
+        return {
+            "running": self.is_running(),
+            "rate": self.rate,
+            **{key: round(value, 1) for key, value in self.timings.items()},
+            "command": list(self.last_command),
+            "filter": self.filter.get_status()
+        }
+
+    def _run(self):
+        logger.info("Démarrage de la boucle de commande du suivi")
+        next_tick = time.monotonic()
+        last_tick = None
+        try:
+            while not self.stop_event.is_set() and self.drone_service.connected:
+                tick = time.monotonic()
+                if last_tick is not None:
+                    self.timings["period_ms"] = (tick - last_tick) * 1000
+                last_tick = tick
+
+                command = self.command(time.time())
+                # Sans cible, une seule commande d'arrêt
+                if command != STOP_COMMAND or self.last_command != STOP_COMMAND:
+                    self.drone_service.drone.send_rc_control(*command)
+                self.last_command = command
+
+                next_tick += 1.0 / self.rate
+                if next_tick < time.monotonic():
+                    next_tick = time.monotonic()  # En retard: ne pas rattraper les envois manqués
+                self.stop_event.wait(next_tick - time.monotonic())
+        except Exception as e:
+            logger.error(f"Erreur dans la boucle de commande du suivi: {e}")
+        finally:
+            if self.last_command != STOP_COMMAND and self.drone_service.connected:
+                self.drone_service.drone.send_rc_control(*STOP_COMMAND)
+            self.last_command = STOP_COMMAND
+            logger.info("Boucle de commande du suivi terminée")
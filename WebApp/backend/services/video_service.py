@@ -1,9 +1,15 @@
+import atexit
 import threading
 import time
 import cv2
 import numpy as np
-from config import VIDEO_WIDTH, VIDEO_HEIGHT
+from config import (VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FRAME_BUFFERS, VIDEO_SHARED_RING_SLOTS,
+                    VIDEO_SHARED_RING_NAME)
 from services.drone_service import DroneService
+from services.frame_bus import FrameBus
+from services.mjpeg_broadcaster import MjpegBroadcaster, mjpeg_part
+from services.frame_sources import create_frame_source
+from services.shared_frame_ring import SharedFrameRing
 
 class VideoService:
     """Service pour gérer le flux vidéo du drone"""
@@ -24,21 +30,70 @@ class VideoService:
             
         self._initialized = True
         self.drone_service = DroneService()
-        self.frame = None
-        self.frame_lock = threading.Lock()
+        self.frame_source = create_frame_source(self.drone_service)
+        self.frame_bus = FrameBus()
+        self.broadcaster = MjpegBroadcaster(self.frame_bus)
+        self._no_signal_part = None
         self._video_thread = None
         self._streaming = False
+        self.shared_ring = None
+        if VIDEO_SHARED_RING_SLOTS:
+            self.enable_shared_ring(VIDEO_SHARED_RING_SLOTS)
+    
+    @property
+    def frame(self):
+        """Dernière image publiée sur le bus (ou None)"""
+        packet = self.frame_bus.latest()
+        return packet.frame if packet is not None else None
+    
+    @frame.setter
+    def frame(self, value):
+        """Publie une image sur le bus (None efface la dernière image)"""
+        if value is None:
+            self.frame_bus.clear()
+        else:
+            self.frame_bus.publish(value)
+    
+    def enable_shared_ring(self, slots, name=VIDEO_SHARED_RING_NAME):
+        """
+        Publie aussi les images dans un anneau en mémoire partagée (flux arrêté uniquement)
+        
+        Les autres processus s'y attachent avec SharedFrameRing.attach(name).
+        """
+        if self._streaming:
+            return False, "Arrêtez le streaming avant d'activer l'anneau d'images partagé"
+        if self.shared_ring is not None:
+            self.shared_ring.close()
+        self.shared_ring = SharedFrameRing.create(slots, (VIDEO_HEIGHT, VIDEO_WIDTH, 3), name=name)
+        atexit.register(self.shared_ring.close)
+        return True, f"Anneau d'images partagé '{self.shared_ring.name}' ({slots} emplacements)"
+    
+    def set_frame_source(self, frame_source):
+        """Remplace la source d'images (flux arrêté uniquement)"""
+        if self._streaming:
+            return False, "Arrêtez le streaming avant de changer de source vidéo"
+        self.frame_source = frame_source
+        return True, f"Source vidéo '{frame_source.name}' sélectionnée"
+    
+    def _is_source_available(self):
+        """Indique si la source d'images courante peut produire des images"""
+        if self.frame_source.requires_drone:
+            return bool(self.drone_service.connected and self.drone_service.drone)
+        return True
     
     def start_video_stream(self):
-        """Démarre le streaming vidéo depuis le drone"""
+        """Démarre le streaming vidéo depuis la source configurée (drone par défaut)"""
         if self._streaming:
             return True, "Streaming vidéo déjà actif"
         
-        if not self.drone_service.connected or not self.drone_service.drone:
+        if not self._is_source_available():
             return False, "Drone non connecté"
         
+        if not self.frame_source.is_available():
+            return False, f"Source vidéo '{self.frame_source.name}' indisponible"
+        
         try:
-            self.drone_service.drone.streamon()
+            self.frame_source.start()
             self._streaming = True
             
             # Démarrer le thread de capture vidéo
@@ -54,54 +109,93 @@ class VideoService:
         if not self._streaming:
             return True, "Streaming vidéo déjà arrêté"
         
+        # Arrêter la boucle de capture même si la source refuse de s'arrêter
+        self._streaming = False
+        
         try:
-            if self.drone_service.connected and self.drone_service.drone:
-                self.drone_service.drone.streamoff()
-            
-            self._streaming = False
+            self.frame_source.stop()
             
             return True, "Streaming vidéo arrêté"
         except Exception as e:
             return False, f"Erreur lors de l'arrêt du streaming: {str(e)}"
     
+    def get_stream_stats(self):
+        """Retourne la séquence du bus d'images et les images perdues par abonné"""
+        stats = self.frame_bus.get_stats()
+        stats["streaming"] = self._streaming
+        stats["source"] = self.frame_source.name
+        stats["mjpeg"] = self.broadcaster.get_stats()
+        stats["shared_ring"] = self.shared_ring.get_status() if self.shared_ring is not None else None
+        return stats
+    
     def _capture_video(self):
         """Capture les images du flux vidéo en arrière-plan"""
-        while self._streaming and self.drone_service.connected:
+        # Tampons préalloués: chaque nouvelle image est redimensionnée directement dans
+        # le tampon suivant puis publiée, sans allocation en régime établi. Avec l'anneau
+        # partagé, ses emplacements servent de tampons: aucune copie supplémentaire
+        ring = self.shared_ring
+        buffers = [np.empty((VIDEO_HEIGHT, VIDEO_WIDTH, 3), dtype=np.uint8)
+                   for _ in range(max(2, VIDEO_FRAME_BUFFERS) if ring is None else 0)]
+        buffer_index = 0
+        last_source_frame = None
+        
+        while self._streaming and self._is_source_available():
             try:
-                current_frame = self.drone_service.drone.get_frame_read().frame
-                if current_frame is not None:
-                    with self.frame_lock:
-                        self.frame = current_frame.copy()
-                        self.frame = cv2.resize(self.frame, (VIDEO_WIDTH, VIDEO_HEIGHT))
+                # La source remplace l'objet frame à chaque image décodée:
+                # un objet identique signifie qu'aucune nouvelle image n'est arrivée
+                current_frame = self.frame_source.frame
+                if current_frame is None or current_frame is last_source_frame:
+                    time.sleep(0.005)
+                    continue
+                last_source_frame = current_frame
+                
+                if ring is not None:
+                    seq, buffer = ring.reserve()
+                else:
+                    buffer = buffers[buffer_index]
+                    buffer_index = (buffer_index + 1) % len(buffers)
+                cv2.resize(current_frame, (VIDEO_WIDTH, VIDEO_HEIGHT), dst=buffer)
+                timestamp = time.time()
+                if ring is not None:
+                    ring.commit(seq, timestamp)
+                self.frame_bus.publish(buffer, timestamp)
             except Exception as e:
                 print(f"Erreur lors de la capture vidéo: {e}")
                 time.sleep(0.1)
     
     def generate_frames(self):
         """Générateur qui produit les images pour le streaming MJPEG"""
-        while True:
-            # Si pas de connexion ou pas d'image, générer une image "Pas de signal"
-            if not self.drone_service.connected or self.frame is None:
-                no_signal = self._create_no_signal_frame()
-                ret, buffer = cv2.imencode('.jpg', no_signal)
-                if ret:
-                    yield (b'--frame\r\n'
-                          b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-                time.sleep(0.5)
-                continue
-            
-            # Sinon, envoyer l'image actuelle
-            with self.frame_lock:
-                if self.frame is None:
-                    time.sleep(0.1)
+        last_seq = 0
+        self.broadcaster.add_viewer()
+        try:
+            while True:
+                # Si pas de connexion ou pas d'image, générer une image "Pas de signal"
+                if not self._is_source_available() or self.frame is None:
+                    no_signal_part = self._get_no_signal_part()
+                    if no_signal_part:
+                        yield no_signal_part
+                    time.sleep(0.5)
                     continue
                 
-                ret, buffer = cv2.imencode('.jpg', self.frame)
-                if not ret:
+                # Sinon, n'envoyer que les nouvelles images, encodées une seule fois pour tous les clients
+                result = self.broadcaster.wait_for_part(last_seq, timeout=0.5)
+                if result is None:
                     continue
-            
-            yield (b'--frame\r\n'
-                  b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+                
+                last_seq, part = result
+                if part is not None:
+                    yield part
+        finally:
+            self.broadcaster.remove_viewer()
+    
+    def _get_no_signal_part(self):
+        """Retourne la partie MJPEG 'Pas de signal', encodée une seule fois"""
+        if self._no_signal_part is None:
+            ret, buffer = cv2.imencode('.jpg', self._create_no_signal_frame())
+            if not ret:
+                return None
+            self._no_signal_part = mjpeg_part(buffer.tobytes())
+        return self._no_signal_part
     
     def _create_no_signal_frame(self):
         """Crée une image 'Pas de signal'"""
@@ -0,0 +1,317 @@
+"""
+Simulateur du protocole SDK Tello en UDP, pour tester le backend sans drone
+
+Le simulateur répond aux commandes texte du SDK (port de commande), envoie les
+paquets d'état au client sur le port 8890 et, après "streamon", un flux H.264
+sur le port 11111, encodé à partir d'une vidéo, d'un dossier d'images ou
+d'images synthétiques.
+
+djitellopy écoute localement sur le port 8889: sur la même machine, le
+simulateur utilise donc un autre port de commande (9889 par défaut).
+
+Usage (depuis WebApp/backend):
+    python -m simulator.tello_simulator --video synthetic
+    TELLO_HOST=127.0.0.1 TELLO_COMMAND_PORT=9889 python app.py
+"""
+import argparse
+import logging
+import socket
+import threading
+import time
+from fractions import Fraction
+
+import cv2
+
+from services.frame_sources import create_frame_source
+
+logger = logging.getLogger('tello_simulator')
+
+VIDEO_WIDTH = 960
+VIDEO_HEIGHT = 720
+VIDEO_PACKET_SIZE = 1460  # Taille des datagrammes vidéo envoyés par le Tello
+
+
+class SimulatedDroneState:
+    """État physique simplifié du drone simulé"""
+
+    def __init__(self):
+        self.flying = False
+        self.height = 0.0        # cm
+        self.yaw = 0.0           # degrés
+        self.battery = 100.0     # %
+        self.flight_time = 0.0   # secondes
+        self.rc = (0, 0, 0, 0)   # lr, fb, ud, yaw
+
+    def step(self, dt):
+        """Fait évoluer l'état pendant dt secondes à partir de la dernière commande rc"""
+        if not self.flying:
+            return
+        lr, fb, ud, yaw = self.rc
+        self.height = max(20.0, self.height + ud * dt)
+        self.yaw = (self.yaw + yaw * dt + 180) % 360 - 180
+        self.flight_time += dt
+        self.battery = max(0.0, self.battery - dt / 30)
+
+    def move_vertical(self, distance):
+        if self.flying:
+            self.height = max(20.0, self.height + distance)
+
+    def rotate(self, angle):
+        self.yaw = (self.yaw + angle + 180) % 360 - 180
+
+    def to_packet(self):
+        """Sérialise l'état au format des paquets d'état du SDK Tello"""
+        lr, fb, ud, _ = self.rc if self.flying else (0, 0, 0, 0)
+        height = int(self.height)
+        return (
+            f"mid:-1;x:0;y:0;z:0;mpry:0,0,0;pitch:0;roll:0;yaw:{int(self.yaw)};"
+            f"vgx:{fb // 10};vgy:{lr // 10};vgz:{-ud // 10};templ:60;temph:63;"
+            f"tof:{height + 10};h:{height};bat:{int(self.battery)};baro:{100 + height / 100:.2f};"
+            f"time:{int(self.flight_time)};agx:0.00;agy:0.00;agz:-1000.00;\r\n"
+        ).encode('ASCII')
+
+
+class TelloSimulator:
+    """Serveur UDP imitant un Tello: commandes, paquets d'état et flux vidéo"""
+
+    def __init__(self, host='127.0.0.1', command_port=9889, state_port=8890, video_port=11111,
+                 state_rate=10.0, video=None, video_fps=30.0, command_latency=0.0):
+        self.host = host
+        self.command_port = command_port
+        self.state_port = state_port
+        self.video_port = video_port
+        self.state_rate = state_rate
+        self.video = video
+        self.video_fps = video_fps
+        self.command_latency = command_latency
+
+        self.state = SimulatedDroneState()
+        self.client_host = None
+        self.streaming = False
+        self.stats = {"commands": 0, "state_packets": 0, "video_frames": 0, "video_bytes": 0}
+
+        self._stop_event = threading.Event()
+        self._command_socket = None
+        self._out_socket = None
+        self._threads = []
+
+    def start(self):
+        """Démarre les threads de commande, d'état et de vidéo"""
+        self._stop_event.clear()
+        self._command_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._command_socket.bind((self.host, self.command_port))
+        self._command_socket.settimeout(0.2)
+        self._out_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        for target in (self._command_loop, self._state_loop, self._video_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Simulateur Tello en écoute sur {self.host}:{self.command_port}")
+
+    def stop(self):
+        """Arrête le simulateur"""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+        for sock in (self._command_socket, self._out_socket):
+            if sock:
+                sock.close()
+
+    def handle_command(self, command):
+        """
+        Traite une commande texte du SDK
+
+        Returns:
+            str: Réponse à renvoyer, ou None (les commandes rc ne sont pas acquittées)
+        """
+        parts = command.strip().split()
+        if not parts:
+            return 'error'
+        name, args = parts[0], parts[1:]
+
+        if name == 'rc':
+            if len(args) == 4:
+                self.state.rc = tuple(int(float(a)) for a in args)
+            return None
+        if name.endswith('?'):
+            return self._query(name)
+        if name in ('command', 'stop', 'emergency', 'speed', 'go', 'curve', 'flip',
+                    'left', 'right', 'forward', 'back', 'port', 'setfps', 'setbitrate',
+                    'setresolution', 'wifi', 'mon', 'moff'):
+            if name == 'emergency':
+                self.state.flying = False
+                self.state.height = 0.0
+            return 'ok'
+        if name == 'takeoff':
+            self.state.flying = True
+            self.state.height = 80.0
+            return 'ok'
+        if name == 'land':
+            self.state.flying = False
+            self.state.height = 0.0
+            self.state.rc = (0, 0, 0, 0)
+            return 'ok'
+        if name in ('up', 'down') and args:
+            self.state.move_vertical(int(args[0]) * (1 if name == 'up' else -1))
+            return 'ok'
+        if name in ('cw', 'ccw') and args:
+            self.state.rotate(int(args[0]) * (1 if name == 'cw' else -1))
+            return 'ok'
+        if name == 'streamon':
+            self.streaming = True
+            return 'ok'
+        if name == 'streamoff':
+            self.streaming = False
+            return 'ok'
+        return 'error'
+
+    def _query(self, name):
+        """Répond aux commandes de lecture (battery?, height?, ...)"""
+        state = self.state
+        answers = {
+            'battery?': f"{int(state.battery)}",
+            'height?': f"{int(state.height) // 10}dm",
+            'time?': f"{int(state.flight_time)}s",
+            'temp?': "60~63C",
+            'speed?': "10.0",
+            'attitude?': f"pitch:0;roll:0;yaw:{int(state.yaw)};",
+            'baro?': f"{100 + state.height / 100:.2f}",
+            'tof?': f"{int(state.height) * 10 + 100}mm",
+            'acceleration?': "agx:0.00;agy:0.00;agz:-1000.00;",
+            'wifi?': "90",
+            'sdk?': "20",
+            'sn?': "0TQSIMULATOR",
+        }
+        return answers.get(name, 'error')
+
+    def _command_loop(self):
+        """Reçoit les commandes et y répond depuis le port de commande"""
+        while not self._stop_event.is_set():
+            try:
+                data, address = self._command_socket.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            self.client_host = address[0]
+            self.stats["commands"] += 1
+            response = self.handle_command(data.decode('utf-8', errors='ignore'))
+            if response is None:
+                continue
+            if self.command_latency:
+                time.sleep(self.command_latency)
+            self._command_socket.sendto(response.encode('utf-8'), address)
+
+    def _state_loop(self):
+        """Envoie les paquets d'état au client à fréquence fixe"""
+        period = 1.0 / self.state_rate
+        last = time.monotonic()
+        while not self._stop_event.wait(period):
+            now = time.monotonic()
+            self.state.step(now - last)
+            last = now
+            if self.client_host:
+                self._out_socket.sendto(self.state.to_packet(), (self.client_host, self.state_port))
+                self.stats["state_packets"] += 1
+
+    def _video_loop(self):
+        """Encode et envoie le flux H.264 tant que le streaming est actif"""
+        encoder = None
+        source = None
+        period = 1.0 / self.video_fps
+        next_time = time.monotonic()
+        while not self._stop_event.is_set():
+            if not (self.streaming and self.client_host and self.video):
+                if source:
+                    source.stop()
+                    source, encoder = None, None
+                self._stop_event.wait(0.1)
+                continue
+
+            if source is None:
+                source = self._create_video_source()
+                encoder = self._create_encoder()
+                next_time = time.monotonic()
+
+            frame = source.frame
+            if frame is not None:
+                self._send_frame(encoder, frame)
+
+            next_time += period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
+            else:
+                next_time = time.monotonic()
+
+        if source:
+            source.stop()
+
+    def _create_video_source(self):
+        """Crée la source d'images à encoder (vidéo, dossier d'images ou synthétique)"""
+        if self.video == 'synthetic':
+            source = create_frame_source(None, 'synthetic', fps=self.video_fps)
+        else:
+            source = create_frame_source(None, 'file', self.video, self.video_fps)
+        source.start()
+        return source
+
+    def _create_encoder(self):
+        """Crée un encodeur H.264 faible latence avec une image clé par seconde"""
+        import av
+        encoder = av.CodecContext.create('libx264', 'w')
+        encoder.width = VIDEO_WIDTH
+        encoder.height = VIDEO_HEIGHT
+        encoder.pix_fmt = 'yuv420p'
+        encoder.time_base = Fraction(1, int(self.video_fps))
+        encoder.framerate = Fraction(int(self.video_fps), 1)
+        encoder.gop_size = int(self.video_fps)
+        encoder.options = {'preset': 'ultrafast', 'tune': 'zerolatency'}
+        return encoder
+
+    def _send_frame(self, encoder, frame):
+        """Encode une image et l'envoie en datagrammes de VIDEO_PACKET_SIZE octets"""
+        import av
+        frame = cv2.resize(frame, (VIDEO_WIDTH, VIDEO_HEIGHT))
+        video_frame = av.VideoFrame.from_ndarray(frame, format='bgr24')
+        video_frame.pts = self.stats["video_frames"]
+        destination = (self.client_host, self.video_port)
+        for packet in encoder.encode(video_frame):
+            data = bytes(packet)
+            for offset in range(0, len(data), VIDEO_PACKET_SIZE):
+                self._out_socket.sendto(data[offset:offset + VIDEO_PACKET_SIZE], destination)
+            self.stats["video_bytes"] += len(data)
+        self.stats["video_frames"] += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1', help='Adresse d\'écoute des commandes')
+    parser.add_argument('--command-port', type=int, default=9889)
+    parser.add_argument('--state-rate', type=float, default=10.0, help='Paquets d\'état par seconde')
+    parser.add_argument('--video', default='synthetic',
+                        help='"synthetic", une vidéo ou un dossier d\'images ("none" pour désactiver)')
+    parser.add_argument('--fps', type=float, default=30.0, help='Cadence du flux vidéo')
+    parser.add_argument('--command-latency', type=float, default=0.0, help='Latence ajoutée aux réponses (s)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    simulator = TelloSimulator(args.host, args.command_port, state_rate=args.state_rate,
+                               video=None if args.video == 'none' else args.video,
+                               video_fps=args.fps, command_latency=args.command_latency)
+    simulator.start()
+    try:
+        while True:
+            time.sleep(5)
+            logger.info(f"Statistiques: {simulator.stats}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import MagicMock
+from models.drone_data import DroneData
+
+STATE = {
+    'pitch': 1, 'roll': -2, 'yaw': 90, 'vgx': 10, 'vgy': -5, 'vgz': 0,
+    'templ': 60, 'temph': 63, 'tof': 110, 'h': 100, 'bat': 87, 'baro': 101.25,
+    'time': 42, 'agx': 1.5, 'agy': -2.0, 'agz': -998.0,
+}
+
+class TestDroneData(unittest.TestCase):
+    """Tests for the DroneData telemetry snapshot"""
+
+    def test_update_from_state_maps_all_fields(self):
+        """Test that every Tello state field is exposed in the snapshot"""
+        # Arrange
+        data = DroneData()
+
+        # Act
+        updated = data.update_from_state(STATE, timestamp=123.0)
+        result = data.to_dict()
+
+        # Assert
+        self.assertTrue(updated)
+        self.assertEqual(result['battery'], 87)
+        self.assertEqual(result['temperature'], 61.5)
+        self.assertEqual(result['flight_time'], 42)
+        self.assertEqual(result['height'], 100)
+        self.assertEqual(result['speed'], 10)
+        self.assertEqual((result['pitch'], result['roll'], result['yaw']), (1, -2, 90))
+        self.assertEqual((result['speed_x'], result['speed_y'], result['speed_z']), (10, -5, 0))
+        self.assertEqual((result['acceleration_x'], result['acceleration_y'], result['acceleration_z']),
+                         (1.5, -2.0, -998.0))
+        self.assertAlmostEqual(result['barometer'], 10125.0)
+        self.assertEqual(result['tof'], 110)
+        self.assertEqual(result['timestamp'], 123.0)
+        self.assertEqual(data.updates, 1)
+
+    def test_snapshot_is_replaced_not_mutated(self):
+        """Test that readers keep a consistent copy across updates"""
+        # Arrange
+        data = DroneData()
+        data.update_from_state(STATE)
+        before = data.to_dict()
+
+        # Act
+        data.update_from_state(dict(STATE, bat=50))
+
+        # Assert
+        self.assertEqual(before['battery'], 87)
+        self.assertEqual(data.get('battery'), 50)
+
+    def test_empty_state_is_ignored(self):
+        """Test that an empty packet (before the first state) keeps the defaults"""
+        # Arrange
+        data = DroneData()
+
+        # Act
+        updated = data.update_from_state({})
+
+        # Assert
+        self.assertFalse(updated)
+        self.assertEqual(data.get('battery'), 0)
+        self.assertIsNone(data.get('timestamp'))
+
+    def test_update_from_drone_reads_current_state(self):
+        """Test that update_from_drone uses the drone's last state packet"""
+        # Arrange
+        data = DroneData()
+        drone = MagicMock()
+        drone.get_current_state.return_value = STATE
+
+        # Act
+        data.update_from_drone(drone)
+
+        # Assert
+        self.assertEqual(data.get('yaw'), 90)
+        drone.get_battery.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -213,31 +213,31 @@ class TestDroneService(unittest.TestCase):
         self.assertTrue("error" in message.lower() or "erreur" in message.lower())
 
     def test_update_drone_data(self):
-        """Test updating drone data"""
+        """Test that drone data is updated once per received state packet"""
         # Arrange
         self.service.connected = True
         self.service.drone = self.mock_tello.return_value
+        first_state = {'bat': 80, 'h': 50}
+        second_state = {'bat': 79, 'h': 60}
+        # Same packet polled twice, then a new one
+        self.service.drone.get_current_state.side_effect = [first_state, first_state, second_state]
 
-        # Mock drone methods for data
-        self.service.drone.get_battery.return_value = 80
-        self.service.drone.get_temperature.return_value = 25
-        self.service.drone.get_flight_time.return_value = 120
-        self.service.drone.get_height.return_value = 50
-        self.service.drone.get_speed_x.return_value = 10
-
-        # Create mock for drone_data
         mock_drone_data = MagicMock()
-        mock_drone_data.update_from_drone.return_value = True
         self.service.drone_data = mock_drone_data
 
+        polls = []
+        def stop_after_three_polls(_):
+            polls.append(1)
+            if len(polls) == 3:
+                self.service.connected = False
+
         # Act
-        with patch('services.drone_service.time.sleep', return_value=None) as mock_sleep:
-            # Mock threading by calling method directly
-            # We'll just test one iteration
+        with patch('services.drone_service.time.sleep', side_effect=stop_after_three_polls):
             self.service._update_drone_data()
 
         # Assert
-        mock_drone_data.update_from_drone.assert_called_once_with(self.service.drone)
+        mock_drone_data.update_from_state.assert_has_calls([call(first_state), call(second_state)])
+        self.assertEqual(mock_drone_data.update_from_state.call_count, 2)
 
     def test_get_drone_data(self):
         """Test getting drone data"""
@@ -0,0 +1,96 @@
+import unittest
+import json
+import threading
+from services.event_hub import EventHub, sse_event
+
+class TestEventHub(unittest.TestCase):
+    """Tests for the server-sent events hub"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        EventHub._instance = None
+        self.hub = EventHub()
+
+    def test_new_client_receives_current_state(self):
+        """Test that a client first receives the latest state of each topic"""
+        # Arrange
+        self.hub.publish('connection', {"connected": True})
+        self.hub.publish('telemetry', {"battery": 90, "height": 0}, merge=True)
+        self.hub.publish('telemetry', {"height": 50}, merge=True)
+
+        # Act
+        client = self.hub.subscribe()
+        events = dict(client.next_events(timeout=0))
+
+        # Assert
+        self.assertEqual(events['connection'], {"connected": True})
+        self.assertEqual(events['telemetry'], {"battery": 90, "height": 50})
+
+    def test_slow_client_gets_latest_state_only(self):
+        """Test that pending events of the same topic are coalesced"""
+        # Arrange
+        client = self.hub.subscribe()
+
+        # Act
+        for height in range(100):
+            self.hub.publish('telemetry', {"height": height}, merge=True)
+        self.hub.publish('telemetry', {"battery": 42}, merge=True)
+        for count in range(10):
+            self.hub.publish('detections', {"count": count})
+        events = client.next_events(timeout=0)
+
+        # Assert
+        self.assertEqual(events, [('telemetry', {"height": 99, "battery": 42}),
+                                  ('detections', {"count": 9})])
+        self.assertEqual(client.get_stats(), {"sent": 2, "coalesced": 109})
+
+    def test_next_events_times_out_and_close_wakes_waiter(self):
+        """Test the empty result on timeout and after close"""
+        # Arrange
+        client = self.hub.subscribe()
+        result = {}
+
+        # Act
+        timed_out = client.next_events(timeout=0.01)
+        waiter = threading.Thread(target=lambda: result.update(events=client.next_events(timeout=5)))
+        waiter.start()
+        client.close()
+        waiter.join(timeout=1.0)
+
+        # Assert
+        self.assertEqual(timed_out, [])
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(result['events'], [])
+        self.assertEqual(self.hub.get_stats()['clients'], [])
+
+    def test_stream_formats_events_and_unsubscribes(self):
+        """Test the text/event-stream output and cleanup when the client leaves"""
+        # Arrange
+        self.hub.publish('connection', {"connected": False})
+        stream = self.hub.stream(keepalive=0.01)
+
+        # Act
+        retry = next(stream)
+        first = next(stream)
+        keepalive = next(stream)
+        clients_while_open = len(self.hub.get_stats()['clients'])
+        stream.close()
+
+        # Assert
+        self.assertEqual(retry, "retry: 2000\n\n")
+        self.assertEqual(first, 'event: connection\ndata: {"connected": false}\n\n')
+        self.assertEqual(keepalive, ": keepalive\n\n")
+        self.assertEqual(clients_while_open, 1)
+        self.assertEqual(self.hub.get_stats()['clients'], [])
+
+    def test_sse_event_serializes_non_json_values(self):
+        """Test that values such as datetimes do not break the stream"""
+        # Act
+        event = sse_event('detections', {"value": object})
+
+        # Assert
+        payload = json.loads(event.split("data: ", 1)[1])
+        self.assertIn("object", payload["value"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import numpy as np
+from unittest.mock import patch, MagicMock
+from services.face_detectors import (FaceDetector, HaarDetector, HogDetector, YuNetDetector, create_detector,
+                                     DETECTOR_BACKENDS)
+
+class TestFaceDetectors(unittest.TestCase):
+    """Tests for the pluggable face detector backends"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.image = np.zeros((120, 160, 3), dtype=np.uint8)
+        self.image[..., 2] = 255  # Red in BGR
+
+    def test_haar_boxes_use_face_recognition_order(self):
+        """Test the conversion of (x, y, w, h) rectangles to (top, right, bottom, left)"""
+        # Arrange
+        cascade = MagicMock()
+        cascade.detectMultiScale.return_value = [(10, 20, 30, 40)]
+        detector = HaarDetector(cascade)
+
+        # Act
+        boxes = detector.detect(self.image, min_size=25)
+
+        # Assert
+        self.assertEqual(boxes, [(20, 40, 60, 10)])
+        self.assertEqual(cascade.detectMultiScale.call_args[1]['minSize'], (25, 25))
+        self.assertEqual(cascade.detectMultiScale.call_args[0][0].ndim, 2)
+
+    @patch('services.face_detectors.face_recognition')
+    def test_hog_receives_rgb_and_filters_small_faces(self, mock_fr):
+        """Test the HOG backend input conversion and minimum face size"""
+        # Arrange
+        mock_fr.face_locations.return_value = [(0, 50, 50, 0), (0, 10, 10, 0)]
+
+        # Act
+        boxes = HogDetector().detect(self.image, min_size=20)
+
+        # Assert
+        rgb = mock_fr.face_locations.call_args[0][0]
+        self.assertEqual(tuple(rgb[0, 0]), (255, 0, 0))
+        self.assertEqual(mock_fr.face_locations.call_args[1]['model'], 'hog')
+        self.assertEqual(boxes, [(0, 50, 50, 0)])
+
+    @patch('services.face_detectors.face_recognition')
+    def test_face_size_band(self, mock_fr):
+        """Test the maximum face size passed to the cascade and applied to other backends"""
+        # Arrange
+        cascade = MagicMock()
+        cascade.detectMultiScale.return_value = []
+        mock_fr.face_locations.return_value = [(0, 50, 50, 0), (0, 100, 100, 0)]
+
+        # Act
+        HaarDetector(cascade).detect(self.image, min_size=30, max_size=60)
+        boxes = HogDetector().detect(self.image, min_size=30, max_size=60)
+
+        # Assert
+        self.assertEqual(cascade.detectMultiScale.call_args[1]['maxSize'], (60, 60))
+        self.assertEqual(boxes, [(0, 50, 50, 0)])
+
+    def test_detector_without_detect_cannot_be_created(self):
+        """Test that a detector missing detect() fails at creation"""
+        # Arrange
+        class NoDetectDetector(FaceDetector):
+            name = 'none'
+
+        # Act / Assert
+        with self.assertRaises(TypeError):
+            NoDetectDetector()
+
+    def test_create_detector(self):
+        """Test the creation of detectors by name"""
+        # Act & Assert
+        self.assertEqual(set(DETECTOR_BACKENDS), {'hog', 'cnn', 'haar', 'yunet'})
+        self.assertIsInstance(create_detector('haar'), HaarDetector)
+        with self.assertRaises(ValueError):
+            create_detector('unknown')
+
+    def test_yunet_without_model_is_unavailable(self):
+        """Test that a missing YuNet model is reported as unavailable"""
+        # Act & Assert
+        with self.assertRaises(RuntimeError):
+            YuNetDetector(model_path='/nonexistent/yunet.onnx')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+from unittest.mock import patch
+from services.face_encoder import FaceEncoder
+
+class TestFaceEncoder(unittest.TestCase):
+    """Tests for the face encoding options"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.frame[..., 0] = 255  # Blue in BGR
+        self.small_frame = np.zeros((120, 160, 3), dtype=np.uint8)
+
+    @patch('services.face_encoder.face_recognition')
+    def test_reduced_frame_encoding_forwards_options(self, mock_fr):
+        """Test the encoding on the reduced frame with the jitters and landmark model"""
+        # Arrange
+        mock_fr.face_encodings.return_value = [np.zeros(128)]
+
+        # Act
+        encodings = FaceEncoder(num_jitters=2, landmark_model='large').encode(
+            self.frame, self.small_frame, [(10, 30, 30, 10)], 0.25)
+
+        # Assert
+        self.assertEqual(len(encodings), 1)
+        image, locations, num_jitters, model = mock_fr.face_encodings.call_args[0]
+        self.assertEqual(image.shape, (120, 160, 3))
+        self.assertEqual((locations, num_jitters, model), ([(10, 30, 30, 10)], 2, 'large'))
+
+    @patch('services.face_encoder.dlib')
+    @patch('services.face_encoder.face_recognition_api')
+    def test_full_resolution_crops_are_encoded_in_one_batch(self, mock_api, mock_dlib):
+        """Test that each face is cropped from the original frame and all crops are encoded together"""
+        # Arrange
+        mock_api.face_encoder.compute_face_descriptor.side_effect = \
+            lambda crops, shapes, num_jitters: [[np.full(128, index)] for index in range(len(crops))]
+
+        # Act
+        encodings = FaceEncoder(full_resolution=True).encode(
+            self.frame, self.small_frame, [(10, 30, 30, 10), (0, 160, 20, 140)], 0.25)
+
+        # Assert
+        crops, shapes, num_jitters = mock_api.face_encoder.compute_face_descriptor.call_args[0]
+        self.assertEqual(mock_api.face_encoder.compute_face_descriptor.call_count, 1)
+        # 80 px faces with a 40 px margin, clipped to the frame borders
+        self.assertEqual([crop.shape for crop in crops], [(160, 160, 3), (120, 120, 3)])
+        self.assertEqual(int(crops[0][0, 0, 2]), 255)  # Converted to RGB
+        self.assertEqual(mock_api.pose_predictor_5_point.call_count, 2)
+        # Face box relative to its crop, as (left, top, right, bottom)
+        self.assertEqual(mock_dlib.rectangle.call_args_list[0][0], (40, 40, 120, 120))
+        self.assertEqual(len(shapes), 2)
+        self.assertEqual(num_jitters, 1)
+        self.assertEqual([int(encoding[0]) for encoding in encodings], [0, 1])
+
+    @patch('services.face_encoder.face_recognition')
+    def test_gallery_photo_uses_the_same_options(self, mock_fr):
+        """Test that a gallery photo is encoded with the jitters and landmark model of live faces"""
+        # Arrange
+        mock_fr.face_encodings.side_effect = [[np.ones(128)], []]
+        encoder = FaceEncoder(num_jitters=2, landmark_model='large')
+        image = np.zeros((300, 300, 3), dtype=np.uint8)
+
+        # Act
+        encoding = encoder.encode_image(image)
+        no_face = encoder.encode_image(image)
+
+        # Assert
+        self.assertEqual(mock_fr.face_encodings.call_args[0][1:], (None, 2, 'large'))
+        np.testing.assert_array_equal(encoding, np.ones(128))
+        self.assertIsNone(no_face)
+        self.assertEqual(encoder.cache_key, 'large/2')
+
+    def test_invalid_options_are_rejected(self):
+        """Test the validation of the landmark model and jitter count"""
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            FaceEncoder(landmark_model='medium')
+        with self.assertRaises(ValueError):
+            FaceEncoder(num_jitters=0)
+
+if __name__ == '__main__':
+    unittest.main()
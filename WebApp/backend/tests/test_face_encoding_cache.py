@@ -0,0 +1,130 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+from services.face_encoding_cache import FaceEncodingCache, MISSING
+
+class TestFaceEncodingCache(unittest.TestCase):
+    """Tests for the on-disk face encoding cache"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.test_dir = tempfile.mkdtemp()
+        self.encoding = np.arange(128, dtype=np.float32)
+        self.write('alice_1.jpg', b'alice photo')
+        self.write('bob_1.jpg', b'bob photo')
+
+    def tearDown(self):
+        """Clean up after each test"""
+        shutil.rmtree(self.test_dir)
+
+    def write(self, filename, content):
+        with open(os.path.join(self.test_dir, filename), 'wb') as f:
+            f.write(content)
+
+    def first_pass(self):
+        """Encode both photos once and save the cache"""
+        cache = FaceEncodingCache(self.test_dir)
+        cache.load()
+        self.assertIs(cache.lookup('alice_1.jpg'), MISSING)
+        cache.store('alice_1.jpg', self.encoding)
+        self.assertIs(cache.lookup('bob_1.jpg'), MISSING)
+        cache.store('bob_1.jpg', None)
+        cache.save()
+
+    def test_unchanged_photos_are_reused(self):
+        """Test that a second pass encodes nothing"""
+        # Arrange
+        self.first_pass()
+        cache = FaceEncodingCache(self.test_dir)
+
+        # Act
+        cache.load()
+        alice = cache.lookup('alice_1.jpg')
+        bob = cache.lookup('bob_1.jpg')
+
+        # Assert
+        np.testing.assert_array_equal(alice, self.encoding)
+        self.assertIsNone(bob)
+        self.assertEqual((cache.hits, cache.misses), (2, 0))
+
+    def test_touched_or_renamed_photo_is_matched_by_content(self):
+        """Test that the content hash avoids re-encoding a known image"""
+        # Arrange
+        self.first_pass()
+        os.utime(os.path.join(self.test_dir, 'alice_1.jpg'), ns=(1, 1))
+        shutil.copy(os.path.join(self.test_dir, 'alice_1.jpg'), os.path.join(self.test_dir, 'alice_2.jpg'))
+        cache = FaceEncodingCache(self.test_dir)
+
+        # Act
+        cache.load()
+        touched = cache.lookup('alice_1.jpg')
+        copied = cache.lookup('alice_2.jpg')
+
+        # Assert
+        np.testing.assert_array_equal(touched, self.encoding)
+        np.testing.assert_array_equal(copied, self.encoding)
+        self.assertEqual(cache.misses, 0)
+
+    def test_modified_photo_is_encoded_again(self):
+        """Test that a changed image is reported as missing"""
+        # Arrange
+        self.first_pass()
+        self.write('alice_1.jpg', b'another alice photo')
+        cache = FaceEncodingCache(self.test_dir)
+
+        # Act
+        cache.load()
+        result = cache.lookup('alice_1.jpg')
+
+        # Assert
+        self.assertIs(result, MISSING)
+
+    def test_deleted_photos_are_pruned(self):
+        """Test that entries of removed photos are dropped on save"""
+        # Arrange
+        self.first_pass()
+        os.remove(os.path.join(self.test_dir, 'bob_1.jpg'))
+        cache = FaceEncodingCache(self.test_dir)
+        cache.load()
+        cache.lookup('alice_1.jpg')
+
+        # Act
+        cache.save()
+        cache.load()
+
+        # Assert
+        with np.load(cache.path) as data:
+            self.assertEqual(data['names'].tolist(), ['alice_1.jpg'])
+
+    def test_other_encoder_settings_invalidate_the_cache(self):
+        """Test that encodings made with other landmark or jitter settings are not reused"""
+        # Arrange
+        self.first_pass()
+        same = FaceEncodingCache(self.test_dir, encoder_key='small/1')
+        other = FaceEncodingCache(self.test_dir, encoder_key='large/1')
+
+        # Act
+        same.load()
+        other.load()
+
+        # Assert
+        np.testing.assert_array_equal(same.lookup('alice_1.jpg'), self.encoding)
+        self.assertIs(other.lookup('alice_1.jpg'), MISSING)
+        self.assertIs(other.lookup('bob_1.jpg'), MISSING)
+
+    def test_corrupt_cache_is_ignored(self):
+        """Test that an unreadable cache file triggers a rebuild"""
+        # Arrange
+        self.write('.face_encodings.npz', b'not a zip file')
+        cache = FaceEncodingCache(self.test_dir)
+
+        # Act
+        cache.load()
+
+        # Assert
+        self.assertIs(cache.lookup('alice_1.jpg'), MISSING)
+
+if __name__ == '__main__':
+    unittest.main()
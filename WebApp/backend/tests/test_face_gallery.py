@@ -0,0 +1,146 @@
+import unittest
+import numpy as np
+import face_recognition
+from services.face_gallery import FaceGallery
+
+class TestFaceGallery(unittest.TestCase):
+    """Tests for the FaceGallery matrix matching"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        rng = np.random.default_rng(0)
+        self.known = rng.normal(0, 0.1, (20, 128))
+        self.names = [f"person{i}" for i in range(20)]
+        self.gallery = FaceGallery(self.known, self.names)
+
+    def test_encodings_are_contiguous_float32(self):
+        """Test the storage layout of the known encodings"""
+        # Assert
+        self.assertEqual(self.gallery.encodings.dtype, np.float32)
+        self.assertEqual(self.gallery.encodings.shape, (20, 128))
+        self.assertTrue(self.gallery.encodings.flags['C_CONTIGUOUS'])
+
+    def test_distances_match_face_recognition(self):
+        """Test that the batched distances equal face_recognition.face_distance"""
+        # Arrange
+        faces = self.known[:3] + 0.01
+
+        # Act
+        distances = self.gallery.distances(faces)
+
+        # Assert
+        self.assertEqual(distances.shape, (3, 20))
+        for row, face in zip(distances, faces):
+            np.testing.assert_allclose(row, face_recognition.face_distance(self.known, face), atol=1e-4)
+
+    def test_match_returns_nearest_name_within_distance(self):
+        """Test the nearest match and the rejection of distant faces"""
+        # Arrange
+        faces = np.stack([self.known[4] + 0.001, np.full(128, 5.0)])
+
+        # Act
+        matches = self.gallery.match(faces, max_distance=0.6)
+
+        # Assert
+        self.assertEqual(matches[0][0], "person4")
+        self.assertLess(matches[0][1], 0.05)
+        self.assertIsNone(matches[1][0])
+        self.assertGreater(matches[1][1], 0.6)
+
+    def test_match_with_empty_inputs(self):
+        """Test matching without faces or without known faces"""
+        # Act & Assert
+        self.assertEqual(self.gallery.match([]), [])
+        self.assertEqual(FaceGallery().match([np.zeros(128)]), [(None, None)])
+
+    def test_mismatched_names_are_rejected(self):
+        """Test that encodings and names must have the same length"""
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            FaceGallery(self.known, self.names[:-1])
+
+    def test_with_face_replaces_row_from_same_source(self):
+        """Test that adding a photo twice keeps a single row for it"""
+        # Arrange
+        gallery = FaceGallery(self.known[:2], self.names[:2], ['a.jpg', 'b.jpg'])
+
+        # Act
+        updated = gallery.with_face(self.known[5], 'person5', 'b.jpg')
+
+        # Assert
+        self.assertEqual(len(gallery), 2)
+        self.assertEqual(updated.names, ['person0', 'person5'])
+        self.assertEqual(updated.sources, ['a.jpg', 'b.jpg'])
+        self.assertEqual(updated.match([self.known[5]])[0][0], 'person5')
+
+    def test_without_removes_person_and_sources(self):
+        """Test removing rows by name and by photo file"""
+        # Arrange
+        gallery = FaceGallery(self.known[:3], ['alice', 'bob', 'bob'], ['a.jpg', 'b1.jpg', 'b2.jpg'])
+
+        # Act
+        without_bob = gallery.without(name='bob')
+        without_photo = gallery.without(sources=['b1.jpg'])
+
+        # Assert
+        self.assertEqual(without_bob.names, ['alice'])
+        self.assertEqual(without_photo.sources, ['a.jpg', 'b2.jpg'])
+        self.assertIs(gallery.without(name='carol'), gallery)
+
+    def test_photos_are_grouped_by_person(self):
+        """Test the per-person identities and their centroids"""
+        # Arrange
+        gallery = FaceGallery(self.known[:3], ['alice', 'bob', 'alice'])
+
+        # Assert
+        self.assertEqual(gallery.people, ['alice', 'bob'])
+        np.testing.assert_allclose(gallery.centroids[0], (self.known[0] + self.known[2]) / 2, atol=1e-6)
+        np.testing.assert_allclose(gallery.centroids[1], self.known[1], atol=1e-6)
+
+    def test_shortlist_matches_exhaustive_search(self):
+        """Test that refining the centroid shortlist finds the same person as comparing all persons"""
+        # Arrange
+        rng = np.random.default_rng(1)
+        centers = rng.normal(0, 0.1, (50, 128))
+        photos = np.repeat(centers, 4, axis=0) + rng.normal(0, 0.02, (200, 128))
+        gallery = FaceGallery(photos, [f"person{i // 4}" for i in range(200)])
+        faces = centers[:10] + rng.normal(0, 0.02, (10, 128))
+
+        # Act
+        shortlisted = gallery.match(faces, max_distance=10)
+        exhaustive = gallery.match(faces, max_distance=10, candidates=50)
+
+        # Assert
+        self.assertEqual([name for name, _ in shortlisted], [name for name, _ in exhaustive])
+        self.assertEqual([name for name, _ in shortlisted], [f"person{i}" for i in range(10)])
+        np.testing.assert_allclose([d for _, d in shortlisted], [d for _, d in exhaustive], atol=1e-5)
+
+    def test_person_distance_averages_nearest_photos(self):
+        """Test that a single close outlier photo does not decide the identity"""
+        # Arrange
+        face = self.known[0]
+        photos = [face + 0.03, face + 0.03, face + 0.03, face + 0.02, self.known[5], self.known[6]]
+        gallery = FaceGallery(photos, ['bob'] * 3 + ['alice'] * 3)
+
+        # Act
+        [(name, distance)] = gallery.match([face], max_distance=10)
+
+        # Assert
+        self.assertEqual(name, 'bob')
+        self.assertAlmostEqual(distance, 0.03 * np.sqrt(128), places=4)
+
+    def test_per_person_thresholds(self):
+        """Test that a person's own threshold overrides the default distance"""
+        # Arrange
+        faces = [self.known[3] + 0.01]
+
+        # Act
+        strict = self.gallery.match(faces, thresholds={'person3': 0.01})
+        default = self.gallery.match(faces)
+
+        # Assert
+        self.assertIsNone(strict[0][0])
+        self.assertEqual(default[0][0], 'person3')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+from unittest.mock import patch
+import services.face_gallery as face_gallery
+from services.face_gallery import FaceGallery
+from services.face_index import IVFIndex
+
+class TestIVFIndex(unittest.TestCase):
+    """Tests for the approximate nearest-neighbour index"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        rng = np.random.default_rng(0)
+        self.vectors = rng.normal(0, 0.1, (400, 128)).astype(np.float32)
+        self.queries = self.vectors[:20] + rng.normal(0, 0.01, (20, 128))
+        self.index = IVFIndex(self.vectors)
+
+    def exact_search(self, queries, k):
+        distances = np.linalg.norm(queries[:, None, :] - self.vectors[None, :, :], axis=2)
+        return np.argsort(distances, axis=1)[:, :k]
+
+    def test_lists_partition_all_vectors(self):
+        """Test that every vector belongs to exactly one list"""
+        # Assert
+        self.assertEqual(len(self.index.centers), 20)
+        self.assertEqual(sorted(np.concatenate(self.index._lists).tolist()), list(range(400)))
+
+    def test_probing_every_list_is_exact(self):
+        """Test that the search is exact when all lists are probed"""
+        # Arrange
+        self.index.probes = len(self.index.centers)
+
+        # Act
+        results = self.index.search(self.queries, 5)
+
+        # Assert
+        np.testing.assert_array_equal(results, self.exact_search(self.queries, 5))
+
+    def test_search_finds_nearest_vector(self):
+        """Test the recall of the default probe count on near-duplicate queries"""
+        # Act
+        results = self.index.search(self.queries, 1)
+
+        # Assert
+        np.testing.assert_array_equal(results[:, 0], np.arange(20))
+
+    def test_derive_reuses_centers_until_size_doubles(self):
+        """Test that small changes do not retrain the k-means centers"""
+        # Act
+        derived = self.index.derive(self.vectors[:300])
+        grown = self.index.derive(np.concatenate([self.vectors, self.vectors, self.vectors]))
+
+        # Assert
+        self.assertIs(derived.centers, self.index.centers)
+        self.assertIsNot(grown.centers, self.index.centers)
+        self.assertEqual(grown.trained_size, 1200)
+
+class TestFaceGalleryIndex(unittest.TestCase):
+    """Tests for the gallery matching through the index"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        rng = np.random.default_rng(1)
+        self.known = rng.normal(0, 0.1, (300, 128))
+        self.names = [f"person{i}" for i in range(300)]
+        with patch.object(face_gallery, 'ANN_MIN_IDENTITIES', 100):
+            self.gallery = FaceGallery(self.known, self.names)
+
+    def test_index_is_built_above_threshold(self):
+        """Test that only large galleries get an index"""
+        # Assert
+        self.assertIsNotNone(self.gallery.index)
+        self.assertIsNone(FaceGallery(self.known[:10], self.names[:10]).index)
+
+    def test_enrolment_updates_index_without_retraining(self):
+        """Test that a new person is found through the derived index"""
+        # Arrange
+        newcomer = np.full(128, 0.05)
+
+        # Act
+        with patch.object(face_gallery, 'ANN_MIN_IDENTITIES', 100):
+            updated = self.gallery.with_face(newcomer, 'newcomer', 'newcomer_1.jpg')
+        result = updated.match([newcomer + 0.001, self.known[7]])
+
+        # Assert
+        self.assertIs(updated.index.centers, self.gallery.index.centers)
+        self.assertEqual([name for name, _ in result], ['newcomer', 'person7'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,9 +4,22 @@ import shutil
 import tempfile
 import cv2
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from unittest.mock import patch, MagicMock
+from services.face_gallery import FaceGallery
 from services.face_recognition_service import FaceRecognitionService
 
+class FaceRecognitionServiceTestCase(unittest.TestCase):
+    """Base class of the tests using a fresh FaceRecognitionService instance"""
+
+    def setUp(self):
+        """Create a non-singleton service that neither creates folders nor loads the photos"""
+        self.service = object.__new__(FaceRecognitionService)
+        self.service._initialized = False
+        with patch('services.face_recognition_service.os.makedirs'), \
+                patch.object(FaceRecognitionService, 'load_known_faces'):
+            self.service.__init__()
+
 class TestFaceRecognitionService(unittest.TestCase):
     """Tests for the FaceRecognitionService class"""
 
@@ -200,5 +213,324 @@ class TestFaceRecognitionService(unittest.TestCase):
         # Assert
         self.assertEqual(result, test_faces)
 
+class TestFaceRecognitionEnrolment(FaceRecognitionServiceTestCase):
+    """Tests for incremental gallery updates in FaceRecognitionService"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        super().setUp()
+        self.photos_dir = tempfile.mkdtemp()
+        self.service.settings['photos_folder'] = self.photos_dir
+        self.service.encoding_workers = 1
+        self.encodings = {}
+
+        def encode(image_path, encoder):
+            return self.encodings.get(os.path.basename(image_path))
+
+        self.encode_patcher = patch.object(FaceRecognitionService, '_encode_photo', side_effect=encode)
+        self.mock_encode = self.encode_patcher.start()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.encode_patcher.stop()
+        shutil.rmtree(self.photos_dir)
+
+    def write_photo(self, filename, encoding):
+        """Create a photo file whose (mocked) encoding is known"""
+        # Distinct content: the cache reuses the encoding of an identical photo
+        cv2.imwrite(os.path.join(self.photos_dir, filename), np.full((8, 8, 3), 10 * len(self.encodings), dtype=np.uint8))
+        self.encodings[filename] = encoding
+
+    def test_upload_encodes_only_the_new_photo(self):
+        """Test that an upload adds one row without reloading the gallery"""
+        # Arrange
+        self.write_photo('alice_1.jpg', np.full(128, 0.1))
+        self.service.load_known_faces()
+        self.mock_encode.reset_mock()
+        upload = MagicMock()
+        upload.save.side_effect = lambda path: self.write_photo(os.path.basename(path), np.full(128, 0.2))
+
+        # Act
+        with patch.object(self.service, 'load_known_faces') as mock_load:
+            success, _ = self.service.add_person_from_uploaded_file(upload, 'bob')
+
+        # Assert
+        self.assertTrue(success)
+        mock_load.assert_not_called()
+        self.assertEqual(self.mock_encode.call_count, 1)
+        self.assertEqual(self.service.gallery.names, ['alice', 'bob'])
+        self.assertEqual(self.service.gallery.sources, ['alice_1.jpg', 'bob_profile.jpg'])
+
+    def test_upload_without_face_is_rejected(self):
+        """Test that a photo without a face is deleted and not added"""
+        # Arrange
+        upload = MagicMock()
+        upload.save.side_effect = lambda path: self.write_photo(os.path.basename(path), None)
+
+        # Act
+        success, _ = self.service.add_person_from_uploaded_file(upload, 'bob')
+
+        # Assert
+        self.assertFalse(success)
+        self.assertEqual(len(self.service.gallery), 0)
+        self.assertFalse(os.path.exists(os.path.join(self.photos_dir, 'bob_profile.jpg')))
+
+    def test_capture_saves_a_copy_of_the_bus_frame(self):
+        """Test that the captured photo does not keep the reused video buffer"""
+        # Arrange
+        buffer = np.full((480, 640, 3), 7, dtype=np.uint8)
+        self.service.video_service = MagicMock(frame=buffer)
+        self.mock_encode.side_effect = lambda image_path, encoder: np.full(128, 0.3)
+        written = []
+
+        def imwrite(filename, image):
+            written.append(image)
+            buffer[:] = 0  # Next frame captured in the same buffer
+            return True
+
+        # Act
+        with patch('services.face_recognition_service.cv2.imwrite', side_effect=imwrite):
+            success, _ = self.service.capture_face_photo('carol')
+
+        # Assert
+        self.assertTrue(success)
+        self.assertIsNot(written[0], buffer)
+        self.assertTrue((written[0] == 7).all())
+        self.assertEqual(self.service.gallery.names, ['carol'])
+
+    def test_delete_person_drops_rows_and_cache_entries(self):
+        """Test that deleting a person removes only their rows"""
+        # Arrange
+        self.write_photo('alice_1.jpg', np.full(128, 0.1))
+        self.write_photo('bob_1.jpg', np.full(128, 0.2))
+        self.write_photo('bob_2.jpg', np.full(128, 0.3))
+        self.service.load_known_faces()
+        self.mock_encode.reset_mock()
+
+        # Act
+        success, _ = self.service.delete_person('bob')
+        self.service.load_known_faces()
+
+        # Assert
+        self.assertTrue(success)
+        self.assertEqual(self.service.gallery.names, ['alice'])
+        self.mock_encode.assert_not_called()
+
+    def test_enrolment_during_reload_is_kept(self):
+        """Test that photos added or deleted while a reload encodes survive its gallery swap and cache save"""
+        # Arrange: carol is cached, alice is encoded by the reload
+        self.write_photo('carol_1.jpg', np.full(128, 0.3))
+        self.service.load_known_faces()
+        self.write_photo('alice_1.jpg', np.full(128, 0.1))
+        encode = self.mock_encode.side_effect
+
+        def encode_during_changes(image_path, encoder):
+            if os.path.basename(image_path) == 'alice_1.jpg':
+                self.write_photo('dave_1.jpg', np.full(128, 0.4))
+                self.service._add_photo(os.path.join(self.photos_dir, 'dave_1.jpg'))
+                self.service.delete_person('carol')
+            return encode(image_path, encoder)
+
+        self.mock_encode.side_effect = encode_during_changes
+
+        # Act
+        self.service.load_known_faces()
+        names = list(self.service.gallery.names)
+        self.mock_encode.reset_mock()
+        self.mock_encode.side_effect = encode
+        self.service.load_known_faces()
+
+        # Assert
+        self.assertEqual(names, ['alice', 'dave'])
+        self.assertIsNone(self.service.pending_changes)
+        self.mock_encode.assert_not_called()  # dave cached, carol not reloaded
+        self.assertEqual(self.service.gallery.names, ['alice', 'dave'])
+
+    def test_full_load_encodes_in_worker_processes(self):
+        """Test a rebuild spread over a process pool and its progress report"""
+        # Arrange
+        self.encode_patcher.stop()
+        self.write_photo('alice_1.jpg', None)
+        self.write_photo('bob_1.jpg', None)
+        self.service.encoding_workers = 2
+
+        # Act
+        with patch('services.face_recognition_service.ProcessPoolExecutor',
+                   wraps=ProcessPoolExecutor) as mock_pool:
+            self.service.load_known_faces()
+        progress = self.service.get_recognition_status()['loading']
+
+        # Assert
+        mock_pool.assert_called_once_with(max_workers=2)
+        self.assertEqual(progress, {"in_progress": False, "total": 2, "cached": 0, "to_encode": 2,
+                                    "encoded": 2, "workers": 2})
+        self.encode_patcher.start()
+
+class TestFaceRecognitionIdentityTracking(FaceRecognitionServiceTestCase):
+    """Tests for reusing identities of tracked faces across frames"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        super().setUp()
+        self.encoding = np.full(128, 0.1)
+        self.service.gallery = FaceGallery([self.encoding], ['alice'])
+        self.frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+
+    @patch('services.face_encoder.face_recognition')
+    def test_tracked_face_is_encoded_once(self, mock_fr):
+        """Test that a face seen again keeps its identity without a new encoding"""
+        # Arrange
+        self.service.detector = MagicMock()
+        self.service.detector.detect.side_effect = [[(20, 60, 60, 20)], [(22, 62, 62, 22)]]
+        mock_fr.face_encodings.side_effect = lambda image, locations, *options: [self.encoding for _ in locations]
+
+        # Act
+        first = self.service._process_frame(self.frame)
+        second = self.service._process_frame(self.frame)
+        followed = self.service._follow_frame(self.frame)
+
+        # Assert
+        self.assertEqual([d['name'] for d in first + second + followed], ['alice'] * 3)
+        self.assertEqual(mock_fr.face_encodings.call_count, 1)
+        self.assertEqual(first[0]['track_id'], second[0]['track_id'])
+        self.assertEqual(self.service.identity_tracker.get_stats(),
+                         {"tracks": 1, "recognitions": 1, "reused": 2})
+
+    @patch('services.face_encoder.face_recognition')
+    def test_every_face_is_encoded_without_tracking(self, mock_fr):
+        """Test the per-frame encoding when identity tracking is disabled"""
+        # Arrange
+        self.service.settings['track_identities'] = False
+        self.service.detector = MagicMock()
+        self.service.detector.detect.return_value = [(20, 60, 60, 20)]
+        mock_fr.face_encodings.side_effect = lambda image, locations, *options: [self.encoding for _ in locations]
+
+        # Act
+        self.service._process_frame(self.frame)
+        detections = self.service._process_frame(self.frame)
+
+        # Assert
+        self.assertEqual(mock_fr.face_encodings.call_count, 2)
+        self.assertEqual(detections[0]['name'], 'alice')
+        self.assertNotIn('track_id', detections[0])
+
+    def test_detector_is_selected_through_settings(self):
+        """Test switching the face detector at runtime"""
+        # Arrange
+        haar = MagicMock()
+
+        # Act
+        with patch('services.face_recognition_service.create_detector',
+                   side_effect=[haar, ValueError("Détecteur inconnu: 'unknown'")]):
+            success, _ = self.service.update_settings({'detector': 'haar'})
+            unknown_success, message = self.service.update_settings({'detector': 'unknown'})
+
+        # Assert
+        self.assertTrue(success)
+        self.assertIs(self.service.detector, haar)
+        self.assertFalse(unknown_success)
+        self.assertIn('unknown', message)
+        self.assertEqual(self.service.settings['detector'], 'haar')
+
+    def test_encoder_is_rebuilt_through_settings(self):
+        """Test the encoding options and the rejection of an unknown landmark model"""
+        # Act
+        with patch.object(self.service, 'reload_known_faces', return_value=(True, '')) as mock_reload:
+            success, _ = self.service.update_settings({'num_jitters': '3', 'full_resolution_encoding': True})
+            unknown_success, message = self.service.update_settings({'landmark_model': 'medium'})
+            self.service.update_settings({'full_resolution_encoding': False})
+
+        # Assert
+        self.assertTrue(success)
+        mock_reload.assert_called_once()  # Gallery re-encoded with 3 jitters only
+        self.assertEqual(self.service.encoder.num_jitters, 3)
+        self.assertEqual(self.service.settings['num_jitters'], 3)
+        self.assertFalse(unknown_success)
+        self.assertIn('medium', message)
+        self.assertEqual(self.service.settings['landmark_model'], 'small')
+
+class TestFaceRecognitionAutoTracking(FaceRecognitionServiceTestCase):
+    """Tests for the automatic tracking of the recognized person"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        super().setUp()
+        self.service.drone_service = MagicMock()
+        self.service.drone_service.connected = True
+
+    def detection(self, name, left):
+        return {"name": name, "position": {"top": 200, "right": left + 80, "bottom": 280, "left": left}}
+
+    @patch('services.tracking_loop.threading.Thread')
+    def test_detections_feed_the_control_loop(self, mock_thread):
+        """Test that detections are filtered for the control loop, which restarts on a new person"""
+        # Act
+        self.service._handle_tracking([self.detection('alice', 480)], (480, 640, 3), 100.0)
+        alice = self.service.tracking_loop.filter.predict(100.0)
+        self.service._handle_tracking([self.detection('bob', 120)], (480, 640, 3), 100.5)
+        bob = self.service.tracking_loop.filter.get_status()
+        self.service._handle_tracking([], (480, 640, 3), 101.0)
+
+        # Assert
+        mock_thread.return_value.start.assert_called_once()
+        self.assertAlmostEqual(alice[0][0], 0.625)
+        self.assertAlmostEqual(bob['state'][0], -0.5)
+        self.assertEqual(bob['updates'], 0)  # New person: filter restarted
+        self.assertIsNone(self.service.tracking_loop.filter.predict(101.0))
+        self.service.drone_service.drone.send_rc_control.assert_not_called()
+
+class TestFaceRecognitionWorkerProcess(FaceRecognitionServiceTestCase):
+    """Tests for running the recognition pipeline in a worker process"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        super().setUp()
+        self.service.worker = MagicMock()
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def test_worker_detections_update_recent_detections(self):
+        """Test that detections made by the worker process are recorded by the service"""
+        # Arrange
+        self.service.worker.process.return_value = [{"name": "alice"}, {"name": "Inconnu"}]
+
+        # Act
+        detections = self.service._analyze_frame(self.frame)
+
+        # Assert
+        self.assertEqual(len(detections), 2)
+        self.service.worker.sync.assert_called_once_with(self.service.settings, self.service.gallery)
+        self.assertEqual(self.service.worker.process.call_args[0][1], self.service.scheduler.scale)
+        self.assertEqual(self.service.get_recent_detections(), ['alice'])
+
+    def test_dead_worker_falls_back_to_thread(self):
+        """Test that recognition continues in the thread when the worker process dies"""
+        # Arrange
+        worker = self.service.worker
+        worker.process.side_effect = RuntimeError("Processus de reconnaissance arrêté")
+        worker.is_alive.return_value = False
+        self.service.detector = MagicMock()
+        self.service.detector.detect.return_value = []
+
+        # Act
+        detections = self.service._analyze_frame(self.frame)
+
+        # Assert
+        self.assertEqual(detections, [])
+        self.service.detector.detect.assert_called_once()
+        worker.stop.assert_called_once()
+        self.assertIsNone(self.service.worker)
+
+    def test_create_pipeline_leaves_singleton_untouched(self):
+        """Test the standalone instance used inside the worker process"""
+        # Act
+        with patch('services.face_recognition_service.create_detector') as mock_create:
+            pipeline = FaceRecognitionService.create_pipeline(self.service.settings, self.service.gallery)
+
+        # Assert
+        self.assertIsNot(pipeline, FaceRecognitionService._instance)
+        self.assertIs(pipeline.detector, mock_create.return_value)
+        self.assertEqual(pipeline.settings, self.service.settings)
+        self.assertIsNot(pipeline.settings, self.service.settings)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
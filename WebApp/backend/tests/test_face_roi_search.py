@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+from unittest.mock import MagicMock
+from services.face_roi_search import FaceRoiSearch
+
+class TestFaceRoiSearch(unittest.TestCase):
+    """Tests for the face search around the last known position"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.detector = MagicMock()
+        self.search = FaceRoiSearch(padding=1.0, face_size=64)
+
+    def test_first_search_scans_whole_frame(self):
+        """Test the full-frame scan when no face is tracked yet"""
+        # Arrange
+        self.detector.detect.return_value = [(100, 250, 180, 170), (10, 40, 40, 10)]
+
+        # Act
+        boxes = self.search.detect(self.detector, self.frame, 50)
+
+        # Assert
+        self.assertEqual(len(boxes), 2)
+        self.assertIs(self.detector.detect.call_args[0][0], self.frame)
+        self.assertEqual(self.search.last_box, (100, 250, 180, 170))
+        self.assertEqual(self.search.get_stats(), {"mode": "full", "roi_scans": 0, "full_scans": 1})
+
+    def test_next_search_uses_reduced_window(self):
+        """Test the padded and reduced window around the last face and the mapping back to the frame"""
+        # Arrange
+        self.search.last_box = (100, 260, 228, 132)  # 128 px face
+        self.detector.detect.return_value = [(32, 96, 96, 32)]
+
+        # Act
+        boxes = self.search.detect(self.detector, self.frame, 50)
+
+        # Assert
+        window = self.detector.detect.call_args[0][0]
+        # 128 px face with a 128 px margin, clipped to the frame top (356 x 384), reduced by 2
+        self.assertEqual(window.shape, (178, 192, 3))
+        self.assertEqual(self.detector.detect.call_args[1]['min_size'], 25)
+        self.assertEqual(boxes, [(64, 196, 192, 68)])
+        self.assertEqual(self.search.get_stats()["mode"], "roi")
+
+    def test_lost_face_falls_back_to_full_frame(self):
+        """Test the full-frame scan when the face left the window, then the reset when it is lost"""
+        # Arrange
+        self.search.last_box = (100, 260, 228, 132)
+        self.detector.detect.side_effect = [[], [(300, 600, 380, 520)], [], []]
+
+        # Act
+        found = self.search.detect(self.detector, self.frame, 50)
+        self.search.detect(self.detector, self.frame, 50)
+
+        # Assert
+        self.assertEqual(found, [(300, 600, 380, 520)])
+        self.assertIsNone(self.search.last_box)
+        self.assertEqual(self.search.get_stats(), {"mode": "full", "roi_scans": 2, "full_scans": 2})
+
+if __name__ == '__main__':
+    unittest.main()
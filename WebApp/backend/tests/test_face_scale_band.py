@@ -0,0 +1,71 @@
+import unittest
+from services.face_scale_band import FaceScaleBand
+
+class TestFaceScaleBand(unittest.TestCase):
+    """Tests for the face sizes searched from the recent widths"""
+
+    def test_band_from_recent_widths(self):
+        """Test the full range until enough widths, then the band with its margin and the minimum size"""
+        # Arrange
+        scale_band = FaceScaleBand(margin=1.25)
+
+        # Act
+        scale_band.record(80)
+        scale_band.record(100)
+        too_few = scale_band.band(20)
+        scale_band.record(90)
+        band = scale_band.band(20)
+        clamped = scale_band.band(70)
+
+        # Assert
+        self.assertIsNone(too_few)
+        self.assertEqual(band, (64.0, 125.0))
+        self.assertEqual(clamped, (70, 125.0))
+
+    def test_scale_factor_when_stable(self):
+        """Test the wider pyramid step for close widths only"""
+        # Arrange
+        stable = FaceScaleBand()
+        moving = FaceScaleBand()
+        for width in (100, 104, 96):
+            stable.record(width)
+        for width in (60, 100, 80):
+            moving.record(width)
+
+        # Act / Assert
+        self.assertTrue(stable.is_stable())
+        self.assertEqual(stable.scale_factor(1.1), 1.2)
+        self.assertFalse(moving.is_stable())
+        self.assertEqual(moving.scale_factor(1.1), 1.1)
+
+    def test_periodic_full_scan(self):
+        """Test a full scan every full_scan_interval detections while a face is tracked"""
+        # Arrange
+        scale_band = FaceScaleBand(full_scan_interval=3)
+
+        # Act
+        untracked = [scale_band.full_scan_due() for _ in range(5)]
+        scale_band.record(50)
+        tracked = [scale_band.full_scan_due() for _ in range(6)]
+
+        # Assert
+        self.assertEqual(untracked, [False] * 5)
+        self.assertEqual(tracked, [False, False, True, False, False, True])
+        self.assertEqual(scale_band.get_status()['periodic_scans'], 2)
+
+    def test_lost_face_clears_history(self):
+        """Test that a detection without face restores the full range"""
+        # Arrange
+        scale_band = FaceScaleBand()
+        for width in (50, 50, 50):
+            scale_band.record(width)
+
+        # Act
+        scale_band.record(None)
+
+        # Assert
+        self.assertIsNone(scale_band.band(20))
+        self.assertEqual(scale_band.get_status()['widths'], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 import numpy as np
 from unittest.mock import patch, MagicMock, call
 from services.face_tracking_service import FaceTrackingService
+from services.frame_bus import FrameBus
 
 class TestFaceTrackingService(unittest.TestCase):
     """Tests for the FaceTrackingService class"""
@@ -36,8 +37,14 @@ class TestFaceTrackingService(unittest.TestCase):
         self.mock_drone_service.drone = self.mock_drone
         self.mock_drone_service.connected = True
 
-        # Initialize the service with drone service
+        # Mock VideoService with a real frame bus
+        self.frame_bus = FrameBus()
+        self.mock_video_service = MagicMock()
+        self.mock_video_service.frame_bus = self.frame_bus
+
+        # Initialize the service with drone and video services
         self.service.init_drone_service(self.mock_drone_service)
+        self.service.init_video_service(self.mock_video_service)
 
     def tearDown(self):
         """Clean up after each test"""
@@ -94,8 +101,10 @@ class TestFaceTrackingService(unittest.TestCase):
         self.assertTrue(success)
         self.assertTrue("démarré" in message.lower() or "started" in message.lower())
         self.assertTrue(self.service.is_tracking)
-        self.mock_thread.assert_called_once()
-        self.mock_thread.return_value.start.assert_called_once()
+        # Detection thread and fixed-rate control loop
+        self.assertEqual(self.mock_thread.call_count, 2)
+        self.assertEqual(self.mock_thread.call_args_list[1][1]['target'], self.service.control_loop._run)
+        self.assertEqual(self.mock_thread.return_value.start.call_count, 2)
 
     def test_start_face_tracking_already_tracking(self):
         """Test starting face tracking when already tracking"""
@@ -136,6 +145,35 @@ class TestFaceTrackingService(unittest.TestCase):
         self.assertTrue("non connecté" in message.lower() or "not connected" in message.lower())
         self.assertFalse(self.service.is_tracking)
 
+    def test_start_face_tracking_no_video_service(self):
+        """Test starting face tracking without video service"""
+        # Arrange
+        self.service.video_service = None
+
+        # Act
+        success, message = self.service.start_face_tracking()
+
+        # Assert
+        self.assertFalse(success)
+        self.assertIn("vidéo", message.lower())
+        self.assertFalse(self.service.is_tracking)
+
+    def test_tracking_loop_skips_already_processed_frame(self):
+        """Test that the tracking loop never analyses the same frame twice"""
+        # Arrange
+        self.frame_bus.publish(np.zeros((480, 640, 3), dtype=np.uint8))
+        self.mock_cascade.detectMultiScale.return_value = []
+
+        self.service.stop_event = MagicMock()
+        self.service.stop_event.is_set.side_effect = [False, False, True]
+
+        # Act
+        with patch('services.face_tracking_service.time.time', return_value=1000):
+            self.service._tracking_loop()
+
+        # Assert
+        self.mock_cascade.detectMultiScale.assert_called_once()
+
     def test_start_face_tracking_exception(self):
         """Test starting face tracking with exception"""
         # Arrange
@@ -251,6 +289,39 @@ class TestFaceTrackingService(unittest.TestCase):
         # Valid setting should be updated
         self.assertEqual(self.service.tracking_settings['rotation_speed'], 30)
 
+    def test_update_settings_switches_detector(self):
+        """Test that the tracking loop uses the detector chosen in the settings"""
+        # Arrange
+        test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        mock_detector = MagicMock()
+        mock_detector.detect.return_value = [(100, 300, 300, 100)]  # (top, right, bottom, left)
+
+        # Act
+        with patch('services.face_tracking_service.create_detector', return_value=mock_detector) as mock_create:
+            success, _ = self.service.update_settings({'detector': 'hog'})
+        faces = self.service._detect_faces(test_frame)
+
+        # Assert
+        self.assertTrue(success)
+        mock_create.assert_called_once_with('hog')
+        self.assertEqual(faces, [(100, 300, 300, 100)])
+        self.mock_cascade.detectMultiScale.assert_not_called()
+
+    def test_update_settings_pid_gains(self):
+        """Test partial PID gains merged into the current ones and rejected when unknown"""
+        # Act
+        success, _ = self.service.update_settings({'pid_gains': {'yaw': {'kp': 60}}})
+        failure, message = self.service.update_settings({'pid_gains': {'roll': {'kp': 1}}})
+
+        # Assert
+        self.assertTrue(success)
+        self.assertEqual(self.service.tracking_settings['pid_gains']['yaw']['kp'], 60.0)
+        self.assertEqual(self.service.tracking_settings['pid_gains']['yaw']['ki'], 10.0)
+        self.assertEqual(self.service.controller.axes['yaw'].kp, 60.0)
+        self.assertFalse(failure)
+        self.assertIn('roll', message)
+        self.assertEqual(self.service.tracking_settings['pid_gains']['yaw']['kp'], 60.0)
+
     def test_get_status(self):
         """Test getting face tracking status"""
         # Arrange
@@ -271,7 +342,7 @@ class TestFaceTrackingService(unittest.TestCase):
         # Arrange
         # Mock frame and face detection
         test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-        self.mock_drone.get_frame_read.return_value.frame = test_frame
+        self.frame_bus.publish(test_frame)
 
         # Mock face detection
         self.mock_cascade.detectMultiScale.return_value = [(100, 100, 200, 200)]  # (x, y, w, h)
@@ -288,12 +359,126 @@ class TestFaceTrackingService(unittest.TestCase):
         self.mock_cascade.detectMultiScale.assert_called_once()
         self.mock_drone.send_rc_control.assert_called()  # Should have sent control commands
 
+    def test_tracking_loop_feeds_control_loop(self):
+        """Test that detections update the filtered target of the control loop, and a lost face clears it"""
+        # Arrange
+        self.mock_cascade.detectMultiScale.side_effect = [[(450, 190, 100, 100)], []]
+        subscriber = MagicMock()
+        subscriber.next_frame.side_effect = [
+            MagicMock(frame=np.zeros((480, 640, 3), dtype=np.uint8), timestamp=1000.0 + index * 0.2)
+            for index in range(2)]
+        self.mock_video_service.frame_bus = MagicMock()
+        self.mock_video_service.frame_bus.subscribe.return_value = subscriber
+        self.service.tracking_settings['detection_frequency'] = 0.0
+        self.service.tracking_settings['roi_search'] = False
+        self.service.stop_event = MagicMock()
+        self.service.stop_event.is_set.side_effect = [False, True, False, True]
+
+        # Act
+        self.service._tracking_loop()
+        tracked = self.service.control_loop.filter.predict(1000.0)
+        self.service._tracking_loop()
+
+        # Assert
+        self.assertAlmostEqual(tracked[0][0], 0.5625)  # Face center at x = 500
+        self.assertIsNone(self.service.control_loop.filter.predict(1000.2))
+        self.mock_drone.send_rc_control.assert_called_with(0, 0, 0, 0)
+
+    def test_detect_faces_uses_observed_size_band(self):
+        """Test the face sizes searched around the recent widths, the wider pyramid step and the full range fallback"""
+        # Arrange: stable 40-44 px faces
+        self.service.update_settings({'face_size_min': 20, 'roi_search': False})
+        self.service.scale_band.widths.extend([40, 42, 44])
+        self.mock_cascade.detectMultiScale.side_effect = [[], [(300, 220, 80, 80)]]
+
+        # Act
+        faces = self.service._detect_faces(np.zeros((480, 640, 3), dtype=np.uint8))
+        status = self.service.get_status()
+
+        # Assert
+        band_call, full_call = self.mock_cascade.detectMultiScale.call_args_list
+        self.assertEqual((band_call[1]['minSize'], band_call[1]['maxSize']), ((32, 32), (55, 55)))
+        self.assertEqual(band_call[1]['scaleFactor'], 1.2)
+        self.assertEqual((full_call[1]['minSize'], full_call[1]['maxSize']), ((20, 20), (0, 0)))
+        self.assertEqual(full_call[1]['scaleFactor'], 1.1)
+        self.assertEqual(faces, [(220, 380, 300, 300)])
+        self.assertEqual(status['detection']['size_band'], [32, 55])
+        self.assertEqual(status['detection']['size_history']['widths'], [40, 42, 44, 80])
+
+    def test_detect_faces_periodic_full_scan(self):
+        """Test the full frame and full size range scan every full_scan_interval detections"""
+        # Arrange
+        self.service.update_settings({'face_size_min': 20, 'roi_search': False})
+        self.service.scale_band.full_scan_interval = 2
+        self.service.scale_band.widths.extend([40, 40, 40])
+        self.mock_cascade.detectMultiScale.return_value = [(300, 220, 40, 40)]
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        # Act
+        self.service._detect_faces(frame)
+        band_call = self.mock_cascade.detectMultiScale.call_args
+        self.service._detect_faces(frame)
+        full_call = self.mock_cascade.detectMultiScale.call_args
+
+        # Assert
+        self.assertEqual(band_call[1]['maxSize'], (50, 50))
+        self.assertEqual((full_call[1]['minSize'], full_call[1]['maxSize']), ((20, 20), (0, 0)))
+        self.assertIsNone(self.service.get_status()['detection']['size_band'])
+        self.assertEqual(self.service.scale_band.periodic_scans, 1)
+
+    def test_tracking_loop_measures_distance(self):
+        """Test that the face width error reaches the control loop only when holding the distance"""
+        # Arrange
+        self.mock_cascade.detectMultiScale.return_value = [(300, 220, 80, 80)]
+        self.service.stop_event = MagicMock()
+        self.service.stop_event.is_set.side_effect = [False, True, False, True]
+        self.service.tracking_settings['roi_search'] = False
+        invalid, _ = self.service.update_settings({'target_distance': 0})
+
+        # Act
+        self.frame_bus.publish(np.zeros((480, 640, 3), dtype=np.uint8))
+        self.service._tracking_loop()
+        without_distance = self.service.control_loop.filter.get_status()['state']
+        self.service.update_settings({'follow_distance': True, 'target_distance': 200})
+        self.frame_bus.publish(np.zeros((480, 640, 3), dtype=np.uint8))
+        self.service._tracking_loop()
+        with_distance = self.service.control_loop.filter.get_status()['state']
+
+        # Assert
+        self.assertFalse(invalid)
+        self.assertEqual(without_distance[2], 0.0)
+        self.assertLess(with_distance[2], 0.0)  # 80 px face wider than the 36.6 px target: move back
+        self.assertEqual(self.service.controller.axes['distance'].limit, 20)
+
+    def test_tracking_loop_searches_around_last_face(self):
+        """Test that the second detection scans a window around the first face and is reported in the status"""
+        # Arrange
+        self.mock_cascade.detectMultiScale.side_effect = [[(270, 190, 100, 100)], [(36, 36, 48, 48)]]
+        subscriber = MagicMock()
+        subscriber.next_frame.return_value = MagicMock(frame=np.zeros((480, 640, 3), dtype=np.uint8))
+        self.mock_video_service.frame_bus = MagicMock()
+        self.mock_video_service.frame_bus.subscribe.return_value = subscriber
+        self.service.tracking_settings['detection_frequency'] = 0.0
+        self.service.stop_event = MagicMock()
+        self.service.stop_event.is_set.side_effect = [False, False, True]
+
+        # Act
+        self.service._tracking_loop()
+        status = self.service.get_status()
+
+        # Assert
+        window = self.mock_cascade.detectMultiScale.call_args_list[1][0][0]
+        self.assertEqual(window.shape, (120, 120))
+        self.assertEqual(status['detection']['mode'], 'roi')
+        self.assertEqual((status['detection']['roi_scans'], status['detection']['full_scans']), (1, 1))
+        self.assertGreater(status['detection']['iteration_ms'], 0.0)
+
     def test_tracking_loop_no_face(self):
         """Test tracking loop when no face is detected"""
         # Arrange
         # Mock frame and face detection
         test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-        self.mock_drone.get_frame_read.return_value.frame = test_frame
+        self.frame_bus.publish(test_frame)
 
         # Mock no face detection
         self.mock_cascade.detectMultiScale.return_value = []
@@ -314,7 +499,8 @@ class TestFaceTrackingService(unittest.TestCase):
     def test_tracking_loop_exception(self):
         """Test tracking loop handling an exception"""
         # Arrange
-        self.mock_drone.get_frame_read.side_effect = Exception("Test error")
+        self.mock_video_service.frame_bus = MagicMock()
+        self.mock_video_service.frame_bus.subscribe.return_value.next_frame.side_effect = Exception("Test error")
 
         # Setup tracking loop to run only once
         self.service.stop_event = MagicMock()
@@ -334,7 +520,7 @@ class TestFaceTrackingService(unittest.TestCase):
         # Arrange
         # Mock frame and face detection
         test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-        self.mock_drone.get_frame_read.return_value.frame = test_frame
+        self.frame_bus.publish(test_frame)
 
         # Face is in the center of frame (320, 240) with size 100x100
         self.mock_cascade.detectMultiScale.return_value = [(270, 190, 100, 100)]
@@ -360,7 +546,7 @@ class TestFaceTrackingService(unittest.TestCase):
         # Arrange
         # Mock frame and face detection
         test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-        self.mock_drone.get_frame_read.return_value.frame = test_frame
+        self.frame_bus.publish(test_frame)
 
         # Face is to the right of center
         self.mock_cascade.detectMultiScale.return_value = [(450, 240, 100, 100)]
@@ -386,7 +572,7 @@ class TestFaceTrackingService(unittest.TestCase):
         # Arrange
         # Mock frame and face detection
         test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
-        self.mock_drone.get_frame_read.return_value.frame = test_frame
+        self.frame_bus.publish(test_frame)
 
         # Face is above center
         self.mock_cascade.detectMultiScale.return_value = [(320, 100, 100, 100)]
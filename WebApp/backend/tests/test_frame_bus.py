@@ -0,0 +1,107 @@
+import unittest
+import threading
+import numpy as np
+from services.frame_bus import FrameBus
+
+class TestFrameBus(unittest.TestCase):
+    """Tests for the FrameBus class"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.bus = FrameBus()
+        self.frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    def test_publish_assigns_increasing_sequence(self):
+        """Test that each published frame gets a new sequence number"""
+        # Act
+        first = self.bus.publish(self.frame)
+        second = self.bus.publish(self.frame, timestamp=123.0)
+
+        # Assert
+        self.assertEqual(first.seq, 1)
+        self.assertEqual(second.seq, 2)
+        self.assertEqual(second.timestamp, 123.0)
+        self.assertIs(self.bus.latest(), second)
+
+    def test_wait_for_frame_timeout(self):
+        """Test waiting without any new frame returns None"""
+        # Arrange
+        self.bus.publish(self.frame)
+
+        # Act
+        packet = self.bus.wait_for_frame(after_seq=1, timeout=0.01)
+
+        # Assert
+        self.assertIsNone(packet)
+
+    def test_wait_for_frame_wakes_on_publish(self):
+        """Test that a blocked consumer is woken up by a publication"""
+        # Arrange
+        timer = threading.Timer(0.05, self.bus.publish, args=(self.frame,))
+        timer.start()
+
+        # Act
+        packet = self.bus.wait_for_frame(after_seq=0, timeout=2.0)
+        timer.join()
+
+        # Assert
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.seq, 1)
+
+    def test_subscriber_never_receives_same_frame_twice(self):
+        """Test that a subscriber only receives frames newer than the last one"""
+        # Arrange
+        subscriber = self.bus.subscribe('test')
+        self.bus.publish(self.frame)
+
+        # Act
+        first = subscriber.next_frame(timeout=0.01)
+        second = subscriber.next_frame(timeout=0.01)
+
+        # Assert
+        self.assertEqual(first.seq, 1)
+        self.assertIsNone(second)
+
+    def test_subscriber_counts_dropped_frames(self):
+        """Test that frames published between two reads are reported as dropped"""
+        # Arrange
+        subscriber = self.bus.subscribe('slow')
+        self.bus.publish(self.frame)
+        subscriber.next_frame(timeout=0.01)
+
+        # Act
+        for _ in range(3):
+            self.bus.publish(self.frame)
+        packet = subscriber.next_frame(timeout=0.01)
+        stats = self.bus.get_stats()
+
+        # Assert
+        self.assertEqual(packet.seq, 4)
+        self.assertEqual(stats['seq'], 4)
+        self.assertEqual(stats['subscribers']['slow'], {"last_seq": 4, "received": 2, "dropped": 2})
+
+    def test_close_unsubscribes(self):
+        """Test that closing a subscriber removes it from the stats"""
+        # Arrange
+        subscriber = self.bus.subscribe('temp')
+
+        # Act
+        subscriber.close()
+
+        # Assert
+        self.assertNotIn('temp', self.bus.get_stats()['subscribers'])
+
+    def test_clear_keeps_sequence(self):
+        """Test that clearing the bus forgets the frame but not the sequence"""
+        # Arrange
+        self.bus.publish(self.frame)
+
+        # Act
+        self.bus.clear()
+        packet = self.bus.publish(self.frame)
+
+        # Assert
+        self.assertEqual(packet.seq, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+import cv2
+import numpy as np
+from unittest.mock import MagicMock
+from services.frame_sources import (FileFrameSource, FrameSource, SyntheticFrameSource, TelloFrameSource,
+                                    _ThreadedFrameSource, create_frame_source)
+
+def wait_for_frames(source, count, timeout=2.0):
+    """Wait until the source has produced at least count frames"""
+    deadline = time.monotonic() + timeout
+    while source.frames_produced < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+class TestFrameSources(unittest.TestCase):
+    """Tests for the video frame sources"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up after each test"""
+        shutil.rmtree(self.test_dir)
+
+    def test_synthetic_source_produces_new_frame_objects(self):
+        """Test that the synthetic source replaces the frame object at each frame"""
+        # Arrange
+        source = SyntheticFrameSource(fps=200, width=64, height=48)
+
+        # Act
+        source.start()
+        wait_for_frames(source, 1)
+        first = source.frame
+        wait_for_frames(source, source.frames_produced + 2)
+        second = source.frame
+        source.stop()
+
+        # Assert
+        self.assertEqual(first.shape, (48, 64, 3))
+        self.assertIsNot(first, second)
+
+    def test_file_source_replays_image_directory_in_order(self):
+        """Test replaying a directory of images, looping at the end"""
+        # Arrange
+        for i in range(2):
+            cv2.imwrite(os.path.join(self.test_dir, f"{i}.png"), np.full((10, 10, 3), i * 100, dtype=np.uint8))
+        source = FileFrameSource(self.test_dir, fps=1000, loop=True)
+        source._open()
+
+        # Act
+        values = [int(source._next_frame()[0, 0, 0]) for _ in range(3)]
+
+        # Assert
+        self.assertEqual(values, [0, 100, 0])
+
+    def test_file_source_stops_at_end_without_loop(self):
+        """Test that a non looping source stops after the last image"""
+        # Arrange
+        cv2.imwrite(os.path.join(self.test_dir, "0.png"), np.zeros((10, 10, 3), dtype=np.uint8))
+        source = FileFrameSource(self.test_dir, fps=1000, loop=False)
+
+        # Act
+        source.start()
+        source._thread.join(timeout=1.0)
+
+        # Assert
+        self.assertEqual(source.frames_produced, 1)
+        self.assertFalse(source._thread.is_alive())
+
+    def test_file_source_empty_directory(self):
+        """Test that an empty directory cannot be started"""
+        # Arrange
+        source = FileFrameSource(self.test_dir)
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            source.start()
+
+    def test_file_source_unavailable_path(self):
+        """Test availability of a missing file"""
+        # Assert
+        self.assertFalse(FileFrameSource(os.path.join(self.test_dir, "missing.mp4")).is_available())
+        self.assertFalse(FileFrameSource('').is_available())
+
+    def test_tello_source_reads_drone_frames(self):
+        """Test that the Tello source exposes the djitellopy frame"""
+        # Arrange
+        drone_service = MagicMock()
+        frame = np.zeros((720, 960, 3), dtype=np.uint8)
+        drone_service.drone.get_frame_read.return_value.frame = frame
+        source = TelloFrameSource(drone_service)
+
+        # Act
+        source.start()
+        result = source.frame
+
+        # Assert
+        drone_service.drone.streamon.assert_called_once()
+        self.assertIs(result, frame)
+        self.assertTrue(source.requires_drone)
+
+    def test_create_frame_source(self):
+        """Test creating each kind of frame source"""
+        # Arrange
+        drone_service = MagicMock()
+
+        # Act / Assert
+        self.assertIsInstance(create_frame_source(drone_service, 'tello'), TelloFrameSource)
+        self.assertIsInstance(create_frame_source(drone_service, 'file', self.test_dir), FileFrameSource)
+        self.assertIsInstance(create_frame_source(drone_service, 'synthetic', fps=10), SyntheticFrameSource)
+        with self.assertRaises(ValueError):
+            create_frame_source(drone_service, 'unknown')
+
+    def test_incomplete_source_cannot_be_created(self):
+        """Test that a source missing an abstract method fails at creation, not in the capture thread"""
+        # Arrange
+        class NoStopSource(FrameSource):
+            def start(self):
+                pass
+
+        class NoFrameSource(_ThreadedFrameSource):
+            pass
+
+        # Act / Assert
+        with self.assertRaises(TypeError):
+            NoStopSource()
+        with self.assertRaises(TypeError):
+            NoFrameSource(fps=10)
+
+if __name__ == '__main__':
+    unittest.main()
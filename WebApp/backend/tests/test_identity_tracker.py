@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+from services.identity_tracker import (IdentityTracker, box_iou, CONFIDENCE_HALF_LIFE,
+                                       TRACK_MAX_MISSED, UNKNOWN_RETRY_INTERVAL)
+
+class TestIdentityTracker(unittest.TestCase):
+    """Tests for the face track association"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        rng = np.random.default_rng(0)
+        self.gray = np.zeros((120, 160), dtype=np.uint8)
+        # Textured "face" so that template matching has something to lock onto
+        self.gray[40:70, 50:80] = rng.integers(0, 255, (30, 30), dtype=np.uint8)
+        self.box = (40, 80, 70, 50)
+        self.tracker = IdentityTracker()
+
+    def test_box_iou(self):
+        """Test the overlap of face boxes"""
+        # Act & Assert
+        self.assertAlmostEqual(box_iou(self.box, self.box), 1.0)
+        self.assertAlmostEqual(box_iou((0, 10, 10, 0), (0, 20, 10, 10)), 0.0)
+        self.assertAlmostEqual(box_iou((0, 10, 10, 0), (0, 15, 10, 5)), 1 / 3)
+
+    def test_overlapping_face_keeps_its_track(self):
+        """Test that a slightly moved face is associated with the same track"""
+        # Arrange
+        [first] = self.tracker.update([self.box], self.gray, 0.0)
+        first.identify('alice', 0.6, 0.0)
+
+        # Act
+        [second, other] = self.tracker.update([(42, 82, 72, 52), (0, 20, 20, 0)], self.gray, 0.1)
+
+        # Assert
+        self.assertIs(second, first)
+        self.assertEqual(second.name, 'alice')
+        self.assertIsNot(other, first)
+        self.assertEqual(len(self.tracker.tracks), 2)
+
+    def test_lost_track_is_dropped(self):
+        """Test that a track without matching face is dropped after a few frames"""
+        # Arrange
+        self.tracker.update([self.box], self.gray, 0.0)
+
+        # Act
+        for i in range(TRACK_MAX_MISSED + 1):
+            self.tracker.update([], self.gray, 0.1 * i)
+
+        # Assert
+        self.assertEqual(self.tracker.tracks, [])
+
+    def test_needs_recognition(self):
+        """Test when a track identity must be recomputed"""
+        # Arrange
+        [known, unknown] = self.tracker.update([self.box, (0, 20, 20, 0)], self.gray, 0.0)
+        self.assertTrue(self.tracker.needs_recognition(known, 0.0, 0.4))
+        known.identify('alice', 0.6, 0.0)
+        unknown.identify(None, 0.0, 0.0)
+
+        # Act & Assert
+        self.assertFalse(self.tracker.needs_recognition(known, 0.5, 0.4))
+        self.assertTrue(self.tracker.needs_recognition(known, CONFIDENCE_HALF_LIFE, 0.4))
+        self.assertFalse(self.tracker.needs_recognition(unknown, UNKNOWN_RETRY_INTERVAL / 2, 0.4))
+        self.assertTrue(self.tracker.needs_recognition(unknown, UNKNOWN_RETRY_INTERVAL, 0.4))
+
+    def test_follow_moves_track_with_face(self):
+        """Test that a track follows the face between detections"""
+        # Arrange
+        [track] = self.tracker.update([self.box], self.gray, 0.0)
+        moved = np.roll(self.gray, (5, 8), axis=(0, 1))
+
+        # Act
+        followed = self.tracker.follow(moved)
+
+        # Assert
+        self.assertEqual(followed, [track])
+        self.assertEqual(track.box, (45, 88, 75, 58))
+
+    def test_follow_drops_vanished_face(self):
+        """Test that a face that left the image is not followed"""
+        # Arrange
+        self.tracker.update([self.box], self.gray, 0.0)
+
+        # Act
+        followed = self.tracker.follow(np.zeros_like(self.gray))
+
+        # Assert
+        self.assertEqual(followed, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import cv2
+import numpy as np
+from unittest.mock import patch
+from services.frame_bus import FrameBus
+from services.mjpeg_broadcaster import MjpegBroadcaster
+
+class TestMjpegBroadcaster(unittest.TestCase):
+    """Tests for the MjpegBroadcaster class"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.bus = FrameBus()
+        self.broadcaster = MjpegBroadcaster(self.bus)
+        self.frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+    def test_wait_for_part_returns_multipart_jpeg(self):
+        """Test that a published frame is served as a MJPEG part"""
+        # Arrange
+        self.bus.publish(self.frame)
+
+        # Act
+        seq, part = self.broadcaster.wait_for_part(0, timeout=0.01)
+
+        # Assert
+        self.assertEqual(seq, 1)
+        self.assertTrue(part.startswith(b'--frame\r\nContent-Type: image/jpeg\r\n\r\n\xff\xd8'))
+        self.assertTrue(part.endswith(b'\r\n'))
+
+    def test_each_frame_is_encoded_once(self):
+        """Test that the encoding cost does not depend on the number of viewers"""
+        # Arrange
+        self.bus.publish(self.frame)
+
+        # Act
+        with patch('services.mjpeg_broadcaster.cv2.imencode', wraps=cv2.imencode) as mock_imencode:
+            results = [self.broadcaster.wait_for_part(0, timeout=0.01) for _ in range(5)]
+            self.bus.publish(self.frame)
+            results += [self.broadcaster.wait_for_part(1, timeout=0.01) for _ in range(5)]
+
+        # Assert
+        self.assertEqual(mock_imencode.call_count, 2)
+        self.assertEqual(self.broadcaster.get_stats()['encoded_frames'], 2)
+        self.assertEqual([seq for seq, _ in results], [1] * 5 + [2] * 5)
+
+    def test_wait_for_part_without_new_frame(self):
+        """Test that nothing is returned when no newer frame exists"""
+        # Arrange
+        self.bus.publish(self.frame)
+
+        # Act
+        result = self.broadcaster.wait_for_part(1, timeout=0.01)
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_failed_encode_advances_sequence(self):
+        """Test that a failed encode is not retried for the same frame"""
+        # Arrange
+        self.bus.publish(self.frame)
+
+        # Act
+        with patch('services.mjpeg_broadcaster.cv2.imencode', return_value=(False, None)):
+            seq, part = self.broadcaster.wait_for_part(0, timeout=0.01)
+
+        # Assert
+        self.assertEqual(seq, 1)
+        self.assertIsNone(part)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch
+from services.recognition_scheduler import RecognitionScheduler, MAX_INTERVAL, MIN_INTERVAL
+
+class TestRecognitionScheduler(unittest.TestCase):
+    """Tests for the adaptive detection interval and scale"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        # No other load on the machine unless a test says otherwise
+        self.load_patcher = patch('services.recognition_scheduler.system_load', return_value=0.0)
+        self.load_patcher.start()
+        self.scheduler = RecognitionScheduler(scale=0.25, interval=0.5)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.load_patcher.stop()
+
+    def test_slow_detection_reduces_scale(self):
+        """Test that the image is reduced until the latency budget is met"""
+        # Act
+        changed = self.scheduler.record(0.4, True, latency_budget=0.1, cpu_budget=0.5)
+
+        # Assert
+        self.assertTrue(changed)
+        # 0.4 s at 0.25 -> 6.4 s per unit area; 0.125² * 6.4 = 0.1 s
+        self.assertEqual(self.scheduler.scale, 0.125)
+
+    def test_fast_detection_with_faces_increases_scale(self):
+        """Test that spare latency budget is used for a finer image when faces are present"""
+        # Act
+        self.scheduler.record(0.02, True, latency_budget=0.15, cpu_budget=0.5)
+
+        # Assert
+        self.assertEqual(self.scheduler.scale, 0.35)
+
+    def test_empty_scene_keeps_scale_and_backs_off(self):
+        """Test the interval backoff without faces, capped at MAX_INTERVAL"""
+        # Act
+        self.scheduler.record(0.02, False, latency_budget=0.15, cpu_budget=0.5)
+        first = self.scheduler.interval
+        for _ in range(20):
+            self.scheduler.record(0.02, False, latency_budget=0.15, cpu_budget=0.5)
+
+        # Assert
+        self.assertEqual(self.scheduler.scale, 0.25)
+        self.assertAlmostEqual(first, 0.75)
+        self.assertEqual(self.scheduler.interval, MAX_INTERVAL)
+
+    def test_faces_ramp_up_to_cpu_budget(self):
+        """Test that faces bring the interval down to what the CPU budget allows"""
+        # Arrange
+        self.scheduler.interval = MAX_INTERVAL
+
+        # Act
+        self.scheduler.record(0.1, True, latency_budget=0.15, cpu_budget=0.5)
+        busy = self.scheduler.interval
+        for _ in range(10):
+            self.scheduler.record(0.01, True, latency_budget=0.15, cpu_budget=0.5)
+
+        # Assert
+        self.assertAlmostEqual(busy, 0.2)
+        self.assertEqual(self.scheduler.interval, MIN_INTERVAL)
+
+    def test_system_load_limits_cpu_budget(self):
+        """Test that the CPU budget shrinks when other processes use the cores"""
+        # Arrange
+        with patch('services.recognition_scheduler.system_load', return_value=3.8), \
+                patch('services.recognition_scheduler.cpu_cores', return_value=4):
+            # Act
+            self.scheduler.record(0.05, True, latency_budget=0.15, cpu_budget=0.5)
+
+        # Assert: 4 cores - (3.8 load - 0.05 s / 0.5 s used by detection itself)
+        self.assertAlmostEqual(self.scheduler.cpu_budget, 0.3)
+        self.assertGreater(self.scheduler.interval, 0.05 / 0.5)
+
+    def test_status_reports_rates_and_budgets(self):
+        """Test the values exposed in the recognition status"""
+        # Act
+        for now in (0.0, 0.5, 1.0):
+            self.scheduler.record(0.05, True, latency_budget=0.15, cpu_budget=0.5, now=now)
+        status = self.scheduler.get_status()
+
+        # Assert
+        self.assertAlmostEqual(status["measured_rate"], 2.0)
+        self.assertAlmostEqual(status["target_rate"], 1 / self.scheduler.interval)
+        self.assertEqual(status["latency_budget"], 0.15)
+        self.assertEqual(status["cpu_budget"], 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
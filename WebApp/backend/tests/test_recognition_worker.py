@@ -0,0 +1,125 @@
+import os
+import unittest
+import numpy as np
+from services.recognition_worker import RecognitionWorker
+from services.shared_frame_ring import SharedFrameRing
+
+class FakePipeline:
+    """Pipeline run inside the worker process, reporting what it received"""
+
+    def __init__(self, settings, gallery):
+        self.settings = dict(settings)
+        self.gallery = gallery
+        self.identity_tracker = FakeTracker()
+
+    def warm_up(self):
+        pass
+
+    def update_settings(self, new_settings):
+        self.settings.update(new_settings)
+
+    def _process_frame(self, frame, scale):
+        if self.settings.get('fail'):
+            raise ValueError("bad frame")
+        return [{"name": self.gallery, "sum": int(frame.sum()), "shape": list(frame.shape),
+                 "scale": scale, "settings": self.settings}]
+
+    def _follow_frame(self, frame, scale):
+        return [{"name": self.gallery, "followed": True}]
+
+class FakeTracker:
+    def __init__(self):
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+    def get_stats(self):
+        return {"tracks": 1, "recognitions": 0, "reused": self.resets}
+
+class TestRecognitionWorker(unittest.TestCase):
+    """Tests for the recognition worker process"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.worker = RecognitionWorker(timeout=5.0)
+        self.settings = {'detector': 'hog', 'confidence_threshold': 0.4}
+        self.worker.start(FakePipeline, self.settings, 'first')
+        self.frame = np.arange(12 * 16 * 3, dtype=np.uint8).reshape(12, 16, 3)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.worker.stop()
+
+    def test_frame_is_processed_in_worker_process(self):
+        """Test the frame transfer through shared memory and the returned detections"""
+        # Act
+        detections = self.worker.process(self.frame, 0.25)
+        followed = self.worker.process(self.frame, 0.25, follow=True)
+
+        # Assert
+        self.assertEqual(detections[0]['sum'], int(self.frame.sum()))
+        self.assertEqual(detections[0]['shape'], [12, 16, 3])
+        self.assertEqual(detections[0]['scale'], 0.25)
+        self.assertTrue(followed[0]['followed'])
+        self.assertEqual(self.worker.tracker_stats, {"tracks": 1, "recognitions": 0, "reused": 1})
+        self.assertEqual(self.worker.get_status()['frames'], 2)
+
+    def test_changed_settings_and_gallery_are_forwarded(self):
+        """Test that only modified settings and a new gallery reach the process"""
+        # Arrange
+        self.settings['confidence_threshold'] = 0.6
+
+        # Act
+        self.worker.sync(self.settings, 'second')
+        detections = self.worker.process(self.frame, 0.5)
+
+        # Assert
+        self.assertEqual(detections[0]['name'], 'second')
+        self.assertEqual(detections[0]['settings']['confidence_threshold'], 0.6)
+        # The scale change resets the tracked faces
+        self.assertEqual(self.worker.tracker_stats['reused'], 1)
+
+    def test_processing_error_keeps_process_alive(self):
+        """Test that an error on one frame is reported without stopping the process"""
+        # Arrange
+        self.worker.sync({**self.settings, 'fail': True}, 'first')
+
+        # Act & Assert
+        with self.assertRaises(RuntimeError):
+            self.worker.process(self.frame, 0.25)
+        self.assertTrue(self.worker.is_alive())
+
+    def test_stopped_worker_raises(self):
+        """Test that a stopped process is reported to the caller"""
+        # Act
+        self.worker.stop()
+
+        # Assert
+        self.assertFalse(self.worker.is_alive())
+        with self.assertRaises(RuntimeError):
+            self.worker.process(self.frame, 0.25)
+
+class TestRecognitionWorkerSharedRing(unittest.TestCase):
+    """Tests for the worker reading frames from the video shared ring"""
+
+    def test_worker_reads_latest_ring_frame(self):
+        """Test that the worker processes the newest ring frame without a copy from the caller"""
+        # Arrange
+        ring = SharedFrameRing.create(3, (12, 16, 3), name=f"test_worker_ring_{os.getpid()}")
+        self.addCleanup(ring.close)
+        worker = RecognitionWorker(ring_name=ring.name, timeout=5.0)
+        worker.start(FakePipeline, {'detector': 'hog'}, 'gallery')
+        self.addCleanup(worker.stop)
+        for value in (1, 2):
+            ring.publish(np.full((12, 16, 3), value, dtype=np.uint8))
+
+        # Act
+        detections = worker.process(np.zeros((12, 16, 3), dtype=np.uint8), 0.25)
+
+        # Assert
+        self.assertEqual(detections[0]['sum'], 2 * 12 * 16 * 3)
+        self.assertIsNone(worker._ring)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import multiprocessing
+import os
+import unittest
+import numpy as np
+from services.shared_frame_ring import SharedFrameRing
+
+def read_in_child(name, results):
+    """Attach to the ring from another process and report the latest frame"""
+    ring = SharedFrameRing.attach(name)
+    packet = ring.wait_for_frame(0, timeout=2.0)
+    results.put((packet.seq, int(packet.frame.sum()), packet.frame.shape))
+    del packet
+    ring.close()
+
+class TestSharedFrameRing(unittest.TestCase):
+    """Tests for the shared-memory frame ring"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.ring = SharedFrameRing.create(3, (4, 6, 3), name=f"test_ring_{os.getpid()}_{id(self)}")
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.ring.close()
+
+    def frame(self, value, shape=(4, 6, 3)):
+        return np.full(shape, value, dtype=np.uint8)
+
+    def test_publish_and_read(self):
+        """Test the header and data of published frames"""
+        # Act
+        first = self.ring.publish(self.frame(1), timestamp=10.0)
+        second = self.ring.publish(self.frame(2, (2, 3, 3)), timestamp=11.0)
+
+        # Assert
+        self.assertEqual((first, second, self.ring.seq), (1, 2, 2))
+        packet = self.ring.read()
+        self.assertEqual(packet.seq, 2)
+        self.assertEqual(packet.timestamp, 11.0)
+        self.assertEqual(packet.frame.shape, (2, 3, 3))
+        self.assertTrue((self.ring.read(1).frame == 1).all())
+
+    def test_wraparound_overwrites_oldest_frames(self):
+        """Test that frames older than the ring capacity are reported as overwritten"""
+        # Act
+        for value in range(1, 6):
+            self.ring.publish(self.frame(value))
+
+        # Assert
+        self.assertIsNone(self.ring.read(2))
+        self.assertIsNone(self.ring.read(6))
+        self.assertEqual([int(self.ring.read(seq).frame[0, 0, 0]) for seq in (3, 4, 5)], [3, 4, 5])
+
+    def test_stale_view_is_detected(self):
+        """Test the detection of a view overwritten after it was read"""
+        # Arrange
+        self.ring.publish(self.frame(1))
+        packet = self.ring.read()
+        snapshot = self.ring.copy()
+
+        # Act
+        for value in range(2, 5):
+            self.ring.publish(self.frame(value))
+
+        # Assert
+        self.assertFalse(self.ring.is_current(packet))
+        self.assertTrue((packet.frame == 4).all())
+        self.assertTrue((snapshot.frame == 1).all())
+
+    def test_slot_being_written_is_not_readable(self):
+        """Test that a reserved slot is invalid until committed"""
+        # Arrange
+        for value in range(1, 4):
+            self.ring.publish(self.frame(value))
+
+        # Act
+        seq, buffer = self.ring.reserve()
+        buffer[...] = 9
+        during = self.ring.read(1)
+        self.ring.commit(seq, shape=(4, 6))
+
+        # Assert
+        self.assertIsNone(during)
+        self.assertEqual(self.ring.read().frame.shape, (4, 6))
+
+    def test_wait_for_frame_timeout(self):
+        """Test that waiting without a new frame times out"""
+        # Arrange
+        self.ring.publish(self.frame(1))
+
+        # Act & Assert
+        self.assertIsNone(self.ring.wait_for_frame(after_seq=1, timeout=0.05))
+        self.assertEqual(self.ring.wait_for_frame(after_seq=0, timeout=0.05).seq, 1)
+
+    def test_other_process_reads_by_name(self):
+        """Test attaching to the ring from another process"""
+        # Arrange
+        self.ring.publish(self.frame(7))
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+
+        # Act
+        process = context.Process(target=read_in_child, args=(self.ring.name, results))
+        process.start()
+        seq, total, shape = results.get(timeout=30)
+        process.join(timeout=5)
+
+        # Assert
+        self.assertEqual((seq, total, shape), (1, 7 * 4 * 6 * 3, (4, 6, 3)))
+        # The reader exiting must not remove the segment
+        self.assertEqual(self.ring.publish(self.frame(8)), 2)
+        reader = SharedFrameRing.attach(self.ring.name)
+        self.assertEqual(reader.seq, 2)
+        reader.close()
+
+if __name__ == '__main__':
+    unittest.main()
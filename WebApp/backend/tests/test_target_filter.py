@@ -0,0 +1,72 @@
+import unittest
+from services.target_filter import TargetFilter
+
+class TestTargetFilter(unittest.TestCase):
+    """Tests for the constant-velocity Kalman filter on the tracked face"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.filter = TargetFilter()
+
+    def test_estimates_velocity_and_predicts_between_detections(self):
+        """Test the velocity of a face moving at constant speed and its extrapolation"""
+        # Arrange: face moving right at 0.5 /s and down at 0.2 /s, one detection every 0.2 s
+        for index in range(20):
+            t = index * 0.2
+            self.filter.update((-0.5 + 0.5 * t, 0.2 * t, 0.0), 100.0 + t)
+
+        # Act
+        position, velocity = self.filter.predict(100.0 + 3.8 + 0.1)
+
+        # Assert
+        self.assertAlmostEqual(velocity[0], 0.5, places=2)
+        self.assertAlmostEqual(velocity[1], 0.2, places=2)
+        self.assertAlmostEqual(position[0], -0.5 + 0.5 * 3.9, places=2)
+        self.assertAlmostEqual(position[1], 0.2 * 3.9, places=2)
+        self.assertEqual(position[2], 0.0)
+
+    def test_innovation_is_reported(self):
+        """Test the innovation and its normalized value after an unexpected jump"""
+        # Arrange
+        self.filter.update((0.0, 0.0, 0.0), 10.0)
+        self.filter.update((0.0, 0.0, 0.0), 10.1)
+
+        # Act
+        self.filter.update((0.3, 0.0, 0.0), 10.2)
+        status = self.filter.get_status()
+
+        # Assert
+        self.assertTrue(status['tracking'])
+        self.assertAlmostEqual(status['innovation'][0], 0.3, places=3)
+        self.assertGreater(status['normalized_innovation'], 9.0)  # Far outside 3 standard deviations
+        self.assertEqual(status['updates'], 2)
+
+    def test_stale_target_is_lost(self):
+        """Test that no prediction is made from a too old detection, and the restart after it"""
+        # Arrange
+        self.filter.update((0.2, 0.0, 0.0), 10.0)
+        self.filter.update((0.4, 0.0, 0.0), 10.2)
+
+        # Act
+        stale = self.filter.predict(10.2 + self.filter.max_age + 0.1)
+        self.filter.update((-0.3, 0.0, 0.0), 20.0)
+        restarted = self.filter.predict(20.1)
+
+        # Assert
+        self.assertIsNone(stale)
+        self.assertEqual(restarted, ((-0.3, 0.0, 0.0), (0.0, 0.0, 0.0)))
+
+    def test_reset_forgets_target(self):
+        """Test that nothing is predicted after a reset"""
+        # Arrange
+        self.filter.update((0.2, 0.1, 0.0), 10.0)
+
+        # Act
+        self.filter.reset()
+
+        # Assert
+        self.assertIsNone(self.filter.predict(10.0))
+        self.assertFalse(self.filter.get_status()['tracking'])
+
+if __name__ == '__main__':
+    unittest.main()
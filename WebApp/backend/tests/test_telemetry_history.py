@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+from models.telemetry_history import TelemetryHistory
+
+class TestTelemetryHistory(unittest.TestCase):
+    """Tests for the multi-resolution telemetry history"""
+
+    def fill(self, history, count, start=0.0):
+        """Append count samples at 1 s intervals with height = index"""
+        for i in range(count):
+            history.append(start + i, {"height": i, "battery": 100 - i})
+
+    def test_query_returns_raw_samples_in_range(self):
+        """Test that a small range is returned sample by sample"""
+        # Arrange
+        history = TelemetryHistory(capacity=100, levels=2, factor=10, fields=('height', 'battery'))
+        self.fill(history, 50)
+
+        # Act
+        result = history.query('height', start=10, end=14)
+
+        # Assert
+        self.assertEqual(result['resolution'], 1)
+        self.assertEqual(result['timestamps'], [10.0, 11.0, 12.0, 13.0, 14.0])
+        self.assertEqual(result['min'], result['max'])
+        self.assertEqual(result['mean'], [10.0, 11.0, 12.0, 13.0, 14.0])
+
+    def test_ring_wraps_and_keeps_latest_samples(self):
+        """Test that memory is bounded and searches work across the wrap point"""
+        # Arrange
+        history = TelemetryHistory(capacity=100, levels=1, factor=10, fields=('height',))
+        self.fill(history, 250)
+
+        # Act
+        result = history.query('height', start=140, end=160, max_points=100)
+        everything = history.query('height', max_points=1000)
+
+        # Assert
+        self.assertEqual(len(history), 100)
+        self.assertEqual(result['mean'], [float(i) for i in range(150, 161)])
+        self.assertEqual(everything['timestamps'][0], 150.0)
+        self.assertEqual(everything['timestamps'][-1], 249.0)
+
+    def test_downsampling_matches_brute_force(self):
+        """Test the min/max/mean buckets against a direct computation"""
+        # Arrange
+        history = TelemetryHistory(capacity=1000, levels=1, factor=10, fields=('height',))
+        rng = np.random.default_rng(0)
+        values = rng.integers(0, 500, 1000)
+        for i, value in enumerate(values):
+            history.append(float(i), {"height": int(value)})
+
+        # Act
+        result = history.query('height', max_points=10)
+
+        # Assert
+        buckets = values.reshape(10, 100)
+        self.assertEqual(result['timestamps'], [float(i) for i in range(0, 1000, 100)])
+        self.assertEqual(result['min'], buckets.min(axis=1).tolist())
+        self.assertEqual(result['max'], buckets.max(axis=1).tolist())
+        np.testing.assert_allclose(result['mean'], buckets.mean(axis=1), rtol=1e-6)
+
+    def test_long_range_uses_aggregated_level(self):
+        """Test that old periods are served from the coarser level"""
+        # Arrange
+        history = TelemetryHistory(capacity=100, levels=2, factor=10, fields=('height',))
+        self.fill(history, 1000)
+
+        # Act
+        result = history.query('height', max_points=5)
+
+        # Assert
+        self.assertEqual(result['resolution'], 10)
+        self.assertEqual(len(result['timestamps']), 5)
+        self.assertEqual(result['min'][0], 0.0)
+        self.assertEqual(result['max'][-1], 999.0)
+        self.assertEqual(result['mean'][0], 99.5)
+
+    def test_invalid_queries(self):
+        """Test that unknown fields and invalid max_points are rejected"""
+        # Arrange
+        history = TelemetryHistory(capacity=10, levels=1, fields=('height',))
+
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            history.query('altitude')
+        with self.assertRaises(ValueError):
+            history.query('height', max_points=0)
+        self.assertEqual(history.query('height')['timestamps'], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from djitellopy import Tello
+from simulator.tello_simulator import SimulatedDroneState, TelloSimulator
+
+class TestTelloSimulator(unittest.TestCase):
+    """Tests for the Tello SDK simulator"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.simulator = TelloSimulator()
+
+    def test_handle_command_flight_cycle(self):
+        """Test that takeoff, moves and land update the simulated state"""
+        # Act
+        responses = [self.simulator.handle_command(c) for c in ('command', 'takeoff', 'up 40', 'cw 90')]
+
+        # Assert
+        self.assertEqual(responses, ['ok'] * 4)
+        self.assertTrue(self.simulator.state.flying)
+        self.assertEqual(self.simulator.state.height, 120.0)
+        self.assertEqual(self.simulator.state.yaw, 90.0)
+
+        # Act
+        self.assertEqual(self.simulator.handle_command('land'), 'ok')
+
+        # Assert
+        self.assertFalse(self.simulator.state.flying)
+
+    def test_rc_command_is_not_acknowledged(self):
+        """Test that rc commands update the state without a response"""
+        # Act
+        response = self.simulator.handle_command('rc 10 -20 30 -40')
+
+        # Assert
+        self.assertIsNone(response)
+        self.assertEqual(self.simulator.state.rc, (10, -20, 30, -40))
+
+    def test_queries_and_unknown_commands(self):
+        """Test read commands and the error response"""
+        # Act & Assert
+        self.assertEqual(self.simulator.handle_command('battery?'), '100')
+        self.assertEqual(self.simulator.handle_command('streamon'), 'ok')
+        self.assertTrue(self.simulator.streaming)
+        self.assertEqual(self.simulator.handle_command('foo'), 'error')
+        self.assertEqual(self.simulator.handle_command(''), 'error')
+
+    def test_state_packet_is_parsed_by_djitellopy(self):
+        """Test that state packets use the SDK format understood by djitellopy"""
+        # Arrange
+        state = SimulatedDroneState()
+        state.flying = True
+        state.height = 80.0
+        state.rc = (0, 0, 20, 0)
+        state.step(1.0)
+
+        # Act
+        parsed = Tello.parse_state(state.to_packet().decode('ASCII'))
+
+        # Assert
+        self.assertEqual(parsed['h'], 100)
+        self.assertEqual(parsed['bat'], 99)
+        self.assertEqual(parsed['vgz'], -2)
+        self.assertEqual(parsed['time'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import unittest
+from services.tracking_controller import PidController, TrackingController, face_width_for_distance, merge_gains
+
+class TestPidController(unittest.TestCase):
+    """Tests for the PID controller with feed-forward"""
+
+    def test_integral_stops_growing_while_saturated(self):
+        """Test the anti-windup: no integration while saturated, integral bounded by limit / ki"""
+        # Arrange
+        pid = PidController(kp=200.0, ki=10.0, limit=100.0)
+
+        # Act
+        for _ in range(50):
+            pid.update(1.0, 0.1)
+        saturated_integral = pid.integral
+        pid.kp = 0.0
+        for _ in range(500):
+            pid.update(1.0, 0.1)
+
+        # Assert
+        self.assertEqual(saturated_integral, 0.0)
+        self.assertAlmostEqual(pid.integral, 10.0)
+        self.assertEqual(pid.output, 100.0)
+
+    def test_deadband_hysteresis(self):
+        """Test the zero output inside the deadband, then the regulation down to the release threshold"""
+        # Arrange
+        pid = PidController(kp=100.0, deadband=0.2)
+
+        # Act
+        inside = pid.update(0.15, 0.1)
+        outside = pid.update(0.3, 0.1)
+        regulating = pid.update(0.15, 0.1)
+        released = pid.update(0.05, 0.1)
+
+        # Assert
+        self.assertEqual(inside, 0.0)
+        self.assertAlmostEqual(outside, 30.0)
+        self.assertAlmostEqual(regulating, 15.0)
+        self.assertEqual(released, 0.0)
+        self.assertFalse(pid.active)
+
+    def test_filtered_derivative_and_feed_forward(self):
+        """Test the low-pass filtered derivative and the feed-forward term"""
+        # Arrange
+        pid = PidController(kd=1.0, kf=10.0, derivative_time=0.1)
+
+        # Act
+        first = pid.update(0.1, 0.1)
+        second = pid.update(0.2, 0.1, feed_forward=0.5)
+
+        # Assert
+        self.assertEqual(first, 0.0)  # No derivative on the first measurement
+        # Raw derivative 1.0 filtered with alpha = 0.5, plus kf * 0.5
+        self.assertAlmostEqual(pid.derivative, 0.5)
+        self.assertAlmostEqual(second, 5.5)
+
+    def test_stale_measurement_skips_derivative_and_integral(self):
+        """Test that a measurement after a long gap does not use the time step"""
+        # Arrange
+        pid = PidController(kp=1.0, ki=1.0, kd=1.0)
+        pid.update(0.5, 0.1)
+
+        # Act
+        pid.update(0.1, 5.0)
+
+        # Assert
+        self.assertEqual(pid.derivative, 0.0)
+        self.assertEqual(pid.integral, 0.0)
+
+
+class TestTrackingController(unittest.TestCase):
+    """Tests for the face tracking RC commands"""
+
+    def test_measure_signs(self):
+        """Test the normalized errors of a face right of and below the center"""
+        # Act
+        x, y, size = TrackingController.measure((300, 520, 380, 440), (480, 640, 3), target_width=0.25)
+
+        # Assert
+        self.assertAlmostEqual(x, 0.5)
+        self.assertAlmostEqual(y, 0.41666, places=4)
+        self.assertAlmostEqual(size, 0.5)  # 80 px face for a 160 px target: move forward
+
+    def test_update_commands_directions(self):
+        """Test the yaw, vertical and distance command directions and the speed limits"""
+        # Arrange
+        controller = TrackingController(max_speeds={'yaw': 20, 'vertical': 30, 'distance': 10})
+
+        # Act
+        lr, fb, ud, yaw = controller.update((0.1, 0.1, 0.0), 0.0)
+        saturated = controller.update((1.0, -1.0, 1.0), 0.1)
+
+        # Assert
+        self.assertEqual((lr, fb), (0, 0))  # No target width: no distance command
+        self.assertEqual(yaw, 9)
+        self.assertEqual(ud, -9)  # Face below the center: move down
+        self.assertEqual(saturated, (0, 10, 30, 20))
+
+    def test_reset_forgets_target_velocity(self):
+        """Test the estimated velocity of the target and its reset"""
+        # Arrange
+        controller = TrackingController(gains={'yaw': {'kp': 0.0, 'ki': 0.0, 'kd': 0.0, 'kf': 1.0}})
+
+        # Act
+        controller.update((0.1, 0.0, 0.0), 0.0)
+        controller.update((0.3, 0.0, 0.0), 0.2)
+        velocity = controller.velocity
+        controller.reset()
+
+        # Assert
+        self.assertAlmostEqual(velocity[0], 0.5)  # 1.0 /s filtered with alpha = 0.5
+        self.assertEqual(controller.velocity, (0.0, 0.0, 0.0))
+        self.assertIsNone(controller.last_time)
+
+    def test_distance_axis(self):
+        """Test the face width expected at a distance and the forward command holding it"""
+        # Arrange
+        controller = TrackingController(deadbands={'distance': 0.15})
+        target_width = face_width_for_distance(200)
+        box = (200, 330, 220, 310)  # 20 px face in a 640 px frame
+
+        # Act
+        far = controller.update(controller.measure(box, (480, 640), target_width), 0.0)
+        disabled = controller.update(controller.measure(box, (480, 640)), 0.1)
+        close = controller.update(controller.measure(box, (480, 640), 0.25 * target_width), 0.2)
+
+        # Assert
+        self.assertAlmostEqual(target_width * 640, 36.6, places=1)  # 16 cm face at 2 m, 70° field of view
+        self.assertEqual(far[1], 20)  # Face too small: move forward
+        self.assertEqual(disabled[1], 0)
+        self.assertEqual(controller.axes['distance'].integral, 0.0)
+        self.assertEqual(close[1], -20)  # Face too large: move back
+
+    def test_distance_integral_kept_at_target_width(self):
+        """Test that a face exactly at the target width keeps the distance integral"""
+        # Arrange
+        controller = TrackingController()
+        box = (200, 340, 240, 300)  # 40 px face in a 640 px frame
+
+        # Act
+        controller.update(controller.measure(box, (480, 640), 45 / 640), 0.0)
+        controller.update(controller.measure(box, (480, 640), 45 / 640), 0.1)  # Unsaturated: integrates
+        integral = controller.axes['distance'].integral
+        at_target = controller.measure((200, 330, 240, 310), (480, 640), 0.03125)  # 20 px face, 20 px target
+        controller.update(at_target, 0.2)
+
+        # Assert
+        self.assertEqual(at_target[2], 0.0)
+        self.assertGreater(integral, 0.0)
+        self.assertEqual(controller.axes['distance'].integral, integral)
+        self.assertIsNone(controller.measure(box, (480, 640))[2])
+
+    def test_merge_gains_validation(self):
+        """Test the partial gains completed by the defaults and the unknown axis or gain errors"""
+        # Act
+        gains = merge_gains({'yaw': {'kp': '50'}})
+
+        # Assert
+        self.assertEqual(gains['yaw']['kp'], 50.0)
+        self.assertEqual(gains['yaw']['ki'], 10.0)
+        with self.assertRaises(ValueError):
+            merge_gains({'roll': {'kp': 1}})
+        with self.assertRaises(ValueError):
+            merge_gains({'yaw': {'kx': 1}})
+
+if __name__ == '__main__':
+    unittest.main()
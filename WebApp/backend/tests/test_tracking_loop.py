@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from services.tracking_controller import TrackingController
+from services.tracking_loop import TrackingLoop
+
+class TestTrackingLoop(unittest.TestCase):
+    """Tests for the fixed-rate tracking control loop"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.loop = TrackingLoop(TrackingController(), rate=30.0)
+        self.drone_service = MagicMock()
+        self.drone_service.connected = True
+        self.loop.drone_service = self.drone_service
+
+    def test_command_uses_predicted_target(self):
+        """Test the command computed on the position predicted between detections"""
+        # Arrange: face right of the center, moving right
+        self.loop.filter.update((0.30, 0.0, 0.0), 100.0)
+        self.loop.filter.update((0.34, 0.0, 0.0), 100.2)
+
+        # Act
+        command = self.loop.command(100.3)
+        status = self.loop.get_status()
+
+        # Assert
+        self.assertGreater(command[3], 0)  # Rotate right
+        self.assertEqual(command[:3], (0, 0, 0))
+        self.assertAlmostEqual(status['age_ms'], 100.0, places=1)
+
+    def test_command_stops_without_target(self):
+        """Test the stop command and the controller reset when the target is lost"""
+        # Arrange
+        self.loop.filter.update((0.5, 0.0, 0.0), 100.0)
+        self.loop.command(100.1)
+
+        # Act
+        self.loop.lose()
+        command = self.loop.command(100.2)
+
+        # Assert
+        self.assertEqual(command, (0, 0, 0, 0))
+        self.assertIsNone(self.loop.controller.axes['yaw'].last_error)
+
+    def test_run_sends_commands_then_a_single_stop(self):
+        """Test the commands sent at each tick while a target is predicted, then one stop command"""
+        # Arrange
+        self.loop.stop_event = MagicMock()
+        self.loop.stop_event.is_set.side_effect = [False, False, False, False, True]
+        commands = [(0, 0, 0, 20), (0, 0, 0, 18), (0, 0, 0, 0), (0, 0, 0, 0)]
+
+        # Act
+        with patch.object(self.loop, 'command', side_effect=commands):
+            self.loop._run()
+
+        # Assert
+        sent = [call[0] for call in self.drone_service.drone.send_rc_control.call_args_list]
+        self.assertEqual(sent, [(0, 0, 0, 20), (0, 0, 0, 18), (0, 0, 0, 0)])
+        self.assertEqual(self.loop.stop_event.wait.call_count, 4)
+
+    def test_observe_reports_latency(self):
+        """Test the capture-to-measurement latency of a detection"""
+        # Act
+        with patch('services.tracking_loop.time.time', return_value=100.25):
+            self.loop.observe((0.1, 0.0, 0.0), 100.0)
+
+        # Assert
+        self.assertAlmostEqual(self.loop.get_status()['latency_ms'], 250.0)
+        self.assertEqual(self.loop.get_status()['filter']['state'][0], 0.1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,8 @@ import numpy as np
 from unittest.mock import patch, MagicMock
 from services.video_service import VideoService
 from services.drone_service import DroneService
+from services.frame_sources import SyntheticFrameSource
+from config import VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FRAME_BUFFERS
 
 class TestVideoService(unittest.TestCase):
     """Tests for the VideoService class"""
@@ -83,6 +85,34 @@ class TestVideoService(unittest.TestCase):
         self.assertTrue("error" in message.lower() or "erreur" in message.lower())
         self.assertFalse(self.service._streaming)
 
+    def test_start_video_stream_without_drone_for_replay_source(self):
+        """Test that a replay source streams without a connected drone"""
+        # Arrange
+        self.mock_drone_service.connected = False
+        self.service.set_frame_source(SyntheticFrameSource(fps=100, width=64, height=48))
+
+        # Act
+        success, message = self.service.start_video_stream()
+        packet = self.service.frame_bus.wait_for_frame(0, timeout=2.0)
+        self.service.stop_video_stream()
+
+        # Assert
+        self.assertTrue(success)
+        self.assertIsNotNone(packet)
+        self.assertEqual(packet.frame.shape[:2], (VIDEO_HEIGHT, VIDEO_WIDTH))
+        self.mock_drone.streamon.assert_not_called()
+
+    def test_set_frame_source_while_streaming(self):
+        """Test that the source cannot be replaced while streaming"""
+        # Arrange
+        self.service._streaming = True
+
+        # Act
+        success, message = self.service.set_frame_source(SyntheticFrameSource())
+
+        # Assert
+        self.assertFalse(success)
+
     def test_stop_video_stream_success(self):
         """Test successful video stream stop"""
         # Arrange
@@ -135,20 +165,84 @@ class TestVideoService(unittest.TestCase):
         mock_frame_read.frame = test_frame
         self.mock_drone.get_frame_read.return_value = mock_frame_read
 
-        # Create a threadsafe mock to capture frame updates
         self.service._streaming = True
         self.service.frame = None
 
+        # Stop the loop once the frame has been published and no new frame arrives
+        def stop_streaming(_):
+            self.service._streaming = False
+
         # Act
-        # Simulate a single iteration of the capture loop
-        with patch('services.video_service.time.sleep', return_value=None):
+        with patch('services.video_service.time.sleep', side_effect=stop_streaming):
             self.service._capture_video()
 
         # Assert
         self.assertIsNotNone(self.service.frame)
-        self.assertEqual(self.service.frame.shape[:2], (test_frame.shape[0], test_frame.shape[1]))
+        self.assertEqual(self.service.frame.shape[:2], (VIDEO_HEIGHT, VIDEO_WIDTH))
+        self.assertEqual(self.service.frame_bus.seq, 1)
         self.mock_drone.get_frame_read.assert_called_once()
 
+    def test_capture_video_resizes_once_per_decoded_frame(self):
+        """Test that only new decoded frames are resized, into recycled buffers"""
+        # Arrange
+        mock_frame_read = MagicMock()
+        mock_frame_read.frame = np.zeros((720, 960, 3), dtype=np.uint8)
+        self.mock_drone.get_frame_read.return_value = mock_frame_read
+        self.service._streaming = True
+
+        published = []
+        idle_polls = []
+
+        def decode_next_frame(_):
+            # Each idle poll delivers a new decoded frame, until 6 have been published
+            published.append(self.service.frame)
+            idle_polls.append(1)
+            if len(idle_polls) >= 6:
+                self.service._streaming = False
+            else:
+                mock_frame_read.frame = np.full((720, 960, 3), len(idle_polls), dtype=np.uint8)
+
+        # Act
+        with patch('services.video_service.time.sleep', side_effect=decode_next_frame):
+            with patch('services.video_service.cv2.resize', wraps=cv2.resize) as mock_resize:
+                self.service._capture_video()
+
+        # Assert
+        self.assertEqual(mock_resize.call_count, 6)
+        self.assertEqual(self.service.frame_bus.seq, 6)
+        buffer_ids = {id(frame) for frame in published}
+        self.assertEqual(len(buffer_ids), VIDEO_FRAME_BUFFERS)
+
+    def test_capture_video_publishes_into_shared_ring(self):
+        """Test that the shared ring slots are used as capture buffers"""
+        # Arrange
+        self.service.enable_shared_ring(4, name=f"test_ring_{id(self)}")
+        self.addCleanup(self.service.shared_ring.close)
+        mock_frame_read = MagicMock()
+        mock_frame_read.frame = np.zeros((720, 960, 3), dtype=np.uint8)
+        self.mock_drone.get_frame_read.return_value = mock_frame_read
+        self.service._streaming = True
+        idle_polls = []
+
+        def decode_next_frame(_):
+            idle_polls.append(1)
+            if len(idle_polls) >= 6:
+                self.service._streaming = False
+            else:
+                mock_frame_read.frame = np.full((720, 960, 3), len(idle_polls), dtype=np.uint8)
+
+        # Act
+        with patch('services.video_service.time.sleep', side_effect=decode_next_frame):
+            self.service._capture_video()
+        latest = self.service.shared_ring.read()
+
+        # Assert
+        self.assertEqual(latest.seq, 6)
+        self.assertEqual(latest.timestamp, self.service.frame_bus.latest().timestamp)
+        self.assertTrue(np.shares_memory(latest.frame, self.service.frame))
+        self.assertEqual(int(latest.frame[0, 0, 0]), 5)
+        self.assertEqual(self.service.get_stream_stats()["shared_ring"]["seq"], 6)
+
     def test_capture_video_exception(self):
         """Test capturing video with exception"""
         # Arrange
@@ -157,9 +251,12 @@ class TestVideoService(unittest.TestCase):
 
         # Act
         # Use a try/except to prevent test from hanging
+        def stop_streaming(_):
+            self.service._streaming = False
+
         try:
-            with patch('services.video_service.time.sleep', return_value=None):
-                with patch('services.video_service.print', return_value=None):  # Suppress print
+            with patch('services.video_service.time.sleep', side_effect=stop_streaming):
+                with patch('builtins.print', return_value=None):  # Suppress print
                     self.service._capture_video()
         except:
             pass
@@ -188,7 +285,8 @@ class TestVideoService(unittest.TestCase):
 
         # Act
         generator = self.service.generate_frames()
-        with patch('cv2.imencode', return_value=(True, b'test_encoded_image')):
+        encoded = np.frombuffer(b'test_encoded_image', dtype=np.uint8)
+        with patch('cv2.imencode', return_value=(True, encoded)):
             frame_data = next(generator)
 
         # Assert
@@ -196,6 +294,25 @@ class TestVideoService(unittest.TestCase):
         self.assertTrue(b'Content-Type: image/jpeg' in frame_data)
         self.assertTrue(b'test_encoded_image' in frame_data)
 
+    def test_generate_frames_encodes_once_for_all_viewers(self):
+        """Test that several viewers share a single JPEG encode per frame"""
+        # Arrange
+        self.service.frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        viewers = [self.service.generate_frames() for _ in range(3)]
+
+        # Act
+        encoded = np.frombuffer(b'shared_image', dtype=np.uint8)
+        with patch('cv2.imencode', return_value=(True, encoded)) as mock_imencode:
+            parts = [next(viewer) for viewer in viewers]
+
+        # Assert
+        mock_imencode.assert_called_once()
+        self.assertTrue(all(part == parts[0] for part in parts))
+        self.assertEqual(self.service.broadcaster.viewers, 3)
+        for viewer in viewers:
+            viewer.close()
+        self.assertEqual(self.service.broadcaster.viewers, 0)
+
     def test_create_no_signal_frame(self):
         """Test creating a 'no signal' frame"""
         # Act
@@ -0,0 +1,68 @@
+// Flux Server-Sent Events /status/stream partagé par tous les composants de l'onglet
+const API_URL = 'http://localhost:5000';
+
+// Événements envoyés par le backend
+const TOPICS = ['connection', 'telemetry', 'detections'];
+
+let eventSource = null;
+const subscribers = new Set();
+// Dernier état reçu pour chaque événement, transmis aux composants abonnés plus tard
+let latest = {};
+
+const dispatch = (topic, data) => {
+  subscribers.forEach(handlers => {
+    if (handlers[topic]) {
+      handlers[topic](data);
+    }
+  });
+};
+
+const openStream = () => {
+  eventSource = new EventSource(`${API_URL}/status/stream`);
+
+  TOPICS.forEach(topic => {
+    eventSource.addEventListener(topic, (event) => {
+      const data = JSON.parse(event.data);
+      // La télémétrie arrive en deltas: ne transmettre que les champs modifiés,
+      // mais garder l'état complet pour les prochains abonnés
+      latest[topic] = topic === 'telemetry' ? { ...latest[topic], ...data } : data;
+      dispatch(topic, data);
+    });
+  });
+
+  // EventSource se reconnecte automatiquement; le backend renvoie alors l'état courant
+  eventSource.onerror = () => {
+    console.warn('Flux de statut interrompu, reconnexion en cours');
+  };
+};
+
+/**
+ * S'abonner aux événements du backend
+ * @param {Object} handlers - Fonctions par événement: { connection, telemetry, detections }
+ * @returns {Function} Fonction de désabonnement
+ */
+export const subscribeStatusStream = (handlers) => {
+  subscribers.add(handlers);
+
+  if (!eventSource) {
+    openStream();
+  } else {
+    // Le flux est déjà ouvert: transmettre l'état courant au nouvel abonné
+    Object.entries(latest).forEach(([topic, data]) => {
+      if (handlers[topic]) {
+        handlers[topic](data);
+      }
+    });
+  }
+
+  return () => {
+    subscribers.delete(handlers);
+    if (subscribers.size === 0 && eventSource) {
+      eventSource.close();
+      eventSource = null;
+      latest = {};
+    }
+  };
+};
+
+export default { subscribeStatusStream };